@@ -1,852 +1,1160 @@
-
-from typing import List, Dict, Tuple
+from typing import List, Dict, Iterator, Optional, Tuple
 from procesos import Proceso
+from estructuras import HeapIndexado
+from lotes import ProcesoBatch, fcfs_vectorizado, ejecutar_no_apropiativo, round_robin_columnas
+from metricas import calcular_metricas_columnas, metricas_cambio_contexto
+from eventos import Evento, RegistroEventos, TipoEvento
+from segmentos import RegistroSegmentos
+from multicpu import ejecutar_multi_cpu
+from entrada_salida import DispositivosES, metricas_es, preparar_rafagas, siguiente_rafaga
+from cache_resultados import CacheResultados
+from instrumentacion import Instrumentacion
+from trazas import EscritorTraza, metadatos_carga
+import numpy as np
 import heapq
-import interfaz
+import math
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Separación entre niveles en las claves de MLFQ para el motor general (mayor que cualquier número de ingreso)
+_ESCALA_NIVEL = 1 << 62
+
+
 class AlgoritmoPlanificacion:
     """Clase base para todos los algoritmos de planificación"""
     
-    def __init__(self, nombre: str, descripcion: str = ""):
+    def __init__(self, nombre: str, descripcion: str = "", num_cpus: int = 1,
+                 colas_por_cpu: bool = False, costo_cambio: int = 0, costo_migracion: int = 0):
+        if not isinstance(num_cpus, int) or num_cpus < 1:
+            raise ValueError("El número de CPUs debe ser un entero positivo.")
+        if any(not isinstance(costo, int) or costo < 0 for costo in (costo_cambio, costo_migracion)):
+            raise ValueError("Los costos de cambio de contexto deben ser enteros mayores o iguales a 0.")
         self.nombre = nombre
         self.descripcion = descripcion
         self.metricas = {}
         self.tiempo_actual = 0
+        self.segmentos = RegistroSegmentos()
+        # Con varias CPUs: cola global de listos o, con colas_por_cpu, una cola por CPU con balanceo
+        self.num_cpus = num_cpus
+        self.colas_por_cpu = colas_por_cpu
+        # Cambio de contexto: tiempo de CPU que cuesta cargar otro proceso y recargo si viene de otra CPU
+        self.costo_cambio = costo_cambio
+        self.costo_migracion = costo_migracion
+        self.segmentos_por_cpu = []
+        self.metricas_por_cpu = []
+        # Contadores y temporizadores opcionales (ver instrumentar)
+        self.instrumentacion: Optional[Instrumentacion] = None
+    
+    def instrumentar(self, activa: bool = True, perfil: bool = False,
+                     memoria: bool = False) -> "AlgoritmoPlanificacion":
+        """Activa (o desactiva) la instrumentación de las corridas de ``ejecutar``.
+        
+        Con ``perfil`` y ``memoria`` cada corrida se captura además con
+        cProfile y tracemalloc. El resumen queda en ``self.instrumentacion.resumen()``.
+        """
+        self.instrumentacion = Instrumentacion(perfil, memoria) if activa else None
+        return self
+    
+    def ejecutar(self, procesos: List[Proceso]) -> RegistroEventos:
+        """Ejecuta el algoritmo y devuelve la bitácora completa de eventos"""
+        registro = RegistroEventos()
+        if self.instrumentacion is None:
+            for evento in self.ejecutar_iter(procesos):
+                registro.agregar_evento(evento)
+            return registro
+        
+        with self.instrumentacion.corrida():
+            for evento in self.instrumentacion.observar(self.ejecutar_iter(procesos)):
+                registro.agregar_evento(evento)
+        return registro
+    
+    def ejecutar_traza(self, procesos: List[Proceso], ruta: str, comprimir: bool = False,
+                       metadatos: Optional[Dict] = None) -> Dict:
+        """Ejecuta el algoritmo escribiendo eventos, segmentos y procesos en una traza binaria.
+        
+        Los eventos van al archivo a medida que el motor los produce, sin
+        acumular la bitácora en memoria. La cabecera lleva el algoritmo, su
+        configuración, un resumen de la carga y ``metadatos``; al cerrar se
+        agregan las métricas. Devuelve las métricas.
+        """
+        cabecera = {
+            'algoritmo': self.nombre,
+            'num_cpus': self.num_cpus,
+            'colas_por_cpu': self.colas_por_cpu,
+            'costo_cambio': self.costo_cambio,
+            'costo_migracion': self.costo_migracion,
+        }
+        lote = ProcesoBatch.desde_procesos(procesos)
+        cabecera.update(metadatos_carga(lote))
+        cabecera.update(metadatos or {})
+        with EscritorTraza(ruta, cabecera, comprimir) as escritor:
+            eventos = self.ejecutar_iter(procesos)
+            if self.instrumentacion is None:
+                escritor.agregar_eventos(eventos)
+            else:
+                with self.instrumentacion.corrida():
+                    escritor.agregar_eventos(self.instrumentacion.observar(eventos))
+            
+            por_cpu = self.segmentos_por_cpu if self.num_cpus > 1 else [self.segmentos]
+            for cpu, segmentos in enumerate(por_cpu):
+                escritor.agregar_segmentos(segmentos, cpu)
+            lote.cargar_resultados(procesos)
+            escritor.agregar_procesos(lote)
+            final = {'metricas': self.metricas, 'metricas_por_cpu': self.metricas_por_cpu,
+                     'tiempo_total': self.tiempo_actual}
+            if self.instrumentacion is not None:
+                final['instrumentacion'] = self.instrumentacion.resumen()
+            escritor.cerrar(final)
+        return self.metricas
     
-    def ejecutar(self, procesos: List[Proceso]) -> List[Dict]:
-        """Método abstracto que debe ser implementado por cada algoritmo"""
+    def ejecutar_iter(self, procesos: List[Proceso]) -> Iterator[Evento]:
+        """Generador que produce los eventos a medida que ocurren.
+        
+        Método abstracto que debe ser implementado por cada algoritmo. Las
+        métricas quedan en ``self.metricas`` cuando el generador se agota.
+        """
         raise NotImplementedError("Este método debe ser implementado por las subclases")
     
+    def ejecutar_reanudable(self, procesos: List[Proceso], estado: Dict,
+                            hasta: Optional[int] = None) -> Iterator[Evento]:
+        """Como ``ejecutar_iter`` pero con el estado del motor en ``estado`` para poder pausar y retomar.
+        
+        Con ``estado`` vacío la simulación empieza en t=0; con ``hasta`` se
+        pausa en el primer punto estable con reloj >= ``hasta`` y una nueva
+        llamada con el mismo diccionario la continúa. Usa el motor general
+        (mismos resultados que el motor propio de cada algoritmo).
+        """
+        return ejecutar_multi_cpu(self, procesos, estado, hasta)
+    
+    def ejecutar_lote(self, lote: ProcesoBatch) -> ProcesoBatch:
+        """Ejecuta el algoritmo sobre un lote columnar y escribe los resultados en sus columnas.
+        
+        Con la instrumentación activa la corrida se cronometra completa (ver
+        ``Instrumentacion.corrida_lote``); el trabajo lo hace ``_ejecutar_lote``.
+        """
+        if self.instrumentacion is None:
+            return self._ejecutar_lote(lote)
+        with self.instrumentacion.corrida_lote(len(lote)):
+            return self._ejecutar_lote(lote)
+    
+    def _ejecutar_lote(self, lote: ProcesoBatch) -> ProcesoBatch:
+        """Implementación de ``ejecutar_lote``.
+        
+        La implementación por defecto convierte el lote a objetos Proceso y
+        descarta los eventos; los algoritmos no apropiativos la sobrescriben
+        para trabajar directo sobre las columnas.
+        """
+        procesos = lote.a_procesos()
+        eventos = self.ejecutar_iter(procesos)
+        if self.instrumentacion is not None:
+            eventos = self.instrumentacion.observar(eventos)
+        for _ in eventos:
+            pass
+        lote.cargar_resultados(procesos)
+        return lote
+    
     def calcular_metricas(self, procesos: List[Proceso]) -> Dict:
         """Calcula métricas comunes para todos los algoritmos"""
         if not procesos:
             return {}
         
-        tiempos_espera = []
-        tiempos_respuesta = []
-        tiempos_retorno = []
-        
-        for proceso in procesos:
-            if (proceso.tiempo_finalizacion is not None and 
-                proceso.tiempo_respuesta is not None):
-                
-                turnaround = proceso.tiempo_finalizacion - proceso.instante_llegada
-                tiempo_retorno = turnaround
-                tiempo_espera = proceso.tiempo_espera
-                tiempo_respuesta = proceso.tiempo_respuesta
-                
-                tiempos_retorno.append(tiempo_retorno)
-                tiempos_espera.append(tiempo_espera)
-                tiempos_respuesta.append(tiempo_respuesta)
-        
-        metricas = {
-            'throughput': len([p for p in procesos if p.tiempo_finalizacion is not None]),
-            'tiempo_retorno_promedio': sum(tiempos_retorno) / len(tiempos_retorno) if tiempos_retorno else 0,
-            'tiempo_espera_promedio': sum(tiempos_espera) / len(tiempos_espera) if tiempos_espera else 0,
-            'tiempo_respuesta_promedio': sum(tiempos_respuesta) / len(tiempos_respuesta) if tiempos_respuesta else 0,
-            'uso_cpu': (self.tiempo_actual - sum(tiempos_espera)) / self.tiempo_actual if self.tiempo_actual > 0 else 0
-        }
-        
+        inicio = time.perf_counter() if self.instrumentacion is not None else None
+        total = len(procesos)
+        finalizacion = np.fromiter((-1 if p.tiempo_finalizacion is None else p.tiempo_finalizacion
+                                    for p in procesos), dtype=np.int64, count=total)
+        metricas = calcular_metricas_columnas(
+            np.fromiter((p.instante_llegada for p in procesos), dtype=np.int64, count=total),
+            np.fromiter((p.tiempo_cpu for p in procesos), dtype=np.int64, count=total),
+            finalizacion,
+            np.fromiter((p.tiempo_espera for p in procesos), dtype=np.int64, count=total),
+            np.fromiter((p.tiempo_respuesta or 0 for p in procesos), dtype=np.int64, count=total),
+            self.tiempo_actual,
+            *self._intervalos_ejecucion(),
+            num_cpus=self.num_cpus
+        )
+        if inicio is not None:
+            self.instrumentacion.medir_metricas(time.perf_counter() - inicio)
         return metricas
+    
+    def calcular_metricas_lote(self, lote: ProcesoBatch) -> Dict:
+        """Calcula las métricas comunes a partir de las columnas de un lote"""
+        inicio = time.perf_counter() if self.instrumentacion is not None else None
+        metricas = calcular_metricas_columnas(lote.llegada, lote.cpu, lote.finalizacion,
+                                              lote.espera, lote.respuesta, self.tiempo_actual,
+                                              *self._intervalos_ejecucion(), num_cpus=self.num_cpus)
+        if inicio is not None:
+            self.instrumentacion.medir_metricas(time.perf_counter() - inicio)
+        return metricas
+    
+    def _intervalos_ejecucion(self) -> Tuple:
+        """Columnas (inicio, fin) de los segmentos registrados, o (None, None) si no hay"""
+        if not len(self.segmentos):
+            return None, None
+        _, inicios, fines = self.segmentos.columnas()
+        return inicios, fines
+    
+    def _requiere_motor_general(self, procesos: List[Proceso]) -> bool:
+        """Varias CPUs, ráfagas de E/S o costo de cambio de contexto se simulan con el motor general de multicpu.py"""
+        return self.num_cpus > 1 or self._con_costo_cambio() or any(p.rafagas for p in procesos)
+    
+    def _requiere_motor_general_lote(self, lote: ProcesoBatch) -> bool:
+        """Como ``_requiere_motor_general`` para los caminos columnares de ``ejecutar_lote``"""
+        return self.num_cpus > 1 or self._con_costo_cambio() or lote.tiene_es()
+    
+    def _con_costo_cambio(self) -> bool:
+        return bool(self.costo_cambio or self.costo_migracion)
+    
+    # Ganchos de política para el motor multi-CPU (multicpu.ejecutar_multi_cpu)
+    
+    def _clave_multi(self, proceso: Proceso, instante: int, ingreso: int) -> float:
+        """Clave en la cola de listos; por omisión FIFO según el número de ingreso a la cola"""
+        return ingreso
+    
+    def _porcion_multi(self, proceso: Proceso) -> Optional[int]:
+        """Tiempo máximo por despacho; None = hasta terminar o ser desalojado"""
+        return None
+    
+    def _es_apropiativo(self) -> bool:
+        return False
+    
+    def _clave_en_ejecucion(self, proceso: Proceso, inicio: int, instante: int) -> float:
+        """Clave comparable con ``_clave_multi`` del proceso que ejecuta desde ``inicio``"""
+        return 0
+    
+    def _instante_desalojo(self, clave: float, proceso: Proceso, inicio: int, instante: int) -> Optional[int]:
+        """Primer instante en que un listo con ``clave`` desaloja al proceso en ejecución solo por
+        el paso del tiempo; None si la comparación no cambia con el reloj"""
+        return None
+    
+    def _reiniciar_multi(self):
+        """Reinicia el estado propio de la política al empezar una corrida del motor multi-CPU"""
+    
+    def _consumo_multi(self, proceso: Proceso, transcurrido: int):
+        """Aviso de que ``proceso`` ejecutó ``transcurrido`` unidades en el tramo que se acaba de cerrar"""
+    
+    def _porcion_agotada_multi(self, proceso: Proceso):
+        """Aviso de que ``proceso`` agotó su porción sin terminar la ráfaga y vuelve a la cola"""
+    
+    def _proximo_evento_multi(self) -> Optional[int]:
+        """Instante del próximo evento periódico de la política; None si no tiene"""
+        return None
+    
+    def _evento_multi(self, instante: int):
+        """Aplica el evento periódico y agenda el siguiente"""
+    
+    @staticmethod
+    def _segmentos_no_apropiativos(lote: ProcesoBatch) -> RegistroSegmentos:
+        """Sin apropiación cada proceso ocupa un único segmento que termina en su finalización"""
+        terminados = lote.finalizacion >= 0
+        fines = lote.finalizacion[terminados]
+        return RegistroSegmentos.desde_arrays(lote.pid[terminados], fines - lote.cpu[terminados], fines)
 
 class FCFS(AlgoritmoPlanificacion):
     """First Come First Served (FIFO) - No apropiativo"""
     
-    def __init__(self):
-        super().__init__("FCFS", "First Come First Served - No apropiativo")
+    def __init__(self, num_cpus: int = 1, colas_por_cpu: bool = False,
+                 costo_cambio: int = 0, costo_migracion: int = 0):
+        super().__init__("FCFS", "First Come First Served - No apropiativo", num_cpus, colas_por_cpu,
+                         costo_cambio, costo_migracion)
     
-    def ejecutar(self, procesos: List[Proceso]) -> List[Dict]:
+    def ejecutar_iter(self, procesos: List[Proceso]) -> Iterator[Evento]:
         """Ejecuta el algoritmo FCFS"""
-        self.tiempo_actual = 0
-        eventos = []
+        if self._requiere_motor_general(procesos):
+            yield from ejecutar_multi_cpu(self, procesos)
+            return
         
+        self.tiempo_actual = 0
+        self.segmentos = RegistroSegmentos()
         
+       
         procesos_ordenados = sorted(procesos, key=lambda x: x.instante_llegada)
+        total = len(procesos_ordenados)
+        indice_proximo = 0
         
         for proceso in procesos_ordenados:
-            
+           
             if self.tiempo_actual < proceso.instante_llegada:
+                yield Evento(TipoEvento.CPU_OCIOSA, self.tiempo_actual, 0, proceso.instante_llegada)
                 self.tiempo_actual = proceso.instante_llegada
-                eventos.append({
-                    'tiempo': self.tiempo_actual,
-                    'evento': f"Proceso {proceso.nombre} llega al sistema"
-                })
             
+            # Llegadas hasta el instante actual (las anteriores ya se anunciaron durante la ejecución)
+            while (indice_proximo < total and
+                   procesos_ordenados[indice_proximo].instante_llegada <= self.tiempo_actual):
+                p = procesos_ordenados[indice_proximo]
+                yield Evento(TipoEvento.LLEGADA, p.instante_llegada, p.pid, p.tiempo_cpu)
+                indice_proximo += 1
             
+          
             if not proceso.ejecutado:
                 proceso.tiempo_respuesta = self.tiempo_actual - proceso.instante_llegada
                 proceso.ejecutado = True
-                eventos.append({
-                    'tiempo': self.tiempo_actual,
-                    'evento': f"Inicia ejecución de {proceso.nombre} (PID: {proceso.pid})"
-                })
+                yield Evento(TipoEvento.DESPACHO, self.tiempo_actual, proceso.pid, proceso.tiempo_cpu)
             
+          
             inicio_ejecucion = self.tiempo_actual
             self.tiempo_actual += proceso.tiempo_cpu
+            self.segmentos.agregar(proceso.pid, inicio_ejecucion, self.tiempo_actual)
+            
+            # Las llegadas durante la ráfaga se anuncian en su instante, antes de la finalización
+            while (indice_proximo < total and
+                   procesos_ordenados[indice_proximo].instante_llegada < self.tiempo_actual):
+                p = procesos_ordenados[indice_proximo]
+                yield Evento(TipoEvento.LLEGADA, p.instante_llegada, p.pid, p.tiempo_cpu)
+                indice_proximo += 1
             proceso.tiempo_restante = 0
             proceso.tiempo_finalizacion = self.tiempo_actual
             
            
             proceso.tiempo_espera = inicio_ejecucion - proceso.instante_llegada
             
-            eventos.append({
-                'tiempo': self.tiempo_actual,
-                'evento': f"Finaliza {proceso.nombre} | Espera: {proceso.tiempo_espera}"
-            })
+            yield Evento(TipoEvento.FINALIZACION, self.tiempo_actual, proceso.pid, proceso.tiempo_espera)
         
         self.metricas = self.calcular_metricas(procesos)
-        return eventos
+    
+    def _ejecutar_lote(self, lote: ProcesoBatch) -> ProcesoBatch:
+        """FCFS vectorizado: suma acumulada de ráfagas y máximo acumulado de llegadas"""
+        if self._requiere_motor_general_lote(lote):
+            return super()._ejecutar_lote(lote)
+        self.tiempo_actual = fcfs_vectorizado(lote)
+        self.segmentos = self._segmentos_no_apropiativos(lote)
+        self.metricas = self.calcular_metricas_lote(lote)
+        return lote
 
 class SJF(AlgoritmoPlanificacion):
     """Shortest Job First (No apropiativo)"""
     
-    def __init__(self):
-        super().__init__("SJF", "Shortest Job First - No apropiativo")
+    def __init__(self, num_cpus: int = 1, colas_por_cpu: bool = False,
+                 costo_cambio: int = 0, costo_migracion: int = 0):
+        super().__init__("SJF", "Shortest Job First - No apropiativo", num_cpus, colas_por_cpu,
+                         costo_cambio, costo_migracion)
     
-    def ejecutar(self, procesos: List[Proceso]) -> List[Dict]:
-        """Ejecuta el algoritmo SJF no apropiativo"""
+    def ejecutar_iter(self, procesos: List[Proceso]) -> Iterator[Evento]:
+        """Ejecuta el algoritmo SJF no apropiativo.
+        
+        Los listos viven en un heap binario con clave (tiempo_cpu, llegada, pid)
+        alimentado por un cursor sobre los procesos ordenados por llegada, y
+        los huecos de CPU ociosa se saltan directamente a la siguiente llegada.
+        """
+        if self._requiere_motor_general(procesos):
+            yield from ejecutar_multi_cpu(self, procesos)
+            return
+        
         self.tiempo_actual = 0
-        eventos = []
-        completados = []
-        cola_espera = []
+        self.segmentos = RegistroSegmentos()
         
-       
-        procesos_restantes = sorted(procesos, key=lambda x: x.instante_llegada)
+        procesos_por_llegada = sorted(procesos, key=lambda x: x.instante_llegada)
+        total = len(procesos_por_llegada)
+        indice_proximo = 0
+        cola_espera = []
+        completados = 0
+        inst = self.instrumentacion
         
-        while len(completados) < len(procesos):
-           
-            llegados = [p for p in procesos_restantes 
-                       if p.instante_llegada <= self.tiempo_actual and p not in completados]
-            
-            for p in llegados:
-                if p not in cola_espera:
-                    cola_espera.append(p)
-                    eventos.append({
-                        'tiempo': self.tiempo_actual,
-                        'evento': f"{p.nombre} llega a cola de espera"
-                    })
-            
-            if cola_espera:
-               
-                cola_espera.sort(key=lambda x: x.tiempo_cpu)
-                proceso_actual = cola_espera.pop(0)
-                
-              
-                if not proceso_actual.ejecutado:
-                    proceso_actual.tiempo_respuesta = self.tiempo_actual - proceso_actual.instante_llegada
-                    proceso_actual.ejecutado = True
-                
-                inicio_ejecucion = self.tiempo_actual
-                eventos.append({
-                    'tiempo': self.tiempo_actual,
-                    'evento': f"SJF selecciona {proceso_actual.nombre} (CPU: {proceso_actual.tiempo_cpu})"
-                })
-                
-                
-                self.tiempo_actual += proceso_actual.tiempo_cpu
-                proceso_actual.tiempo_restante = 0
-                proceso_actual.tiempo_finalizacion = self.tiempo_actual
-                proceso_actual.tiempo_espera = inicio_ejecucion - proceso_actual.instante_llegada
-                
-                eventos.append({
-                    'tiempo': self.tiempo_actual,
-                    'evento': f"Finaliza {proceso_actual.nombre} | Espera: {proceso_actual.tiempo_espera}"
-                })
-                
-                completados.append(proceso_actual)
-                procesos_restantes.remove(proceso_actual)
-            else:
-                
-                self.tiempo_actual += 1
-                eventos.append({
-                    'tiempo': self.tiempo_actual,
-                    'evento': "CPU idle - Esperando procesos"
-                })
+        while completados < total:
+            
+            if not cola_espera:
+                siguiente_llegada = procesos_por_llegada[indice_proximo].instante_llegada
+                if siguiente_llegada > self.tiempo_actual:
+                    yield Evento(TipoEvento.CPU_OCIOSA, self.tiempo_actual, 0, siguiente_llegada)
+                    self.tiempo_actual = siguiente_llegada
+            
+            while (indice_proximo < total and 
+                   procesos_por_llegada[indice_proximo].instante_llegada <= self.tiempo_actual):
+                p = procesos_por_llegada[indice_proximo]
+                if inst is not None:
+                    marca = time.perf_counter()
+                heapq.heappush(cola_espera, (p.tiempo_cpu, p.instante_llegada, p.pid, p))
+                if inst is not None:
+                    inst.sumar_llegadas(1, time.perf_counter() - marca)
+                yield Evento(TipoEvento.LLEGADA, p.instante_llegada, p.pid, p.tiempo_cpu)
+                indice_proximo += 1
+            
+            if inst is not None:
+                marca = time.perf_counter()
+            proceso_actual = heapq.heappop(cola_espera)[3]
+            
+            if not proceso_actual.ejecutado:
+                proceso_actual.tiempo_respuesta = self.tiempo_actual - proceso_actual.instante_llegada
+                proceso_actual.ejecutado = True
+            if inst is not None:
+                inst.sumar_seleccion(0, 1, time.perf_counter() - marca)
+            
+            inicio_ejecucion = self.tiempo_actual
+            yield Evento(TipoEvento.DESPACHO, self.tiempo_actual, proceso_actual.pid, proceso_actual.tiempo_cpu)
+            
+            self.tiempo_actual += proceso_actual.tiempo_cpu
+            self.segmentos.agregar(proceso_actual.pid, inicio_ejecucion, self.tiempo_actual)
+            
+            # Las llegadas durante la ráfaga entran a la cola y se anuncian en su instante
+            while (indice_proximo < total and 
+                   procesos_por_llegada[indice_proximo].instante_llegada < self.tiempo_actual):
+                p = procesos_por_llegada[indice_proximo]
+                if inst is not None:
+                    marca = time.perf_counter()
+                heapq.heappush(cola_espera, (p.tiempo_cpu, p.instante_llegada, p.pid, p))
+                if inst is not None:
+                    inst.sumar_llegadas(1, time.perf_counter() - marca)
+                yield Evento(TipoEvento.LLEGADA, p.instante_llegada, p.pid, p.tiempo_cpu)
+                indice_proximo += 1
+            
+            proceso_actual.tiempo_restante = 0
+            proceso_actual.tiempo_finalizacion = self.tiempo_actual
+            proceso_actual.tiempo_espera = inicio_ejecucion - proceso_actual.instante_llegada
+            
+            yield Evento(TipoEvento.FINALIZACION, self.tiempo_actual, proceso_actual.pid, proceso_actual.tiempo_espera)
+            
+            completados += 1
         
         self.metricas = self.calcular_metricas(procesos)
-        return eventos
+    
+    def _ejecutar_lote(self, lote: ProcesoBatch) -> ProcesoBatch:
+        """SJF sobre columnas: el orden de preferencia es (tiempo_cpu, llegada, pid)"""
+        if self._requiere_motor_general_lote(lote):
+            return super()._ejecutar_lote(lote)
+        self.tiempo_actual = ejecutar_no_apropiativo(lote, np.lexsort((lote.pid, lote.llegada, lote.cpu)),
+                                                     self.instrumentacion)
+        self.segmentos = self._segmentos_no_apropiativos(lote)
+        self.metricas = self.calcular_metricas_lote(lote)
+        return lote
+    
+    def _clave_multi(self, proceso: Proceso, instante: int, ingreso: int) -> float:
+        # Con ráfagas de E/S se elige por la siguiente ráfaga de CPU
+        return proceso.tiempo_restante
 
 class SRTF(AlgoritmoPlanificacion):
     """Shortest Remaining Time First (Apropiativo)"""
     
-    def __init__(self):
-        super().__init__("SRTF", "Shortest Remaining Time First - Apropiativo")
+    def __init__(self, num_cpus: int = 1, colas_por_cpu: bool = False,
+                 costo_cambio: int = 0, costo_migracion: int = 0):
+        super().__init__("SRTF", "Shortest Remaining Time First - Apropiativo", num_cpus, colas_por_cpu,
+                         costo_cambio, costo_migracion)
     
-    def ejecutar(self, procesos: List[Proceso]) -> List[Dict]:
-        """Ejecuta el algoritmo SRTF"""
+    def ejecutar_iter(self, procesos: List[Proceso]) -> Iterator[Evento]:
+        """Ejecuta el algoritmo SRTF como simulación por eventos discretos.
+
+        El reloj solo se detiene en la siguiente llegada o en la siguiente
+        finalización, por lo que el costo es O(n log n) sin importar la
+        duración de las ráfagas.
+        """
+        if self._requiere_motor_general(procesos):
+            yield from ejecutar_multi_cpu(self, procesos)
+            return
+        
         self.tiempo_actual = 0
-        eventos = []
+        self.segmentos = RegistroSegmentos()
         
-       
+        # Inicializar procesos
         for p in procesos:
             p.tiempo_restante = p.tiempo_cpu
             p.ejecutado = False
         
-        completados = []
+        # Cursor de llegadas sobre los procesos ordenados por instante de llegada
+        procesos_por_llegada = sorted(procesos, key=lambda x: x.instante_llegada)
+        total = len(procesos_por_llegada)
+        indice_proximo = 0
+        
+        # Min-heap de listos: (tiempo_restante, orden de llegada, proceso)
+        listos = []
         proceso_actual = None
-        tiempo_inicio_ejecucion = 0
+        completados = 0
+        inst = self.instrumentacion
         
-        while len(completados) < len(procesos):
-          
-            nuevos = [p for p in procesos 
-                     if p.instante_llegada == self.tiempo_actual and p not in completados]
+        while completados < total:
             
-            for p in nuevos:
-                eventos.append({
-                    'tiempo': self.tiempo_actual,
-                    'evento': f"{p.nombre} llega al sistema"
-                })
+            if proceso_actual is None and not listos:
+                siguiente_llegada = procesos_por_llegada[indice_proximo].instante_llegada
+                if siguiente_llegada > self.tiempo_actual:
+                    yield Evento(TipoEvento.CPU_OCIOSA, self.tiempo_actual, 0, siguiente_llegada)
+                    self.tiempo_actual = siguiente_llegada
             
+            # Ingresar todas las llegadas hasta el instante actual
+            while (indice_proximo < total and 
+                   procesos_por_llegada[indice_proximo].instante_llegada <= self.tiempo_actual):
+                p = procesos_por_llegada[indice_proximo]
+                if inst is not None:
+                    marca = time.perf_counter()
+                heapq.heappush(listos, (p.tiempo_restante, indice_proximo, p))
+                if inst is not None:
+                    inst.sumar_llegadas(1, time.perf_counter() - marca)
+                yield Evento(TipoEvento.LLEGADA, self.tiempo_actual, p.pid, p.tiempo_cpu)
+                indice_proximo += 1
             
-            procesos_listos = [p for p in procesos 
-                             if p.instante_llegada <= self.tiempo_actual 
-                             and p.tiempo_restante > 0 
-                             and p not in completados]
+            # Apropiación: solo si un listo tiene estrictamente menos tiempo restante
+            if proceso_actual is not None and listos and listos[0][0] < proceso_actual.tiempo_restante:
+                if inst is not None:
+                    marca = time.perf_counter()
+                heapq.heappush(listos, (proceso_actual.tiempo_restante, orden_actual, proceso_actual))
+                if inst is not None:
+                    inst.sumar_seleccion(1, 0, time.perf_counter() - marca)
+                yield Evento(TipoEvento.DESALOJO, self.tiempo_actual, proceso_actual.pid, proceso_actual.tiempo_restante)
+                proceso_actual = None
             
-            if procesos_listos:
-               
-                procesos_listos.sort(key=lambda x: x.tiempo_restante)
-                nuevo_proceso = procesos_listos[0]
-                
-                
-                if proceso_actual != nuevo_proceso:
-                    if proceso_actual is not None:
-                        
-                        tiempo_ejecutado = self.tiempo_actual - tiempo_inicio_ejecucion
-                        proceso_actual.tiempo_restante -= tiempo_ejecutado
-                        
-                        if proceso_actual.tiempo_restante <= 0:
-                            proceso_actual.tiempo_finalizacion = self.tiempo_actual
-                            completados.append(proceso_actual)
-                            eventos.append({
-                                'tiempo': self.tiempo_actual,
-                                'evento': f"Finaliza {proceso_actual.nombre}"
-                            })
-                    
-                    proceso_actual = nuevo_proceso
-                    tiempo_inicio_ejecucion = self.tiempo_actual
-                    
-                    if not proceso_actual.ejecutado:
-                        proceso_actual.tiempo_respuesta = self.tiempo_actual - proceso_actual.instante_llegada
-                        proceso_actual.ejecutado = True
-                    
-                    eventos.append({
-                        'tiempo': self.tiempo_actual,
-                        'evento': f"SRTF cambia a {proceso_actual.nombre} (Restante: {proceso_actual.tiempo_restante})"
-                    })
+            if proceso_actual is None:
+                if inst is not None:
+                    marca = time.perf_counter()
+                _, orden_actual, proceso_actual = heapq.heappop(listos)
                 
+                if not proceso_actual.ejecutado:
+                    proceso_actual.tiempo_respuesta = self.tiempo_actual - proceso_actual.instante_llegada
+                    proceso_actual.ejecutado = True
+                if inst is not None:
+                    inst.sumar_seleccion(0, 1, time.perf_counter() - marca)
                 
-                self.tiempo_actual += 1
-                
+                yield Evento(TipoEvento.DESPACHO, self.tiempo_actual, proceso_actual.pid, proceso_actual.tiempo_restante)
+            
+            # Avanzar hasta el próximo evento: llegada o finalización
+            fin = self.tiempo_actual + proceso_actual.tiempo_restante
+            if indice_proximo < total and procesos_por_llegada[indice_proximo].instante_llegada < fin:
+                siguiente_llegada = procesos_por_llegada[indice_proximo].instante_llegada
+                self.segmentos.agregar(proceso_actual.pid, self.tiempo_actual, siguiente_llegada)
+                proceso_actual.tiempo_restante -= siguiente_llegada - self.tiempo_actual
+                self.tiempo_actual = siguiente_llegada
             else:
-                
+                self.segmentos.agregar(proceso_actual.pid, self.tiempo_actual, fin)
+                self.tiempo_actual = fin
+                proceso_actual.tiempo_restante = 0
+                proceso_actual.tiempo_finalizacion = fin
+                proceso_actual.tiempo_espera = fin - proceso_actual.instante_llegada - proceso_actual.tiempo_cpu
+                completados += 1
+                yield Evento(TipoEvento.FINALIZACION, self.tiempo_actual, proceso_actual.pid, proceso_actual.tiempo_espera)
                 proceso_actual = None
-                self.tiempo_actual += 1
-                eventos.append({
-                    'tiempo': self.tiempo_actual,
-                    'evento': "CPU idle"
-                })
-        
-       
-        for p in procesos:
-            p.tiempo_espera = p.tiempo_finalizacion - p.instante_llegada - p.tiempo_cpu
         
         self.metricas = self.calcular_metricas(procesos)
-        return eventos
+    
+    def _clave_multi(self, proceso: Proceso, instante: int, ingreso: int) -> float:
+        return proceso.tiempo_restante
+    
+    def _es_apropiativo(self) -> bool:
+        return True
+    
+    def _clave_en_ejecucion(self, proceso: Proceso, inicio: int, instante: int) -> float:
+        return proceso.tiempo_restante - (instante - inicio)
 
 class RoundRobin(AlgoritmoPlanificacion):
-    """Round Robin con quantum configurable"""
+    """Round Robin con quantum configurable (el quantum propio de cada proceso tiene prioridad)"""
     
-    def __init__(self, quantum: int = 5 ):
-        super().__init__("Round Robin", f"Round Robin con quantum={quantum}")
+    def __init__(self, quantum: int = 5, num_cpus: int = 1, colas_por_cpu: bool = False,
+                 costo_cambio: int = 0, costo_migracion: int = 0):
+        super().__init__("Round Robin", f"Round Robin con quantum={quantum}", num_cpus, colas_por_cpu,
+                         costo_cambio, costo_migracion)
         self.quantum = quantum
     
-    def ejecutar(self, procesos: List[Proceso]) -> List[Dict]:
-        """Ejecuta el algoritmo Round Robin"""
+    def ejecutar_iter(self, procesos: List[Proceso]) -> Iterator[Evento]:
+        """Ejecuta el algoritmo Round Robin.
+        
+        Cada porción de CPU se avanza en un solo paso; las llegadas que caen
+        dentro de la porción se ubican por búsqueda binaria sobre los instantes
+        de llegada ordenados, de modo que el costo depende del número de
+        despachos y no del tiempo total de CPU.
+        """
+        if self._requiere_motor_general(procesos):
+            yield from ejecutar_multi_cpu(self, procesos)
+            return
+        
         self.tiempo_actual = 0
-        eventos = []
+        self.segmentos = RegistroSegmentos()
         
-       
         for p in procesos:
             p.tiempo_restante = p.tiempo_cpu
             p.ejecutado = False
         
-        
-        cola = []
-        completados = []
-        
+        cola = deque()
+        completados = 0
         
         procesos_por_llegada = sorted(procesos, key=lambda x: x.instante_llegada)
+        llegadas = [p.instante_llegada for p in procesos_por_llegada]
+        total = len(procesos_por_llegada)
         indice_proximo = 0
+        inst = self.instrumentacion
         
-        while len(completados) < len(procesos):
-           
-            while (indice_proximo < len(procesos_por_llegada) and 
-                   procesos_por_llegada[indice_proximo].instante_llegada <= self.tiempo_actual):
-                proceso = procesos_por_llegada[indice_proximo]
-                cola.append(proceso)
-                eventos.append({
-                    'tiempo': self.tiempo_actual,
-                    'evento': f"{proceso.nombre} se agrega a cola RR"
-                })
-                indice_proximo += 1
+        while completados < total:
             
-            if cola:
-                proceso_actual = cola.pop(0)
-                
-             
-                if not proceso_actual.ejecutado:
-                    proceso_actual.tiempo_respuesta = self.tiempo_actual - proceso_actual.instante_llegada
-                    proceso_actual.ejecutado = True
-                    eventos.append({
-                        'tiempo': self.tiempo_actual,
-                        'evento': f"RR inicia {proceso_actual.nombre} (Quantum: {self.quantum})"
-                    })
-               
-                tiempo_ejecucion = min(self.quantum, proceso_actual.tiempo_restante)
-                inicio_bloque = self.tiempo_actual
-                
-                for i in range(tiempo_ejecucion):
-                    self.tiempo_actual += 1
-                    proceso_actual.tiempo_restante -= 1
-                    
-                  
-                    while (indice_proximo < len(procesos_por_llegada) and 
-                           procesos_por_llegada[indice_proximo].instante_llegada <= self.tiempo_actual):
-                        nuevo = procesos_por_llegada[indice_proximo]
-                        cola.append(nuevo)
-                        eventos.append({
-                            'tiempo': self.tiempo_actual,
-                            'evento': f"{nuevo.nombre} llega durante ejecución"
-                        })
-                        indice_proximo += 1
+            if not cola:
+                siguiente_llegada = llegadas[indice_proximo]
+                if siguiente_llegada > self.tiempo_actual:
+                    yield Evento(TipoEvento.CPU_OCIOSA, self.tiempo_actual, 0, siguiente_llegada)
+                    self.tiempo_actual = siguiente_llegada
                 
-                if proceso_actual.tiempo_restante > 0:
-                   
-                    cola.append(proceso_actual)
-                    eventos.append({
-                        'tiempo': self.tiempo_actual,
-                        'evento': f"{proceso_actual.nombre} vuelve a cola ({proceso_actual.tiempo_restante} restante)"
-                    })
-                else:
-                    proceso_actual.tiempo_finalizacion = self.tiempo_actual
-                    completados.append(proceso_actual)
-                    proceso_actual.tiempo_espera = (proceso_actual.tiempo_finalizacion - 
-                                                  proceso_actual.instante_llegada - 
-                                                  proceso_actual.tiempo_cpu)
-                    eventos.append({
-                        'tiempo': self.tiempo_actual,
-                        'evento': f"✅ {proceso_actual.nombre} completado | Espera: {proceso_actual.tiempo_espera}"
-                    })
+                if inst is not None:
+                    marca = time.perf_counter()
+                limite = bisect_right(llegadas, self.tiempo_actual, indice_proximo)
+                cola.extend(procesos_por_llegada[indice_proximo:limite])
+                if inst is not None:
+                    inst.sumar_llegadas(limite - indice_proximo, time.perf_counter() - marca)
+                for proceso in procesos_por_llegada[indice_proximo:limite]:
+                    yield Evento(TipoEvento.LLEGADA, self.tiempo_actual, proceso.pid, proceso.tiempo_cpu)
+                indice_proximo = limite
+            
+            if inst is not None:
+                marca = time.perf_counter()
+            proceso_actual = cola.popleft()
+            quantum = proceso_actual.quantum or self.quantum
+            
+            if not proceso_actual.ejecutado:
+                proceso_actual.tiempo_respuesta = self.tiempo_actual - proceso_actual.instante_llegada
+                proceso_actual.ejecutado = True
+            if inst is not None:
+                inst.sumar_seleccion(0, 1, time.perf_counter() - marca)
+            
+            yield Evento(TipoEvento.DESPACHO, self.tiempo_actual, proceso_actual.pid, proceso_actual.tiempo_restante)
+            
+            # Avanzar la porción completa en un solo paso
+            tiempo_ejecucion = min(quantum, proceso_actual.tiempo_restante)
+            self.segmentos.agregar(proceso_actual.pid, self.tiempo_actual, self.tiempo_actual + tiempo_ejecucion)
+            self.tiempo_actual += tiempo_ejecucion
+            proceso_actual.tiempo_restante -= tiempo_ejecucion
+            
+            # Las llegadas dentro de la porción entran antes que el proceso desalojado; las
+            # del instante final se anuncian después del desalojo o la finalización
+            limite = bisect_right(llegadas, self.tiempo_actual, indice_proximo)
+            if limite > indice_proximo:
+                if inst is not None:
+                    marca = time.perf_counter()
+                cola.extend(procesos_por_llegada[indice_proximo:limite])
+                if inst is not None:
+                    inst.sumar_llegadas(limite - indice_proximo, time.perf_counter() - marca)
+            previas = bisect_left(llegadas, self.tiempo_actual, indice_proximo, limite)
+            for nuevo in procesos_por_llegada[indice_proximo:previas]:
+                yield Evento(TipoEvento.LLEGADA, nuevo.instante_llegada, nuevo.pid, nuevo.tiempo_cpu)
+            
+            if proceso_actual.tiempo_restante > 0:
+                if inst is not None:
+                    marca = time.perf_counter()
+                cola.append(proceso_actual)
+                if inst is not None:
+                    inst.sumar_seleccion(1, 0, time.perf_counter() - marca)
+                yield Evento(TipoEvento.DESALOJO, self.tiempo_actual, proceso_actual.pid, proceso_actual.tiempo_restante)
             else:
-          
-                self.tiempo_actual += 1
-                eventos.append({
-                    'tiempo': self.tiempo_actual,
-                    'evento': "CPU idle - Cola vacía"
-                })
+                proceso_actual.tiempo_finalizacion = self.tiempo_actual
+                completados += 1
+                proceso_actual.tiempo_espera = (proceso_actual.tiempo_finalizacion - 
+                                              proceso_actual.instante_llegada - 
+                                              proceso_actual.tiempo_cpu)
+                yield Evento(TipoEvento.FINALIZACION, self.tiempo_actual, proceso_actual.pid, proceso_actual.tiempo_espera)
+            
+            for nuevo in procesos_por_llegada[previas:limite]:
+                yield Evento(TipoEvento.LLEGADA, nuevo.instante_llegada, nuevo.pid, nuevo.tiempo_cpu)
+            indice_proximo = limite
         
         self.metricas = self.calcular_metricas(procesos)
-        return eventos
+    
+    def _ejecutar_lote(self, lote: ProcesoBatch) -> ProcesoBatch:
+        """Round Robin sobre las columnas del lote, sin generar eventos"""
+        if self._requiere_motor_general_lote(lote):
+            return super()._ejecutar_lote(lote)
+        self.segmentos = RegistroSegmentos()
+        orden = lote.orden_llegada()
+        llegada = lote.llegada[orden]
+        cpu = lote.cpu[orden]
+        primer_despacho, finalizacion, self.tiempo_actual = round_robin_columnas(
+            llegada.tolist(), cpu.tolist(), lote.quantum[orden].tolist(), self.quantum,
+            lote.pid[orden].tolist(), self.segmentos, self.instrumentacion)
+        
+        finalizacion = np.array(finalizacion, dtype=np.int64)
+        lote.finalizacion[orden] = finalizacion
+        lote.espera[orden] = finalizacion - llegada - cpu
+        lote.respuesta[orden] = np.array(primer_despacho, dtype=np.int64) - llegada
+        self.metricas = self.calcular_metricas_lote(lote)
+        return lote
+    
+    def _porcion_multi(self, proceso: Proceso) -> Optional[int]:
+        return proceso.quantum or self.quantum
 
 class Prioridades(AlgoritmoPlanificacion):
     """Planificación por prioridades (menor número = mayor prioridad)"""
     
-    def __init__(self, apropiativo: bool = True):
+    def __init__(self, apropiativo: bool = True, envejecimiento: float = 0,
+                 num_cpus: int = 1, colas_por_cpu: bool = False,
+                 costo_cambio: int = 0, costo_migracion: int = 0):
         nombre = "Prioridades Apropiativo" if apropiativo else "Prioridades No Apropiativo"
-        super().__init__("Prioridades", nombre)
+        super().__init__("Prioridades", nombre, num_cpus, colas_por_cpu, costo_cambio, costo_migracion)
         self.apropiativo = apropiativo
+        # Unidades de prioridad que gana un proceso por cada unidad de tiempo en espera
+        self.envejecimiento = envejecimiento
     
-    def ejecutar(self, procesos: List[Proceso]) -> List[Dict]:
-        """Ejecuta planificación por prioridades"""
-
-        eventos = [{
-            'tiempo': 0,
-            'evento': "Algoritmo de Prioridades no implementado completamente"
-        }]
+    def ejecutar_iter(self, procesos: List[Proceso]) -> Iterator[Evento]:
+        """Ejecuta planificación por prioridades sobre un heap indexado.
         
-        self.metricas = self.calcular_metricas(procesos)
-        return eventos
-
-
-class FabricaAlgoritmos:
-    """Fábrica para crear instancias de algoritmos"""
-    
-    @staticmethod
-    def crear_algoritmo(nombre: str, **kwargs) -> AlgoritmoPlanificacion:
-        algoritmos = {
-            "FCFS": FCFS,
-            "SJF": SJF,
-            "SRTF": SRTF,
-            "Round Robin": RoundRobin,
-            "Prioridades": Prioridades
-        }
+        El envejecimiento se aplica de forma perezosa: la clave de un proceso
+        es ``prioridad + envejecimiento * instante_de_ingreso`` y su prioridad
+        efectiva en el instante t es ``clave - envejecimiento * t``. Como el
+        desplazamiento ``envejecimiento * t`` es común a todos los listos, el
+        orden del heap no cambia con el reloj y no hay que tocar a los
+        procesos en espera en cada tick.
         
-        if nombre not in algoritmos:
-            raise ValueError(f"Algoritmo '{nombre}' no soportado")
+        En modo apropiativo con envejecimiento un listo puede superar al
+        proceso en ejecución entre dos llegadas; ese caso usa el motor
+        general, que agenda el instante del cruce (``_instante_desalojo``).
+        """
+        if self._requiere_motor_general(procesos) or (self.apropiativo and self.envejecimiento):
+            yield from ejecutar_multi_cpu(self, procesos)
+            return
         
-        if nombre == "Round Robin":
-            quantum = kwargs.get('quantum', 5)
-            return RoundRobin(quantum)
-        elif nombre == "Prioridades":
-            apropiativo = kwargs.get('apropiativo', True)
-            return Prioridades(apropiativo)
-        else:
-            return algoritmos[nombre]()
-    
-    @staticmethod
-    def obtener_algoritmos_disponibles() -> List[str]:
-        return ["FCFS", "SJF", "SRTF", "Round Robin", "Prioridades"]
-    
-    @staticmethod
-    def obtener_descripcion(algoritmo: str) -> str:
-        descripciones = {
-            "FCFS": "First Come First Served - No apropiativo",
-            "SJF": "Shortest Job First - No apropiativo",
-            "SRTF": "Shortest Remaining Time First - Apropiativo",
-            "Round Robin": "Round Robin - Apropiativo con quantum",
-            "Prioridades": "Planificación por prioridades"
-        }
-        return descripciones.get(algoritmo, "Descripción no disponible")
-
-
-def analizar_comparativo(procesos: List[Proceso]) -> Dict:
-    """Ejecuta todos los algoritmos y compara métricas"""
-    resultados = {}
-    fabrica = FabricaAlgoritmos()
-    
-    for nombre_algoritmo in fabrica.obtener_algoritmos_disponibles():
-        try:
-           
-            procesos_copia = []
-            for p in procesos:
-                nuevo_proceso = Proceso(p.nombre, p.tiempo_cpu, p.instante_llegada, p.quantum)
-                procesos_copia.append(nuevo_proceso)
-            
-            algoritmo = fabrica.crear_algoritmo(nombre_algoritmo)
-            eventos = algoritmo.ejecutar(procesos_copia)
-            
-            resultados[nombre_algoritmo] = {
-                'metricas': algoritmo.metricas,
-                'eventos': eventos,
-                'tiempo_total': algoritmo.tiempo_actual
-            }
-            
-        except Exception as e:
-            resultados[nombre_algoritmo] = {
-                'error': str(e),
-                'metricas': {},
-                'eventos': []
-            }
-    
-    return resultados
-
-if __name__ == "__main__":
-    
-    procesos_ejemplo = [
-        Proceso("P1", 5, 0),
-        Proceso("P2", 3, 1),
-        Proceso("P3", 8, 2)
-    ]
-    
-    
-    fcfs = FCFS()
-    eventos = fcfs.ejecutar(procesos_ejemplo)
-    
-    print("=== FCFS ===")
-    for evento in eventos:
-        print(f"T{evento['tiempo']}: {evento['evento']}")
-    
-    print("\nMétricas:", fcfs.metricas)
-
-    
-    procesos_dict = [
-        {"Nombre": "P1", "CPU": 5, "Llegada": 0, "Quantum": 3},
-        {"Nombre": "P2", "CPU": 2, "Llegada": 1, "Quantum": 3},
-        {"Nombre": "P3", "CPU": 8, "Llegada": 2, "Quantum": 4}
-    ]
-    
-    procesos_objetos = []
-    for i, p_dict in enumerate(procesos_dict, 1):
-        proceso = Proceso(
-            p_dict["Nombre"],
-            p_dict["CPU"],
-            p_dict["Llegada"],
-            p_dict["Quantum"]
-        )
-        procesos_objetos.append(proceso)
-
-
-from typing import List, Dict, Tuple
-from procesos import Proceso
-import heapq
-import interfaz
-class AlgoritmoPlanificacion:
-    """Clase base para todos los algoritmos de planificación"""
-    
-    def __init__(self, nombre: str, descripcion: str = ""):
-        self.nombre = nombre
-        self.descripcion = descripcion
-        self.metricas = {}
         self.tiempo_actual = 0
-    
-    def ejecutar(self, procesos: List[Proceso]) -> List[Dict]:
-        """Método abstracto que debe ser implementado por cada algoritmo"""
-        raise NotImplementedError("Este método debe ser implementado por las subclases")
-    
-    def calcular_metricas(self, procesos: List[Proceso]) -> Dict:
-        """Calcula métricas comunes para todos los algoritmos"""
-        if not procesos:
-            return {}
-        
-        tiempos_espera = []
-        tiempos_respuesta = []
-        tiempos_retorno = []
+        self.segmentos = RegistroSegmentos()
         
-        for proceso in procesos:
-            if (proceso.tiempo_finalizacion is not None and 
-                proceso.tiempo_respuesta is not None):
-                
-                turnaround = proceso.tiempo_finalizacion - proceso.instante_llegada
-                tiempo_retorno = turnaround
-                tiempo_espera = proceso.tiempo_espera
-                tiempo_respuesta = proceso.tiempo_respuesta
-                
-                tiempos_retorno.append(tiempo_retorno)
-                tiempos_espera.append(tiempo_espera)
-                tiempos_respuesta.append(tiempo_respuesta)
-        
-        metricas = {
-            'throughput': len([p for p in procesos if p.tiempo_finalizacion is not None]),
-            'tiempo_retorno_promedio': sum(tiempos_retorno) / len(tiempos_retorno) if tiempos_retorno else 0,
-            'tiempo_espera_promedio': sum(tiempos_espera) / len(tiempos_espera) if tiempos_espera else 0,
-            'tiempo_respuesta_promedio': sum(tiempos_respuesta) / len(tiempos_respuesta) if tiempos_respuesta else 0,
-            'uso_cpu': (self.tiempo_actual - sum(tiempos_espera)) / self.tiempo_actual if self.tiempo_actual > 0 else 0
-        }
+        for p in procesos:
+            p.tiempo_restante = p.tiempo_cpu
+            p.ejecutado = False
         
-        return metricas
-
-class FCFS(AlgoritmoPlanificacion):
-    """First Come First Served (FIFO) - No apropiativo"""
-    
-    def __init__(self):
-        super().__init__("FCFS", "First Come First Served - No apropiativo")
-    
-    def ejecutar(self, procesos: List[Proceso]) -> List[Dict]:
-        """Ejecuta el algoritmo FCFS"""
-        self.tiempo_actual = 0
-        eventos = []
+        procesos_por_llegada = sorted(procesos, key=lambda x: x.instante_llegada)
+        total = len(procesos_por_llegada)
+        indice_proximo = 0
+        por_pid = {}
         
-       
-        procesos_ordenados = sorted(procesos, key=lambda x: x.instante_llegada)
+        # En modo apropiativo el proceso en ejecución permanece en el heap y
+        # su clave se refresca con actualizar(), porque no envejece mientras usa la CPU
+        listos = HeapIndexado()
+        proceso_actual = None
+        completados = 0
+        inst = self.instrumentacion
         
-        for proceso in procesos_ordenados:
-           
-            if self.tiempo_actual < proceso.instante_llegada:
-                self.tiempo_actual = proceso.instante_llegada
-                eventos.append({
-                    'tiempo': self.tiempo_actual,
-                    'evento': f"Proceso {proceso.nombre} llega al sistema"
-                })
-            
-          
-            if not proceso.ejecutado:
-                proceso.tiempo_respuesta = self.tiempo_actual - proceso.instante_llegada
-                proceso.ejecutado = True
-                eventos.append({
-                    'tiempo': self.tiempo_actual,
-                    'evento': f"Inicia ejecución de {proceso.nombre} (PID: {proceso.pid})"
-                })
-            
-          
-            inicio_ejecucion = self.tiempo_actual
-            self.tiempo_actual += proceso.tiempo_cpu
-            proceso.tiempo_restante = 0
-            proceso.tiempo_finalizacion = self.tiempo_actual
+        while completados < total:
             
-           
-            proceso.tiempo_espera = inicio_ejecucion - proceso.instante_llegada
+            if not listos:
+                siguiente_llegada = procesos_por_llegada[indice_proximo].instante_llegada
+                if siguiente_llegada > self.tiempo_actual:
+                    yield Evento(TipoEvento.CPU_OCIOSA, self.tiempo_actual, 0, siguiente_llegada)
+                    self.tiempo_actual = siguiente_llegada
             
-            eventos.append({
-                'tiempo': self.tiempo_actual,
-                'evento': f"Finaliza {proceso.nombre} | Espera: {proceso.tiempo_espera}"
-            })
-        
-        self.metricas = self.calcular_metricas(procesos)
-        return eventos
-
-class SJF(AlgoritmoPlanificacion):
-    """Shortest Job First (No apropiativo)"""
-    
-    def __init__(self):
-        super().__init__("SJF", "Shortest Job First - No apropiativo")
-    
-    def ejecutar(self, procesos: List[Proceso]) -> List[Dict]:
-        """Ejecuta el algoritmo SJF no apropiativo"""
-        self.tiempo_actual = 0
-        eventos = []
-        completados = []
-        cola_espera = []
-        
-        
-        procesos_restantes = sorted(procesos, key=lambda x: x.instante_llegada)
-        
-        while len(completados) < len(procesos):
-            
-            llegados = [p for p in procesos_restantes 
-                       if p.instante_llegada <= self.tiempo_actual and p not in completados]
+            while (indice_proximo < total and 
+                   procesos_por_llegada[indice_proximo].instante_llegada <= self.tiempo_actual):
+                p = procesos_por_llegada[indice_proximo]
+                if inst is not None:
+                    marca = time.perf_counter()
+                por_pid[p.pid] = p
+                listos.insertar(p.pid, (self._clave(p, p.instante_llegada), indice_proximo))
+                if inst is not None:
+                    inst.sumar_llegadas(1, time.perf_counter() - marca)
+                yield Evento(TipoEvento.LLEGADA, self.tiempo_actual, p.pid, p.tiempo_cpu)
+                indice_proximo += 1
             
-            for p in llegados:
-                if p not in cola_espera:
-                    cola_espera.append(p)
-                    eventos.append({
-                        'tiempo': self.tiempo_actual,
-                        'evento': f"{p.nombre} llega a cola de espera"
-                    })
+            if proceso_actual is not None:
+                if inst is not None:
+                    marca = time.perf_counter()
+                clave_actual = (self._clave(proceso_actual, self.tiempo_actual), listos.clave(proceso_actual.pid)[1])
+                listos.actualizar(proceso_actual.pid, clave_actual)
+                candidato = listos.tope()
+                desalojar = candidato != proceso_actual.pid and listos.clave(candidato)[0] < clave_actual[0]
+                if inst is not None:
+                    inst.sumar_seleccion(0, 0, time.perf_counter() - marca)
+                if desalojar:
+                    yield Evento(TipoEvento.DESALOJO, self.tiempo_actual, proceso_actual.pid, proceso_actual.tiempo_restante)
+                    proceso_actual = None
             
-            if cola_espera:
-             
-                cola_espera.sort(key=lambda x: x.tiempo_cpu)
-                proceso_actual = cola_espera.pop(0)
+            if proceso_actual is None:
+                if inst is not None:
+                    marca = time.perf_counter()
+                # En modo apropiativo el elegido sigue en el heap hasta que termina
+                pid_elegido = listos.tope() if self.apropiativo else listos.extraer()[0]
+                proceso_actual = por_pid[pid_elegido]
                 
-          
                 if not proceso_actual.ejecutado:
                     proceso_actual.tiempo_respuesta = self.tiempo_actual - proceso_actual.instante_llegada
                     proceso_actual.ejecutado = True
+                if inst is not None:
+                    inst.sumar_seleccion(0, 0 if self.apropiativo else 1, time.perf_counter() - marca)
                 
-                inicio_ejecucion = self.tiempo_actual
-                eventos.append({
-                    'tiempo': self.tiempo_actual,
-                    'evento': f"SJF selecciona {proceso_actual.nombre} (CPU: {proceso_actual.tiempo_cpu})"
-                })
-                
-                
-                self.tiempo_actual += proceso_actual.tiempo_cpu
-                proceso_actual.tiempo_restante = 0
-                proceso_actual.tiempo_finalizacion = self.tiempo_actual
-                proceso_actual.tiempo_espera = inicio_ejecucion - proceso_actual.instante_llegada
-                
-                eventos.append({
-                    'tiempo': self.tiempo_actual,
-                    'evento': f"Finaliza {proceso_actual.nombre} | Espera: {proceso_actual.tiempo_espera}"
-                })
-                
-                completados.append(proceso_actual)
-                procesos_restantes.remove(proceso_actual)
+                yield Evento(TipoEvento.DESPACHO, self.tiempo_actual, proceso_actual.pid, proceso_actual.tiempo_restante)
+            
+            # Sin apropiación el proceso corre hasta terminar; con apropiación
+            # solo hasta la siguiente llegada, que puede desalojarlo
+            fin = self.tiempo_actual + proceso_actual.tiempo_restante
+            if (self.apropiativo and indice_proximo < total and 
+                    procesos_por_llegada[indice_proximo].instante_llegada < fin):
+                siguiente_llegada = procesos_por_llegada[indice_proximo].instante_llegada
+                self.segmentos.agregar(proceso_actual.pid, self.tiempo_actual, siguiente_llegada)
+                proceso_actual.tiempo_restante -= siguiente_llegada - self.tiempo_actual
+                self.tiempo_actual = siguiente_llegada
             else:
-               
-                self.tiempo_actual += 1
-                eventos.append({
-                    'tiempo': self.tiempo_actual,
-                    'evento': "CPU idle - Esperando procesos"
-                })
+                self.segmentos.agregar(proceso_actual.pid, self.tiempo_actual, fin)
+                self.tiempo_actual = fin
+                # Sin apropiación las llegadas durante la ráfaga entran a la cola en su instante
+                while (indice_proximo < total and 
+                       procesos_por_llegada[indice_proximo].instante_llegada < fin):
+                    p = procesos_por_llegada[indice_proximo]
+                    if inst is not None:
+                        marca = time.perf_counter()
+                    por_pid[p.pid] = p
+                    listos.insertar(p.pid, (self._clave(p, p.instante_llegada), indice_proximo))
+                    if inst is not None:
+                        inst.sumar_llegadas(1, time.perf_counter() - marca)
+                    yield Evento(TipoEvento.LLEGADA, p.instante_llegada, p.pid, p.tiempo_cpu)
+                    indice_proximo += 1
+                proceso_actual.tiempo_restante = 0
+                proceso_actual.tiempo_finalizacion = fin
+                proceso_actual.tiempo_espera = fin - proceso_actual.instante_llegada - proceso_actual.tiempo_cpu
+                if self.apropiativo:
+                    listos.eliminar(proceso_actual.pid)
+                    if inst is not None:
+                        inst.sumar_cola(0, 1)
+                completados += 1
+                yield Evento(TipoEvento.FINALIZACION, self.tiempo_actual, proceso_actual.pid, proceso_actual.tiempo_espera)
+                proceso_actual = None
         
         self.metricas = self.calcular_metricas(procesos)
-        return eventos
+    
+    def _ejecutar_lote(self, lote: ProcesoBatch) -> ProcesoBatch:
+        """En modo no apropiativo planifica directo sobre las columnas del lote"""
+        if self.apropiativo or self._requiere_motor_general_lote(lote):
+            return super()._ejecutar_lote(lote)
+        
+        # Con envejecimiento perezoso la clave solo depende del instante de llegada
+        claves = lote.prioridad + self.envejecimiento * lote.llegada
+        self.tiempo_actual = ejecutar_no_apropiativo(lote, np.lexsort((lote.pid, lote.llegada, claves)),
+                                                     self.instrumentacion)
+        self.segmentos = self._segmentos_no_apropiativos(lote)
+        self.metricas = self.calcular_metricas_lote(lote)
+        return lote
+    
+    def _clave(self, proceso: Proceso, instante_ingreso: int) -> float:
+        """Clave de orden con el envejecimiento expresado respecto al reloj global"""
+        return proceso.prioridad + self.envejecimiento * instante_ingreso
+    
+    def _clave_multi(self, proceso: Proceso, instante: int, ingreso: int) -> float:
+        return self._clave(proceso, instante)
+    
+    def _clave_en_ejecucion(self, proceso: Proceso, inicio: int, instante: int) -> float:
+        return self._clave(proceso, instante)
+    
+    def _instante_desalojo(self, clave: float, proceso: Proceso, inicio: int, instante: int) -> Optional[int]:
+        # El proceso en ejecución no envejece: lo supera el listo con clave < prioridad + envejecimiento * t
+        if self.envejecimiento <= 0:
+            return None
+        cruce = math.floor((clave - proceso.prioridad) / self.envejecimiento) + 1
+        # Corrige el redondeo de punto flotante con la misma comparación que usa el motor
+        while not clave < self._clave(proceso, cruce):
+            cruce += 1
+        while clave < self._clave(proceso, cruce - 1):
+            cruce -= 1
+        return cruce
+    
+    def _es_apropiativo(self) -> bool:
+        return self.apropiativo
 
-class SRTF(AlgoritmoPlanificacion):
-    """Shortest Remaining Time First (Apropiativo)"""
+
+class MLFQ(AlgoritmoPlanificacion):
+    """Multilevel Feedback Queue: colas por nivel con degradación y boost periódico"""
     
-    def __init__(self):
-        super().__init__("SRTF", "Shortest Remaining Time First - Apropiativo")
+    def __init__(self, niveles: int = 3, quantums: Optional[List[int]] = None,
+                 periodo_boost: Optional[int] = None, num_cpus: int = 1,
+                 colas_por_cpu: bool = False, costo_cambio: int = 0, costo_migracion: int = 0):
+        if not isinstance(niveles, int) or niveles < 1:
+            raise ValueError("El número de niveles debe ser un entero positivo.")
+        if quantums is None:
+            # Quantum creciente: los niveles bajos favorecen a los procesos largos
+            quantums = [4 * 2 ** nivel for nivel in range(niveles)]
+        if len(quantums) != niveles or any(not isinstance(q, int) or q <= 0 for q in quantums):
+            raise ValueError("Debe indicarse un quantum entero positivo por nivel.")
+        if periodo_boost is not None and (not isinstance(periodo_boost, int) or periodo_boost <= 0):
+            raise ValueError("El periodo de boost debe ser un entero positivo (si aplica).")
+        
+        super().__init__("MLFQ", f"Multilevel Feedback Queue con {niveles} niveles",
+                         num_cpus, colas_por_cpu, costo_cambio, costo_migracion)
+        self.niveles = niveles
+        self.quantums = list(quantums)
+        self.periodo_boost = periodo_boost
+        self._reiniciar_multi()
     
-    def ejecutar(self, procesos: List[Proceso]) -> List[Dict]:
-        """Ejecuta el algoritmo SRTF"""
-        self.tiempo_actual = 0
-        eventos = []
+    def ejecutar_iter(self, procesos: List[Proceso]) -> Iterator[Evento]:
+        """Ejecuta MLFQ como simulación por eventos discretos.
         
-        # Inicializar procesos
-        for p in procesos:
-            p.tiempo_restante = p.tiempo_cpu
-            p.ejecutado = False
+        Cada nivel es un deque FIFO y un entero hace de bitmap de niveles no
+        vacíos, así que el siguiente nivel a atender es el bit menos
+        significativo encendido (O(1)). Un proceso que consume todo el
+        quantum de su nivel baja un nivel; si lo desaloja una llegada de
+        mayor prioridad conserva lo consumido en el nivel. Cada
+        ``periodo_boost`` unidades todos los procesos vuelven al nivel 0. El
+        quantum propio de los procesos no se usa: lo define cada nivel. Un
+        proceso que se bloquea por E/S vuelve al mismo nivel al desbloquearse.
+        Con ``costo_cambio`` el cambio de contexto se modela como en el motor
+        general (ver ``multicpu.ejecutar_multi_cpu``), que es el que se usa
+        con varias CPUs a través de los ganchos de política.
+        """
+        return self.ejecutar_reanudable(procesos, {})
+    
+    def ejecutar_reanudable(self, procesos: List[Proceso], estado: Dict,
+                            hasta: Optional[int] = None) -> Iterator[Evento]:
+        """Motor de MLFQ con su estado en ``estado`` (ver ``AlgoritmoPlanificacion.ejecutar_reanudable``)"""
+        if self.num_cpus > 1:
+            return ejecutar_multi_cpu(self, procesos, estado, hasta)
+        return self._ejecutar_una_cpu(procesos, estado, hasta)
+    
+    def _ejecutar_una_cpu(self, procesos: List[Proceso], estado: Dict,
+                          hasta: Optional[int] = None) -> Iterator[Evento]:
+        if not estado:
+            self.tiempo_actual = 0
+            self.segmentos = RegistroSegmentos()
+            estado.update(
+                hay_es=preparar_rafagas(procesos),
+                dispositivos=DispositivosES(),
+                procesos_por_llegada=sorted(procesos, key=lambda x: x.instante_llegada),
+                indice_proximo=0,
+                colas=[deque() for _ in range(self.niveles)],
+                ocupados=0,  # bit i encendido <=> colas[i] no vacía
+                nivel={},
+                usado={},
+                proximo_boost=self.periodo_boost if self.periodo_boost else None,
+                proceso_actual=None,
+                pendiente_reencolar=None,
+                completados=0,
+                tiempo=0,
+                ultimo_pid=None,
+                cambios=0,
+                tiempo_cambio=0,
+                cambio_restante=0,  # lo que falta del cambio de contexto en curso
+                segmentos=self.segmentos,
+                terminado=False,
+            )
         
-        completados = []
-        proceso_actual = None
-        tiempo_inicio_ejecucion = 0
+        # Los contenedores se modifican en el lugar; los escalares se devuelven a ``estado`` al pausar
+        self.tiempo_actual = estado['tiempo']
+        self.segmentos = estado['segmentos']
+        hay_es = estado['hay_es']
+        dispositivos = estado['dispositivos']
+        procesos_por_llegada = estado['procesos_por_llegada']
+        total = len(procesos_por_llegada)
+        indice_proximo = estado['indice_proximo']
+        colas = estado['colas']
+        ocupados = estado['ocupados']
+        nivel = estado['nivel']
+        usado = estado['usado']
+        proximo_boost = estado['proximo_boost']
+        proceso_actual = estado['proceso_actual']
+        pendiente_reencolar = estado['pendiente_reencolar']
+        completados = estado['completados']
+        ultimo_pid = estado['ultimo_pid']
+        cambios = estado['cambios']
+        tiempo_cambio = estado['tiempo_cambio']
+        cambio_restante = estado['cambio_restante']
+        inst = self.instrumentacion
         
-        while len(completados) < len(procesos):
-            
-            nuevos = [p for p in procesos 
-                     if p.instante_llegada == self.tiempo_actual and p not in completados]
+        while completados < total:
             
-            for p in nuevos:
-                eventos.append({
-                    'tiempo': self.tiempo_actual,
-                    'evento': f"{p.nombre} llega al sistema"
-                })
+            if hasta is not None and self.tiempo_actual >= hasta:
+                estado.update(tiempo=self.tiempo_actual, indice_proximo=indice_proximo,
+                              ocupados=ocupados, proximo_boost=proximo_boost,
+                              proceso_actual=proceso_actual,
+                              pendiente_reencolar=pendiente_reencolar, completados=completados,
+                              ultimo_pid=ultimo_pid, cambios=cambios, tiempo_cambio=tiempo_cambio,
+                              cambio_restante=cambio_restante)
+                return
             
-           
-            procesos_listos = [p for p in procesos 
-                             if p.instante_llegada <= self.tiempo_actual 
-                             and p.tiempo_restante > 0 
-                             and p not in completados]
+            if proceso_actual is None and not ocupados and pendiente_reencolar is None:
+                siguiente = (procesos_por_llegada[indice_proximo].instante_llegada
+                             if indice_proximo < total else None)
+                fin_es = dispositivos.proximo_fin()
+                if fin_es is not None and (siguiente is None or fin_es < siguiente):
+                    siguiente = fin_es
+                if siguiente > self.tiempo_actual:
+                    yield Evento(TipoEvento.CPU_OCIOSA, self.tiempo_actual, 0, siguiente)
+                    self.tiempo_actual = siguiente
             
-            if procesos_listos:
-           
-                procesos_listos.sort(key=lambda x: x.tiempo_restante)
-                nuevo_proceso = procesos_listos[0]
-                
+            # Boost: todos los procesos del sistema (incluidos los bloqueados) vuelven al nivel 0
+            if proximo_boost is not None and self.tiempo_actual >= proximo_boost:
+                for cola in colas[1:]:
+                    colas[0].extend(cola)
+                    cola.clear()
+                ocupados = 1 if colas[0] else 0
+                for pid in nivel:
+                    nivel[pid] = 0
+                    usado[pid] = 0
+                proximo_boost = (self.tiempo_actual // self.periodo_boost + 1) * self.periodo_boost
             
-                if proceso_actual != nuevo_proceso:
-                    if proceso_actual is not None:
-                        
-                        tiempo_ejecutado = self.tiempo_actual - tiempo_inicio_ejecucion
-                        proceso_actual.tiempo_restante -= tiempo_ejecutado
-                        
-                        if proceso_actual.tiempo_restante <= 0:
-                            proceso_actual.tiempo_finalizacion = self.tiempo_actual
-                            completados.append(proceso_actual)
-                            eventos.append({
-                                'tiempo': self.tiempo_actual,
-                                'evento': f"Finaliza {proceso_actual.nombre}"
-                            })
-                    
-                    proceso_actual = nuevo_proceso
-                    tiempo_inicio_ejecucion = self.tiempo_actual
-                    
-                    if not proceso_actual.ejecutado:
-                        proceso_actual.tiempo_respuesta = self.tiempo_actual - proceso_actual.instante_llegada
-                        proceso_actual.ejecutado = True
-                    
-                    eventos.append({
-                        'tiempo': self.tiempo_actual,
-                        'evento': f"SRTF cambia a {proceso_actual.nombre} (Restante: {proceso_actual.tiempo_restante})"
-                    })
-                
-                # Ejecutar una unidad de tiempo
-                self.tiempo_actual += 1
-                
-            else:
-                # CPU idle
-                proceso_actual = None
-                self.tiempo_actual += 1
-                eventos.append({
-                    'tiempo': self.tiempo_actual,
-                    'evento': "CPU idle"
-                })
-        
-        # Calcular tiempos de espera
-        for p in procesos:
-            p.tiempo_espera = p.tiempo_finalizacion - p.instante_llegada - p.tiempo_cpu
-        
-        self.metricas = self.calcular_metricas(procesos)
-        return eventos
-
-class RoundRobin(AlgoritmoPlanificacion):
-    """Round Robin con quantum configurable"""
-    
-    def __init__(self, quantum: int = 5 ):
-        super().__init__("Round Robin", f"Round Robin con quantum={quantum}")
-        self.quantum = quantum
-    
-    def ejecutar(self, procesos: List[Proceso]) -> List[Dict]:
-        """Ejecuta el algoritmo Round Robin"""
-        self.tiempo_actual = 0
-        eventos = []
-        
-
-        for p in procesos:
-            p.tiempo_restante = p.tiempo_cpu
-            p.ejecutado = False
-        
-
-        cola = []
-        completados = []
-        
-       
-        procesos_por_llegada = sorted(procesos, key=lambda x: x.instante_llegada)
-        indice_proximo = 0
-        
-        while len(completados) < len(procesos):
-       
-            while (indice_proximo < len(procesos_por_llegada) and 
+            while (indice_proximo < total and 
                    procesos_por_llegada[indice_proximo].instante_llegada <= self.tiempo_actual):
-                proceso = procesos_por_llegada[indice_proximo]
-                cola.append(proceso)
-                eventos.append({
-                    'tiempo': self.tiempo_actual,
-                    'evento': f"{proceso.nombre} se agrega a cola RR"
-                })
+                p = procesos_por_llegada[indice_proximo]
+                if inst is not None:
+                    marca = time.perf_counter()
+                nivel[p.pid] = 0
+                usado[p.pid] = 0
+                colas[0].append(p)
+                ocupados |= 1
+                if inst is not None:
+                    inst.sumar_llegadas(1, time.perf_counter() - marca)
+                yield Evento(TipoEvento.LLEGADA, self.tiempo_actual, p.pid, p.tiempo_cpu)
                 indice_proximo += 1
             
-            if cola:
-                proceso_actual = cola.pop(0)
+            if hay_es:
+                for p in dispositivos.completar_hasta(self.tiempo_actual):
+                    if inst is not None:
+                        marca = time.perf_counter()
+                    n = nivel[p.pid]
+                    colas[n].append(p)
+                    ocupados |= 1 << n
+                    if inst is not None:
+                        inst.sumar_llegadas(1, time.perf_counter() - marca)
+                    yield Evento(TipoEvento.DESBLOQUEO, self.tiempo_actual, p.pid, p.tiempo_restante)
+            
+            # Como en Round Robin, el proceso que agotó su porción entra detrás de las llegadas
+            if pendiente_reencolar is not None:
+                if inst is not None:
+                    marca = time.perf_counter()
+                n = nivel[pendiente_reencolar.pid]
+                colas[n].append(pendiente_reencolar)
+                ocupados |= 1 << n
+                pendiente_reencolar = None
+                if inst is not None:
+                    inst.sumar_seleccion(1, 0, time.perf_counter() - marca)
+            
+            # Apropiación: hay listos en un nivel estrictamente superior al del proceso actual
+            # (el cambio de contexto en curso no se interrumpe)
+            if (proceso_actual is not None and not cambio_restante
+                    and ocupados & ((1 << nivel[proceso_actual.pid]) - 1)):
+                if inst is not None:
+                    marca = time.perf_counter()
+                n = nivel[proceso_actual.pid]
+                colas[n].append(proceso_actual)
+                ocupados |= 1 << n
+                if inst is not None:
+                    inst.sumar_seleccion(1, 0, time.perf_counter() - marca)
+                yield Evento(TipoEvento.DESALOJO, self.tiempo_actual, proceso_actual.pid, proceso_actual.tiempo_restante)
+                proceso_actual = None
+            
+            if proceso_actual is None:
+                if inst is not None:
+                    marca = time.perf_counter()
+                n = (ocupados & -ocupados).bit_length() - 1
+                proceso_actual = colas[n].popleft()
+                if not colas[n]:
+                    ocupados &= ~(1 << n)
+                
+                if proceso_actual.pid != ultimo_pid:
+                    ultimo_pid = proceso_actual.pid
+                    cambios += 1
+                    cambio_restante = self.costo_cambio
+                    tiempo_cambio += cambio_restante
                 
-  
                 if not proceso_actual.ejecutado:
-                    proceso_actual.tiempo_respuesta = self.tiempo_actual - proceso_actual.instante_llegada
+                    # La respuesta se fija al ejecutar por primera vez: tras el cambio
+                    # de contexto una llegada todavía puede desalojarlo
+                    proceso_actual.tiempo_respuesta = None
                     proceso_actual.ejecutado = True
-                    eventos.append({
-                        'tiempo': self.tiempo_actual,
-                        'evento': f"RR inicia {proceso_actual.nombre} (Quantum: {self.quantum})"
-                    })
-                
-                
-                tiempo_ejecucion = min(self.quantum, proceso_actual.tiempo_restante)
-                inicio_bloque = self.tiempo_actual
+                if inst is not None:
+                    inst.sumar_seleccion(0, 1, time.perf_counter() - marca)
                 
-                for i in range(tiempo_ejecucion):
-                    self.tiempo_actual += 1
-                    proceso_actual.tiempo_restante -= 1
-                    
-             
-                    while (indice_proximo < len(procesos_por_llegada) and 
-                           procesos_por_llegada[indice_proximo].instante_llegada <= self.tiempo_actual):
-                        nuevo = procesos_por_llegada[indice_proximo]
-                        cola.append(nuevo)
-                        eventos.append({
-                            'tiempo': self.tiempo_actual,
-                            'evento': f"{nuevo.nombre} llega durante ejecución"
-                        })
-                        indice_proximo += 1
-                
-                if proceso_actual.tiempo_restante > 0:
-                  
-                    cola.append(proceso_actual)
-                    eventos.append({
-                        'tiempo': self.tiempo_actual,
-                        'evento': f"{proceso_actual.nombre} vuelve a cola ({proceso_actual.tiempo_restante} restante)"
-                    })
+                yield Evento(TipoEvento.DESPACHO, self.tiempo_actual, proceso_actual.pid, proceso_actual.tiempo_restante)
+            
+            # Cambio de contexto: la CPU avanza sin ejecutar al proceso, atendiendo
+            # llegadas, fines de E/S y el boost que ocurran mientras tanto
+            if cambio_restante:
+                limite = self.tiempo_actual + cambio_restante
+                if indice_proximo < total:
+                    limite = min(limite, procesos_por_llegada[indice_proximo].instante_llegada)
+                if proximo_boost is not None:
+                    limite = min(limite, proximo_boost)
+                if hay_es and dispositivos.proximo_fin() is not None:
+                    limite = min(limite, dispositivos.proximo_fin())
+                cambio_restante -= limite - self.tiempo_actual
+                self.tiempo_actual = limite
+                continue
+            
+            # Avanzar hasta fin de ráfaga o de quantum, el boost o una llegada que pueda
+            # desalojarlo (con boost también se ingresan a tiempo para conservar el orden FIFO)
+            pid = proceso_actual.pid
+            n = nivel[pid]
+            limite = self.tiempo_actual + min(proceso_actual.tiempo_restante, self.quantums[n] - usado[pid])
+            if indice_proximo < total and (n > 0 or proximo_boost is not None):
+                limite = min(limite, procesos_por_llegada[indice_proximo].instante_llegada)
+            if proximo_boost is not None:
+                limite = min(limite, proximo_boost)
+            if hay_es and dispositivos.proximo_fin() is not None:
+                limite = min(limite, dispositivos.proximo_fin())
+            
+            # En el nivel 0 sin boost una llegada no lo desaloja: entra a la cola en su instante
+            while (indice_proximo < total and
+                   procesos_por_llegada[indice_proximo].instante_llegada < limite):
+                p = procesos_por_llegada[indice_proximo]
+                if inst is not None:
+                    marca = time.perf_counter()
+                nivel[p.pid] = 0
+                usado[p.pid] = 0
+                colas[0].append(p)
+                ocupados |= 1
+                if inst is not None:
+                    inst.sumar_llegadas(1, time.perf_counter() - marca)
+                yield Evento(TipoEvento.LLEGADA, p.instante_llegada, p.pid, p.tiempo_cpu)
+                indice_proximo += 1
+            
+            transcurrido = limite - self.tiempo_actual
+            self.segmentos.agregar(pid, self.tiempo_actual, limite)
+            if proceso_actual.tiempo_respuesta is None and transcurrido:
+                proceso_actual.tiempo_respuesta = self.tiempo_actual - proceso_actual.instante_llegada
+            proceso_actual.tiempo_restante -= transcurrido
+            usado[pid] += transcurrido
+            self.tiempo_actual = limite
+            
+            if proceso_actual.tiempo_restante == 0:
+                if hay_es and siguiente_rafaga(proceso_actual, dispositivos, self.tiempo_actual):
+                    # Quedan ráfagas: se bloquea por E/S conservando su nivel y lo consumido
+                    yield Evento(TipoEvento.BLOQUEO, self.tiempo_actual, pid,
+                                 proceso_actual.rafagas[proceso_actual.indice_rafaga - 1])
                 else:
-                   
                     proceso_actual.tiempo_finalizacion = self.tiempo_actual
-                    completados.append(proceso_actual)
-                    proceso_actual.tiempo_espera = (proceso_actual.tiempo_finalizacion - 
-                                                  proceso_actual.instante_llegada - 
-                                                  proceso_actual.tiempo_cpu)
-                    eventos.append({
-                        'tiempo': self.tiempo_actual,
-                        'evento': f"✅ {proceso_actual.nombre} completado | Espera: {proceso_actual.tiempo_espera}"
-                    })
-            else:
-                # CPU idle
-                self.tiempo_actual += 1
-                eventos.append({
-                    'tiempo': self.tiempo_actual,
-                    'evento': "CPU idle - Cola vacía"
-                })
+                    proceso_actual.tiempo_espera = (self.tiempo_actual - proceso_actual.instante_llegada
+                                                    - proceso_actual.tiempo_cpu - proceso_actual.tiempo_bloqueado)
+                    completados += 1
+                    # Solo se guarda estado de los procesos vivos, así el boost no recorre los terminados
+                    del nivel[pid], usado[pid]
+                    yield Evento(TipoEvento.FINALIZACION, self.tiempo_actual, pid, proceso_actual.tiempo_espera)
+                proceso_actual = None
+            elif usado[pid] >= self.quantums[n]:
+                # Quantum agotado: baja un nivel (el último nivel funciona como Round Robin)
+                nivel[pid] = min(n + 1, self.niveles - 1)
+                usado[pid] = 0
+                yield Evento(TipoEvento.DESALOJO, self.tiempo_actual, pid, proceso_actual.tiempo_restante)
+                pendiente_reencolar = proceso_actual
+                proceso_actual = None
         
+        estado.update(tiempo=self.tiempo_actual, indice_proximo=indice_proximo, ocupados=ocupados,
+                      proximo_boost=proximo_boost, proceso_actual=None, pendiente_reencolar=None,
+                      completados=completados, ultimo_pid=ultimo_pid, cambios=cambios,
+                      tiempo_cambio=tiempo_cambio, cambio_restante=0, terminado=True)
         self.metricas = self.calcular_metricas(procesos)
-        return eventos
-
-class Prioridades(AlgoritmoPlanificacion):
-    """Planificación por prioridades (menor número = mayor prioridad)"""
+        if self.metricas:
+            self.metricas.update(metricas_es(procesos, dispositivos, self.tiempo_actual))
+            if self._con_costo_cambio():
+                self.metricas.update(metricas_cambio_contexto(self.metricas, cambios, tiempo_cambio,
+                                                              self.tiempo_actual))
     
-    def __init__(self, apropiativo: bool = True):
-        nombre = "Prioridades Apropiativo" if apropiativo else "Prioridades No Apropiativo"
-        super().__init__("Prioridades", nombre)
-        self.apropiativo = apropiativo
+    # Ganchos del motor general: la clave ordena por nivel y, dentro de cada nivel, por orden de ingreso
     
-    def ejecutar(self, procesos: List[Proceso]) -> List[Dict]:
-        """Ejecuta planificación por prioridades"""
-   
-        
-        eventos = [{
-            'tiempo': 0,
-            'evento': "Algoritmo de Prioridades no implementado completamente"
-        }]
-        
-        self.metricas = self.calcular_metricas(procesos)
-        return eventos
+    def _reiniciar_multi(self):
+        # Nivel y tiempo usado en el nivel por PID (ausente = nivel 0 sin consumo)
+        self._nivel = {}
+        self._usado = {}
+        self._proximo_boost = self.periodo_boost
+    
+    def _clave_multi(self, proceso: Proceso, instante: int, ingreso: int) -> float:
+        return self._nivel.get(proceso.pid, 0) * _ESCALA_NIVEL + ingreso
+    
+    def _clave_en_ejecucion(self, proceso: Proceso, inicio: int, instante: int) -> float:
+        # Menor que cualquier listo del mismo nivel: solo lo desaloja un nivel estrictamente superior
+        return self._nivel.get(proceso.pid, 0) * _ESCALA_NIVEL
+    
+    def _porcion_multi(self, proceso: Proceso) -> Optional[int]:
+        return self.quantums[self._nivel.get(proceso.pid, 0)] - self._usado.get(proceso.pid, 0)
+    
+    def _es_apropiativo(self) -> bool:
+        return True
+    
+    def _consumo_multi(self, proceso: Proceso, transcurrido: int):
+        self._usado[proceso.pid] = self._usado.get(proceso.pid, 0) + transcurrido
+    
+    def _porcion_agotada_multi(self, proceso: Proceso):
+        # Quantum agotado: baja un nivel (el último nivel funciona como Round Robin)
+        self._nivel[proceso.pid] = min(self._nivel.get(proceso.pid, 0) + 1, self.niveles - 1)
+        self._usado[proceso.pid] = 0
+    
+    def _proximo_evento_multi(self) -> Optional[int]:
+        return self._proximo_boost
+    
+    def _evento_multi(self, instante: int):
+        self._nivel.clear()
+        self._usado.clear()
+        self._proximo_boost = (instante // self.periodo_boost + 1) * self.periodo_boost
 
 
 class FabricaAlgoritmos:
@@ -859,24 +1167,39 @@ class FabricaAlgoritmos:
             "SJF": SJF,
             "SRTF": SRTF,
             "Round Robin": RoundRobin,
-            "Prioridades": Prioridades
+            "Prioridades": Prioridades,
+            "MLFQ": MLFQ
         }
         
         if nombre not in algoritmos:
             raise ValueError(f"Algoritmo '{nombre}' no soportado")
         
+        # Parámetros comunes a todos los algoritmos: CPUs y costo de cambio de contexto
+        cpus = {
+            'num_cpus': kwargs.get('num_cpus', 1),
+            'colas_por_cpu': kwargs.get('colas_por_cpu', False),
+            'costo_cambio': kwargs.get('costo_cambio', 0),
+            'costo_migracion': kwargs.get('costo_migracion', 0)
+        }
+        
         if nombre == "Round Robin":
             quantum = kwargs.get('quantum', 5)
-            return RoundRobin(quantum)
+            return RoundRobin(quantum, **cpus)
         elif nombre == "Prioridades":
             apropiativo = kwargs.get('apropiativo', True)
-            return Prioridades(apropiativo)
+            envejecimiento = kwargs.get('envejecimiento', 0)
+            return Prioridades(apropiativo, envejecimiento, **cpus)
+        elif nombre == "MLFQ":
+            niveles = kwargs.get('niveles', 3)
+            quantums = kwargs.get('quantums')
+            periodo_boost = kwargs.get('periodo_boost')
+            return MLFQ(niveles, quantums, periodo_boost, **cpus)
         else:
-            return algoritmos[nombre]()
+            return algoritmos[nombre](**cpus)
     
     @staticmethod
     def obtener_algoritmos_disponibles() -> List[str]:
-        return ["FCFS", "SJF", "SRTF", "Round Robin", "Prioridades"]
+        return ["FCFS", "SJF", "SRTF", "Round Robin", "Prioridades", "MLFQ"]
     
     @staticmethod
     def obtener_descripcion(algoritmo: str) -> str:
@@ -885,41 +1208,150 @@ class FabricaAlgoritmos:
             "SJF": "Shortest Job First - No apropiativo",
             "SRTF": "Shortest Remaining Time First - Apropiativo",
             "Round Robin": "Round Robin - Apropiativo con quantum",
-            "Prioridades": "Planificación por prioridades"
+            "Prioridades": "Planificación por prioridades",
+            "MLFQ": "Multilevel Feedback Queue - Apropiativo con degradación y boost"
         }
         return descripciones.get(algoritmo, "Descripción no disponible")
 
 
-def analizar_comparativo(procesos: List[Proceso]) -> Dict:
-    """Ejecuta todos los algoritmos y compara métricas"""
+# Carga de trabajo del proceso trabajador, enviada una sola vez al crear el pool
+_lote_trabajador = None
+
+
+def _inicializar_trabajador(lote: ProcesoBatch):
+    global _lote_trabajador
+    _lote_trabajador = lote
+
+
+def _ejecutar_configuracion(nombre_algoritmo: str, parametros: Dict,
+                            lote: Optional[ProcesoBatch] = None, instrumentar: bool = False) -> Dict:
+    """Ejecuta una configuración sobre copias de la carga; sirve tanto en serie como en un trabajador"""
+    if lote is None:
+        lote = _lote_trabajador
+    try:
+        algoritmo = FabricaAlgoritmos.crear_algoritmo(nombre_algoritmo, **parametros)
+        if instrumentar:
+            algoritmo.instrumentar()
+        eventos = algoritmo.ejecutar(lote.a_procesos())
+        
+        resultado = {
+            'metricas': algoritmo.metricas,
+            'eventos': eventos,
+            'segmentos': algoritmo.segmentos,
+            'metricas_por_cpu': algoritmo.metricas_por_cpu,
+            'tiempo_total': algoritmo.tiempo_actual
+        }
+        if instrumentar:
+            resultado['instrumentacion'] = algoritmo.instrumentacion.resumen()
+        return resultado
+        
+    except Exception as e:
+        return {
+            'error': str(e),
+            'metricas': {},
+            'eventos': RegistroEventos()
+        }
+
+
+def _ejecutar_configuracion_lote(nombre_algoritmo: str, parametros: Dict,
+                                 lote: Optional[ProcesoBatch] = None) -> Dict:
+    """Como ``_ejecutar_configuracion`` por el camino columnar ``ejecutar_lote``: solo métricas, sin eventos"""
+    if lote is None:
+        lote = _lote_trabajador
+    algoritmo = FabricaAlgoritmos.crear_algoritmo(nombre_algoritmo, **parametros)
+    lote.reiniciar_resultados()
+    algoritmo.ejecutar_lote(lote)
+    return {
+        'metricas': algoritmo.metricas,
+        'metricas_por_cpu': algoritmo.metricas_por_cpu,
+        'tiempo_total': algoritmo.tiempo_actual,
+    }
+
+
+def _ejecutar_en_pool(funcion, tareas: List[Tuple], lote: ProcesoBatch,
+                      max_trabajadores: Optional[int] = None,
+                      inicializar=_inicializar_trabajador) -> Optional[List[Dict]]:
+    """``funcion(*tarea)`` para cada tarea en un pool cuyos trabajadores reciben ``lote`` una sola vez.
+
+    Cada trabajador llama a ``inicializar(lote)`` al crearse. Devuelve los
+    resultados en el orden de ``tareas`` o None si el pool no se puede
+    crear, para que el llamador ejecute en serie.
+    """
+    try:
+        with ProcessPoolExecutor(max_workers=max_trabajadores,
+                                 initializer=inicializar,
+                                 initargs=(lote,)) as pool:
+            futuros = [pool.submit(funcion, *tarea) for tarea in tareas]
+            return [futuro.result() for futuro in futuros]
+    except (OSError, NotImplementedError, BrokenProcessPool):
+        return None
+
+
+def _etiqueta_configuracion(nombre_algoritmo: str, parametros: Dict) -> str:
+    if not parametros:
+        return nombre_algoritmo
+    detalle = ", ".join(f"{clave}={valor}" for clave, valor in parametros.items())
+    return f"{nombre_algoritmo} ({detalle})"
+
+
+def analizar_comparativo(procesos: List[Proceso], paralelo: bool = False,
+                         max_trabajadores: Optional[int] = None,
+                         configuraciones: Optional[List[Tuple[str, Dict]]] = None,
+                         cache: Optional[CacheResultados] = None,
+                         instrumentar: bool = False) -> Dict:
+    """Ejecuta todos los algoritmos y compara métricas.
+    
+    ``configuraciones`` es una lista de pares (algoritmo, parámetros) para
+    comparar también variantes, p. ej. ``("Round Robin", {"quantum": 2})``;
+    por omisión se usan todos los algoritmos disponibles con sus valores por
+    defecto. Con ``paralelo=True`` cada configuración se ejecuta en un
+    proceso de un ``ProcessPoolExecutor`` con ``max_trabajadores`` procesos;
+    la carga viaja en formato columnar una sola vez por trabajador. Los
+    resultados conservan el orden de ``configuraciones`` y, si el pool no se
+    puede crear, se ejecuta en serie.
+    
+    Con ``cache`` las configuraciones ya calculadas sobre la misma carga
+    (mismas columnas, sin importar la numeración de PIDs) se toman de la
+    caché y solo se ejecutan las faltantes, que luego se agregan a ella.
+    
+    Con ``instrumentar`` cada resultado incluye además ``instrumentacion``
+    (contadores y tiempos medidos por los motores, ver
+    ``instrumentacion.Instrumentacion``); como eso exige ejecutar, la caché
+    solo se actualiza y no se consulta.
+    """
+    if configuraciones is None:
+        configuraciones = [(nombre, {}) for nombre in FabricaAlgoritmos.obtener_algoritmos_disponibles()]
+    
+    # Las copias se generan desde el lote conservando los PID originales
+    lote = ProcesoBatch.desde_procesos(procesos)
+    etiquetas = [_etiqueta_configuracion(nombre, parametros) for nombre, parametros in configuraciones]
+    
     resultados = {}
-    fabrica = FabricaAlgoritmos()
+    if cache is not None:
+        carga = cache.carga(lote)
+        for etiqueta, (nombre, parametros) in zip(etiquetas, configuraciones):
+            guardado = None if instrumentar else cache.obtener(nombre, parametros, carga)
+            if guardado is not None:
+                resultados[etiqueta] = guardado
+    faltantes = [(etiqueta, nombre, parametros)
+                 for etiqueta, (nombre, parametros) in zip(etiquetas, configuraciones)
+                 if etiqueta not in resultados]
     
-    for nombre_algoritmo in fabrica.obtener_algoritmos_disponibles():
-        try:
-        
-            procesos_copia = []
-            for p in procesos:
-                nuevo_proceso = Proceso(p.nombre, p.tiempo_cpu, p.instante_llegada, p.quantum)
-                procesos_copia.append(nuevo_proceso)
-            
-            algoritmo = fabrica.crear_algoritmo(nombre_algoritmo)
-            eventos = algoritmo.ejecutar(procesos_copia)
-            
-            resultados[nombre_algoritmo] = {
-                'metricas': algoritmo.metricas,
-                'eventos': eventos,
-                'tiempo_total': algoritmo.tiempo_actual
-            }
-            
-        except Exception as e:
-            resultados[nombre_algoritmo] = {
-                'error': str(e),
-                'metricas': {},
-                'eventos': []
-            }
+    calculados = None
+    if paralelo and len(faltantes) > 1 and max_trabajadores != 1:
+        calculados = _ejecutar_en_pool(_ejecutar_configuracion,
+                                       [(nombre, parametros, None, instrumentar)
+                                        for _, nombre, parametros in faltantes],
+                                       lote, max_trabajadores)
+    if calculados is None:
+        calculados = [_ejecutar_configuracion(nombre, parametros, lote, instrumentar)
+                      for _, nombre, parametros in faltantes]
     
-    return resultados
+    for (etiqueta, nombre, parametros), resultado in zip(faltantes, calculados):
+        resultados[etiqueta] = resultado
+        if cache is not None:
+            cache.guardar(nombre, parametros, carga, resultado)
+    return {etiqueta: resultados[etiqueta] for etiqueta in etiquetas}
 
 if __name__ == "__main__":
     
@@ -934,8 +1366,9 @@ if __name__ == "__main__":
     eventos = fcfs.ejecutar(procesos_ejemplo)
     
     print("=== FCFS ===")
-    for evento in eventos:
-        print(f"T{evento['tiempo']}: {evento['evento']}")
+    nombres = {p.pid: p.nombre for p in procesos_ejemplo}
+    for linea in eventos.textos(nombres, fcfs.nombre):
+        print(linea)
     
     print("\nMétricas:", fcfs.metricas)
 
@@ -0,0 +1,96 @@
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from algoritmos import _ejecutar_en_pool, analizar_comparativo
+from lotes import ProcesoBatch, round_robin_columnas
+from metricas import calcular_metricas_columnas
+from procesos import Proceso
+
+# Columnas ordenadas por llegada del proceso trabajador, enviadas una sola vez al crear el pool
+_columnas_trabajador = None
+
+
+def _preparar_columnas(lote: ProcesoBatch) -> Dict:
+    """Índice de llegadas ordenado una sola vez y reutilizado por todos los quantums"""
+    orden = lote.orden_llegada()
+    llegada = lote.llegada[orden]
+    cpu = lote.cpu[orden]
+    return {
+        'llegada': llegada,
+        'cpu': cpu,
+        'llegadas': llegada.tolist(),
+        'rafagas': cpu.tolist(),
+        'quantums': lote.quantum[orden].tolist(),
+    }
+
+
+def _inicializar_trabajador(lote: ProcesoBatch):
+    global _columnas_trabajador
+    _columnas_trabajador = _preparar_columnas(lote)
+
+
+def _evaluar_quantum(quantum: int, columnas: Optional[Dict] = None) -> Dict:
+    """Métricas de Round Robin para un quantum, sin generar eventos ni segmentos"""
+    if columnas is None:
+        columnas = _columnas_trabajador
+    primer_despacho, finalizacion, tiempo_total = round_robin_columnas(
+        columnas['llegadas'], columnas['rafagas'], columnas['quantums'], quantum)
+
+    llegada = columnas['llegada']
+    cpu = columnas['cpu']
+    finalizacion = np.array(finalizacion, dtype=np.int64)
+    return calcular_metricas_columnas(
+        llegada, cpu, finalizacion,
+        finalizacion - llegada - cpu,
+        np.array(primer_despacho, dtype=np.int64) - llegada,
+        tiempo_total
+    )
+
+
+def barrido_quantum(carga: Union[List[Proceso], ProcesoBatch], quantums: Iterable[int],
+                    solo_metricas: bool = True, paralelo: bool = True,
+                    max_trabajadores: Optional[int] = None,
+                    respetar_quantum_propio: bool = False,
+                    costo_cambio: int = 0, costo_migracion: int = 0) -> Dict[int, Dict]:
+    """Evalúa Round Robin sobre la misma carga para cada quantum de ``quantums``.
+
+    Devuelve un diccionario quantum -> métricas (en el orden recibido). En
+    modo ``solo_metricas`` se usa el núcleo columnar sin eventos y el
+    ordenamiento por llegada se calcula una sola vez por trabajador; con
+    ``solo_metricas=False`` cada punto es una ejecución completa vía
+    ``analizar_comparativo`` y el valor incluye también eventos y segmentos.
+    Con ``respetar_quantum_propio=False`` el quantum del barrido reemplaza al
+    quantum propio de cada proceso. Con ``costo_cambio``/``costo_migracion``
+    cada punto cobra el cambio de contexto (ver ``ejecutar_multi_cpu``), lo
+    que penaliza a los quantums chicos.
+    """
+    quantums = list(dict.fromkeys(quantums))
+    if any(not isinstance(q, int) or q <= 0 for q in quantums):
+        raise ValueError("Todos los quantums del barrido deben ser enteros positivos.")
+
+    lote = carga if isinstance(carga, ProcesoBatch) else ProcesoBatch.desde_procesos(carga)
+    if not respetar_quantum_propio:
+        lote = ProcesoBatch(lote.llegada, lote.cpu, lote.pid, None, lote.prioridad, lote.nombres,
+                            lote.rafagas, lote.dispositivos)
+
+    costos = {clave: valor for clave, valor in (('costo_cambio', costo_cambio),
+                                                 ('costo_migracion', costo_migracion)) if valor}
+
+    # El núcleo columnar no modela E/S ni cambios de contexto: en esos casos cada punto es una ejecución completa
+    if not solo_metricas or lote.tiene_es() or costos:
+        resultados = analizar_comparativo(
+            lote.a_procesos(), paralelo=paralelo, max_trabajadores=max_trabajadores,
+            configuraciones=[("Round Robin", {'quantum': q, **costos}) for q in quantums])
+        if solo_metricas:
+            return {q: resultado['metricas'] for q, resultado in zip(quantums, resultados.values())}
+        return dict(zip(quantums, resultados.values()))
+
+    if paralelo and len(quantums) > 1 and max_trabajadores != 1:
+        calculados = _ejecutar_en_pool(_evaluar_quantum, [(q,) for q in quantums], lote,
+                                       max_trabajadores, _inicializar_trabajador)
+        if calculados is not None:
+            return dict(zip(quantums, calculados))
+
+    columnas = _preparar_columnas(lote)
+    return {q: _evaluar_quantum(q, columnas) for q in quantums}
@@ -0,0 +1,264 @@
+"""Benchmark de los motores de planificación con curvas de escalado.
+
+Ejecuta FCFS, SJF, SRTF, Round Robin y Prioridades sobre cargas sintéticas
+de varios tamaños y distribuciones de ráfagas de CPU, y registra tiempo de
+pared, eventos por segundo y memoria pico (``tracemalloc``). Los resultados
+se guardan como una línea base JSON y pueden compararse con una anterior::
+
+    python -m benchmark --salida base.json
+    python -m benchmark --tamanos 100 10000 --base base.json --umbral 0.15
+
+Con ``--base`` el proceso termina con código 1 si alguna medición empeora
+más que el umbral, para poder usarlo en integración continua.
+"""
+import argparse
+import gc
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from algoritmos import FabricaAlgoritmos
+from cargas import DISTRIBUCIONES_CPU, GeneradorCargas
+
+ALGORITMOS = ("FCFS", "SJF", "SRTF", "Round Robin", "Prioridades")
+TAMANOS = (100, 10_000, 1_000_000)
+
+# Cambia si cambia la forma del archivo de línea base
+_VERSION_BASE = 1
+
+# Con repeticiones automáticas se repite hasta acumular este tiempo (como ``timeit``)
+_SEGUNDOS_OBJETIVO = 0.5
+_REPETICIONES_MAXIMAS = 25
+
+# Debajo de este tiempo las diferencias son ruido del reloj y no se reportan como regresión
+_SEGUNDOS_MINIMOS_COMPARABLES = 0.005
+
+
+def generar_carga(tamano: int, distribucion: str, semilla: int = 0):
+    """Carga sintética del benchmark: llegadas de Poisson con la CPU ocupada ~80 %"""
+    return GeneradorCargas(tamano, rafagas=distribucion, semilla=semilla, tasa_llegada=0.1,
+                           media_cpu=8, niveles_prioridad=10).lote()
+
+
+def medir(nombre_algoritmo: str, lote, parametros: Optional[Dict] = None,
+          repeticiones: Optional[int] = None, memoria: bool = True) -> Dict:
+    """Mide una ejecución completa (con bitácora de eventos) de un algoritmo sobre un lote.
+
+    El tiempo es el mínimo de ``repeticiones`` corridas; sin ``repeticiones``
+    se repite hasta acumular medio segundo, de modo que las cargas chicas se
+    miden muchas veces y las grandes una sola. La memoria pico se mide en una
+    corrida aparte, porque ``tracemalloc`` hace más lento al intérprete. Los
+    objetos Proceso se crean fuera de la medición.
+    """
+    parametros = parametros or {}
+    segundos = math.inf
+    eventos = 0
+    acumulado = 0.0
+    corridas = 0
+    while (corridas < repeticiones if repeticiones is not None
+           else corridas < _REPETICIONES_MAXIMAS and acumulado < _SEGUNDOS_OBJETIVO):
+        procesos = lote.a_procesos()
+        algoritmo = FabricaAlgoritmos.crear_algoritmo(nombre_algoritmo, **parametros)
+        gc.collect()
+        inicio = time.perf_counter()
+        registro = algoritmo.ejecutar(procesos)
+        transcurrido = time.perf_counter() - inicio
+        segundos = min(segundos, transcurrido)
+        acumulado += transcurrido
+        corridas += 1
+        eventos = len(registro)
+        del registro, procesos, algoritmo
+
+    pico = None
+    if memoria:
+        procesos = lote.a_procesos()
+        algoritmo = FabricaAlgoritmos.crear_algoritmo(nombre_algoritmo, **parametros)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            algoritmo.ejecutar(procesos)
+            pico = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'segundos': segundos,
+        'corridas': corridas,
+        'eventos': eventos,
+        'eventos_por_segundo': eventos / segundos if segundos > 0 else None,
+        'memoria_pico_bytes': pico,
+    }
+
+
+def ejecutar_benchmark(algoritmos: Iterable[str] = ALGORITMOS, tamanos: Iterable[int] = TAMANOS,
+                       distribuciones: Iterable[str] = DISTRIBUCIONES_CPU, semilla: int = 0,
+                       repeticiones: Optional[int] = None, memoria: bool = True,
+                       progreso=None) -> Dict:
+    """Ejecuta todas las combinaciones y devuelve la línea base (serializable a JSON).
+
+    ``progreso``, si se indica, se llama con cada medición a medida que termina.
+    """
+    algoritmos = list(algoritmos)
+    tamanos = sorted(set(tamanos))
+    distribuciones = list(distribuciones)
+    for nombre in algoritmos:
+        if nombre not in FabricaAlgoritmos.obtener_algoritmos_disponibles():
+            raise ValueError(f"Algoritmo '{nombre}' no soportado")
+    if any(not isinstance(tamano, int) or tamano <= 0 for tamano in tamanos):
+        raise ValueError("Los tamaños deben ser enteros positivos.")
+    for distribucion in distribuciones:
+        if distribucion not in DISTRIBUCIONES_CPU:
+            raise ValueError(f"Distribución de CPU desconocida: {distribucion}")
+
+    mediciones = []
+    for distribucion in distribuciones:
+        for tamano in tamanos:
+            lote = generar_carga(tamano, distribucion, semilla)
+            for nombre in algoritmos:
+                medicion = {'algoritmo': nombre, 'tamano': tamano, 'distribucion': distribucion}
+                medicion.update(medir(nombre, lote, repeticiones=repeticiones, memoria=memoria))
+                mediciones.append(medicion)
+                if progreso is not None:
+                    progreso(medicion)
+
+    return {
+        'version': _VERSION_BASE,
+        'entorno': {
+            'python': platform.python_version(),
+            'implementacion': platform.python_implementation(),
+            'numpy': np.__version__,
+            'plataforma': platform.platform(),
+            'procesador': platform.machine(),
+        },
+        'parametros': {'semilla': semilla, 'repeticiones': repeticiones},
+        'mediciones': mediciones,
+        'escalado': curvas_escalado(mediciones),
+    }
+
+
+def curvas_escalado(mediciones: List[Dict]) -> List[Dict]:
+    """Exponente empírico ``k`` (tiempo ~ n^k) entre tamaños consecutivos.
+
+    Un exponente cercano a 1 indica un camino O(n) u O(n log n); uno cercano
+    a 2 delata un camino cuadrático.
+    """
+    series: Dict[Tuple[str, str], List[Tuple[int, float]]] = {}
+    for medicion in mediciones:
+        series.setdefault((medicion['algoritmo'], medicion['distribucion']), []).append(
+            (medicion['tamano'], medicion['segundos']))
+
+    curvas = []
+    for (algoritmo, distribucion), puntos in series.items():
+        puntos.sort()
+        for (n1, t1), (n2, t2) in zip(puntos, puntos[1:]):
+            if t1 > 0 and t2 > 0:
+                curvas.append({
+                    'algoritmo': algoritmo, 'distribucion': distribucion, 'desde': n1, 'hasta': n2,
+                    'exponente': math.log(t2 / t1) / math.log(n2 / n1),
+                })
+    return curvas
+
+
+def comparar_bases(actual: Dict, anterior: Dict, umbral: float = 0.10) -> List[Dict]:
+    """Regresiones de ``actual`` respecto de ``anterior``.
+
+    Se comparan las mediciones con el mismo algoritmo, tamaño y distribución;
+    hay regresión cuando el tiempo o la memoria pico crecen más que
+    ``umbral`` (fracción: 0.10 = 10 %). Los tiempos por debajo de unos pocos
+    milisegundos se ignoran por ser ruido.
+    """
+    if umbral < 0:
+        raise ValueError("El umbral de regresión no puede ser negativo.")
+    previas = {(m['algoritmo'], m['tamano'], m['distribucion']): m for m in anterior.get('mediciones', [])}
+
+    regresiones = []
+    for medicion in actual['mediciones']:
+        previa = previas.get((medicion['algoritmo'], medicion['tamano'], medicion['distribucion']))
+        if previa is None:
+            continue
+        for clave in ('segundos', 'memoria_pico_bytes'):
+            antes, ahora = previa.get(clave), medicion.get(clave)
+            if not antes or ahora is None:
+                continue
+            if clave == 'segundos' and max(antes, ahora) < _SEGUNDOS_MINIMOS_COMPARABLES:
+                continue
+            cambio = ahora / antes - 1
+            if cambio > umbral:
+                regresiones.append({
+                    'algoritmo': medicion['algoritmo'], 'tamano': medicion['tamano'],
+                    'distribucion': medicion['distribucion'], 'metrica': clave,
+                    'anterior': antes, 'actual': ahora, 'cambio': cambio,
+                })
+    return regresiones
+
+
+def _formatear_medicion(medicion: Dict) -> str:
+    pico = medicion['memoria_pico_bytes']
+    memoria = f"{pico / 2 ** 20:9.1f} MiB" if pico is not None else "        -    "
+    eventos_por_segundo = medicion['eventos_por_segundo'] or 0
+    return (f"{medicion['algoritmo']:<12} {medicion['distribucion']:<11} {medicion['tamano']:>9} "
+            f"{medicion['segundos']:10.4f} s {eventos_por_segundo:12,.0f} ev/s {memoria}")
+
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmark",
+                                     description="Benchmark de los motores de planificación.")
+    parser.add_argument("--algoritmos", nargs="+", default=list(ALGORITMOS), metavar="NOMBRE")
+    parser.add_argument("--tamanos", nargs="+", type=int, default=list(TAMANOS), metavar="N")
+    parser.add_argument("--distribuciones", nargs="+", default=list(DISTRIBUCIONES_CPU),
+                        choices=DISTRIBUCIONES_CPU)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--repeticiones", type=int,
+                        help="Corridas por medición (por omisión, automático); se reporta el tiempo mínimo")
+    parser.add_argument("--sin-memoria", dest="memoria", action="store_false",
+                        help="No medir la memoria pico (evita la corrida extra con tracemalloc)")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar la línea base")
+    parser.add_argument("--base", help="Línea base anterior con la cual comparar")
+    parser.add_argument("--umbral", type=float, default=0.10,
+                        help="Empeoramiento tolerado antes de reportar una regresión (0.10 = 10 %%)")
+    args = parser.parse_args(argumentos)
+    if args.repeticiones is not None and args.repeticiones < 1:
+        parser.error("--repeticiones debe ser al menos 1.")
+
+    anterior = None
+    if args.base:
+        with open(args.base, encoding="utf-8") as archivo:
+            anterior = json.load(archivo)
+
+    progreso = lambda medicion: print(_formatear_medicion(medicion), flush=True)
+    try:
+        resultado = ejecutar_benchmark(args.algoritmos, args.tamanos, args.distribuciones,
+                                       args.semilla, args.repeticiones, args.memoria, progreso)
+    except ValueError as e:
+        parser.exit(2, f"error: {e}\n")
+
+    print("\nEscalado (tiempo ~ n^k):")
+    for curva in resultado['escalado']:
+        print(f"  {curva['algoritmo']:<12} {curva['distribucion']:<11} "
+              f"{curva['desde']:>9} -> {curva['hasta']:<9} k = {curva['exponente']:.2f}")
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultado, archivo, ensure_ascii=False, indent=2)
+            archivo.write("\n")
+
+    if anterior is not None:
+        regresiones = comparar_bases(resultado, anterior, args.umbral)
+        if regresiones:
+            print(f"\nRegresiones (umbral {args.umbral:.0%}):")
+            for r in regresiones:
+                print(f"  {r['algoritmo']:<12} {r['distribucion']:<11} {r['tamano']:>9} "
+                      f"{r['metrica']}: {r['anterior']:.4g} -> {r['actual']:.4g} (+{r['cambio']:.0%})")
+            return 1
+        print(f"\nSin regresiones respecto de {args.base} (umbral {args.umbral:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
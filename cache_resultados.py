@@ -0,0 +1,253 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+from eventos import RegistroEventos, TipoEvento
+from lotes import ProcesoBatch
+from segmentos import RegistroSegmentos
+
+# Cambia cuando cambia la semántica de los motores: invalida las entradas guardadas en disco
+_VERSION_FORMATO = 1
+
+# Costo fijo estimado por entrada (diccionarios de métricas, claves) además de los arreglos
+_BYTES_FIJOS_ENTRADA = 2048
+
+
+class CargaCanonica:
+    """Forma canónica de una carga para indexar resultados.
+
+    La huella cubre, en el orden de la tabla, llegada, CPU, quantum,
+    prioridad, ráfagas de E/S y el rango de cada PID (los motores solo
+    comparan PIDs para desempatar, así que dos cargas iguales con PIDs
+    distintos pero en el mismo orden relativo producen la misma
+    planificación). Los nombres no influyen en el resultado y se ignoran.
+    """
+
+    __slots__ = ("huella", "pids_ordenados")
+
+    def __init__(self, lote: ProcesoBatch):
+        orden = np.argsort(lote.pid, kind="stable")
+        rangos = np.empty(len(lote), dtype=np.int64)
+        rangos[orden] = np.arange(len(lote), dtype=np.int64)
+        self.pids_ordenados = lote.pid[orden]
+
+        resumen = hashlib.blake2b(digest_size=20)
+        resumen.update(len(lote).to_bytes(8, "little"))
+        for columna in (lote.llegada, lote.cpu, lote.quantum, lote.prioridad, rangos):
+            resumen.update(np.ascontiguousarray(columna, dtype="<i8").tobytes())
+        if lote.tiene_es():
+            resumen.update(json.dumps([lote.rafagas, lote.dispositivos]).encode())
+        self.huella = resumen.hexdigest()
+
+
+def clave_resultado(nombre_algoritmo: str, parametros: Dict, carga: CargaCanonica) -> str:
+    """Clave estable de (algoritmo, parámetros, carga canónica)"""
+    configuracion = json.dumps([_VERSION_FORMATO, nombre_algoritmo, parametros],
+                               sort_keys=True, default=repr)
+    resumen = hashlib.blake2b(configuracion.encode(), digest_size=20)
+    resumen.update(carga.huella.encode())
+    return resumen.hexdigest()
+
+
+class CacheResultados:
+    """Caché de resultados de simulación direccionada por contenido.
+
+    Un resultado es el diccionario que produce ``analizar_comparativo`` por
+    configuración (métricas, eventos, segmentos, métricas por CPU y tiempo
+    total). El nivel en memoria es un LRU acotado por ``capacidad_bytes``
+    (eventos y segmentos más un costo fijo por entrada); con ``directorio``
+    cada resultado también se guarda en disco como un ``.npz`` comprimido,
+    con los PID reemplazados por su rango para poder reutilizarlo con otra
+    numeración. Los resultados devueltos se comparten entre aciertos y no
+    deben modificarse.
+    """
+
+    def __init__(self, capacidad_bytes: int = 256 * 1024 * 1024, directorio: Optional[str] = None):
+        if capacidad_bytes < 0:
+            raise ValueError("La capacidad de la caché no puede ser negativa.")
+        self.capacidad_bytes = capacidad_bytes
+        self.directorio = directorio
+        if directorio is not None:
+            os.makedirs(directorio, exist_ok=True)
+        # clave -> (resultado, PIDs ordenados de la carga con que se guardó, bytes)
+        self._memoria: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._bloqueo = threading.Lock()
+        self.aciertos_memoria = 0
+        self.aciertos_disco = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    @staticmethod
+    def carga(lote: ProcesoBatch) -> CargaCanonica:
+        return CargaCanonica(lote)
+
+    def obtener(self, nombre_algoritmo: str, parametros: Dict, carga: CargaCanonica) -> Optional[Dict]:
+        """Resultado guardado para la configuración sobre la carga, o None"""
+        clave = clave_resultado(nombre_algoritmo, parametros, carga)
+        with self._bloqueo:
+            entrada = self._memoria.get(clave)
+            if entrada is not None:
+                self._memoria.move_to_end(clave)
+                self.aciertos_memoria += 1
+        if entrada is not None:
+            resultado, pids_origen, _ = entrada
+            return _renumerar(resultado, pids_origen, carga.pids_ordenados)
+
+        resultado = self._leer_disco(clave, carga)
+        with self._bloqueo:
+            if resultado is None:
+                self.fallos += 1
+                return None
+            self.aciertos_disco += 1
+            self._guardar_memoria(clave, resultado, carga.pids_ordenados)
+        return dict(resultado)
+
+    def guardar(self, nombre_algoritmo: str, parametros: Dict, carga: CargaCanonica, resultado: Dict):
+        """Agrega un resultado; los resultados con error no se guardan"""
+        if 'error' in resultado:
+            return
+        # La instrumentación describe una corrida concreta, no el resultado
+        resultado = {clave: valor for clave, valor in resultado.items() if clave != 'instrumentacion'}
+        clave = clave_resultado(nombre_algoritmo, parametros, carga)
+        with self._bloqueo:
+            self._guardar_memoria(clave, resultado, carga.pids_ordenados)
+        if self.directorio is not None:
+            self._escribir_disco(clave, resultado, carga)
+
+    def estadisticas(self) -> Dict:
+        """Aciertos por nivel, fallos, tasa de aciertos, desalojos y ocupación de memoria"""
+        with self._bloqueo:
+            aciertos = self.aciertos_memoria + self.aciertos_disco
+            consultas = aciertos + self.fallos
+            return {
+                'aciertos_memoria': self.aciertos_memoria,
+                'aciertos_disco': self.aciertos_disco,
+                'fallos': self.fallos,
+                'tasa_aciertos': aciertos / consultas if consultas else 0,
+                'desalojos': self.desalojos,
+                'entradas': len(self._memoria),
+                'bytes_memoria': self._bytes,
+            }
+
+    def limpiar(self, disco: bool = False):
+        """Vacía el nivel en memoria (y, con ``disco=True``, los archivos del directorio)"""
+        with self._bloqueo:
+            self._memoria.clear()
+            self._bytes = 0
+        if disco and self.directorio is not None:
+            for nombre in os.listdir(self.directorio):
+                if nombre.endswith(".npz"):
+                    os.remove(os.path.join(self.directorio, nombre))
+
+    def _guardar_memoria(self, clave: str, resultado: Dict, pids_ordenados: np.ndarray):
+        tamano = _tamano_resultado(resultado) + pids_ordenados.nbytes
+        if clave in self._memoria:
+            self._bytes -= self._memoria.pop(clave)[2]
+        if tamano > self.capacidad_bytes:
+            return
+        while self._memoria and self._bytes + tamano > self.capacidad_bytes:
+            _, (_, _, liberados) = self._memoria.popitem(last=False)
+            self._bytes -= liberados
+            self.desalojos += 1
+        self._memoria[clave] = (dict(resultado), pids_ordenados, tamano)
+        self._bytes += tamano
+
+    def _ruta(self, clave: str) -> str:
+        return os.path.join(self.directorio, f"{clave}.npz")
+
+    def _escribir_disco(self, clave: str, resultado: Dict, carga: CargaCanonica):
+        canonicos = np.arange(1, len(carga.pids_ordenados) + 1, dtype=np.int64)
+        canonico = _renumerar(resultado, carga.pids_ordenados, canonicos)
+        resumen = json.dumps({
+            'metricas': canonico['metricas'],
+            'metricas_por_cpu': canonico.get('metricas_por_cpu', []),
+            'tiempo_total': canonico.get('tiempo_total', 0),
+        }, default=_a_json)
+        columnas = {'resumen': np.frombuffer(resumen.encode(), dtype=np.uint8)}
+        if canonico.get('segmentos') is not None:
+            for nombre, columna in zip(("seg_pid", "seg_inicio", "seg_fin"), canonico['segmentos'].columnas()):
+                columnas[nombre] = columna
+        if canonico.get('eventos') is not None:
+            for nombre, columna in zip(("ev_tipo", "ev_tiempo", "ev_pid", "ev_dato"),
+                                       canonico['eventos'].columnas()):
+                columnas[nombre] = columna
+
+        # Escritura atómica: otro proceso nunca ve un archivo a medio escribir
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as archivo:
+                np.savez_compressed(archivo, **columnas)
+            os.replace(temporal, self._ruta(clave))
+        except BaseException:
+            os.unlink(temporal)
+            raise
+
+    def _leer_disco(self, clave: str, carga: CargaCanonica) -> Optional[Dict]:
+        if self.directorio is None:
+            return None
+        try:
+            with np.load(self._ruta(clave), allow_pickle=False) as datos:
+                columnas = {nombre: datos[nombre] for nombre in datos.files}
+        except (OSError, ValueError):
+            return None
+
+        resumen = json.loads(columnas['resumen'].tobytes().decode())
+        resultado = {
+            'metricas': resumen['metricas'],
+            'metricas_por_cpu': resumen['metricas_por_cpu'],
+            'tiempo_total': resumen['tiempo_total'],
+        }
+        if 'seg_pid' in columnas:
+            resultado['segmentos'] = RegistroSegmentos.desde_arrays(
+                columnas['seg_pid'], columnas['seg_inicio'], columnas['seg_fin'])
+        if 'ev_tipo' in columnas:
+            resultado['eventos'] = RegistroEventos.desde_arrays(
+                columnas['ev_tipo'], columnas['ev_tiempo'], columnas['ev_pid'], columnas['ev_dato'])
+        canonicos = np.arange(1, len(carga.pids_ordenados) + 1, dtype=np.int64)
+        return _renumerar(resultado, canonicos, carga.pids_ordenados)
+
+
+def _renumerar(resultado: Dict, pids_origen: np.ndarray, pids_destino: np.ndarray) -> Dict:
+    """Copia del resultado con los PID de eventos y segmentos traducidos por rango"""
+    resultado = dict(resultado)
+    if np.array_equal(pids_origen, pids_destino):
+        return resultado
+
+    def traducir(pids: np.ndarray) -> np.ndarray:
+        return pids_destino[np.searchsorted(pids_origen, pids)]
+
+    segmentos = resultado.get('segmentos')
+    if segmentos is not None and len(segmentos):
+        pids, inicios, fines = segmentos.columnas()
+        resultado['segmentos'] = RegistroSegmentos.desde_arrays(traducir(pids), inicios, fines)
+    eventos = resultado.get('eventos')
+    if eventos is not None and len(eventos):
+        tipos, tiempos, pids, datos = eventos.columnas()
+        # La CPU ociosa usa PID 0, que no es un proceso
+        de_proceso = tipos != TipoEvento.CPU_OCIOSA
+        pids = pids.copy()
+        pids[de_proceso] = traducir(pids[de_proceso])
+        resultado['eventos'] = RegistroEventos.desde_arrays(tipos, tiempos, pids, datos)
+    return resultado
+
+
+def _tamano_resultado(resultado: Dict) -> int:
+    tamano = _BYTES_FIJOS_ENTRADA
+    for nombre in ('eventos', 'segmentos'):
+        if resultado.get(nombre) is not None:
+            tamano += resultado[nombre].memoria_bytes()
+    return tamano
+
+
+def _a_json(valor):
+    """Convierte escalares NumPy de las métricas a tipos de Python"""
+    if isinstance(valor, np.generic):
+        return valor.item()
+    raise TypeError(f"Valor no serializable: {valor!r}")
@@ -0,0 +1,201 @@
+from typing import Iterator, Optional
+
+import numpy as np
+
+from lotes import ProcesoBatch
+from procesos import Proceso
+
+DISTRIBUCIONES_LLEGADA = ("poisson", "rafagas")
+DISTRIBUCIONES_CPU = ("exponencial", "pareto", "bimodal")
+
+# Tamaño fijo de los bloques que se generan internamente; los bloques pedidos se
+# recortan a partir de estos, así la secuencia no depende del tamaño solicitado
+_BLOQUE_INTERNO = 1 << 16
+
+
+class GeneradorCargas:
+    """Generador determinista de cargas sintéticas a partir de una semilla.
+
+    Llegadas:
+      - ``poisson``: tiempos entre llegadas exponenciales de media ``1 / tasa_llegada``.
+      - ``rafagas``: las ráfagas empiezan según un proceso de Poisson y cada una
+        trae un número geométrico de procesos (media ``tamano_rafaga``) que
+        llegan en el mismo instante; la tasa media sigue siendo ``tasa_llegada``.
+
+    Ráfagas de CPU (enteros >= 1):
+      - ``exponencial``: media ``media_cpu``.
+      - ``pareto``: cola pesada con mínimo ``minimo_pareto`` y forma ``alfa_pareto``.
+      - ``bimodal``: mezcla de exponenciales de medias ``media_corta`` y
+        ``media_larga``, esta última con probabilidad ``prob_larga``.
+
+    Llegadas, ráfagas y prioridades usan flujos aleatorios independientes
+    derivados de ``semilla``, de modo que la misma configuración produce
+    siempre la misma carga sin importar si se consume proceso a proceso o en
+    bloques de cualquier tamaño. Los PID van de 1 a ``total``.
+    """
+
+    def __init__(self, total: int, llegadas: str = "poisson", rafagas: str = "exponencial",
+                 semilla: int = 0, tasa_llegada: float = 0.1, tamano_rafaga: float = 10,
+                 media_cpu: float = 8, minimo_pareto: float = 3, alfa_pareto: float = 1.5,
+                 media_corta: float = 4, media_larga: float = 40, prob_larga: float = 0.1,
+                 cpu_maximo: Optional[int] = None, niveles_prioridad: int = 0):
+        if not isinstance(total, int) or total < 0:
+            raise ValueError("El total de procesos debe ser un entero mayor o igual a 0.")
+        if llegadas not in DISTRIBUCIONES_LLEGADA:
+            raise ValueError(f"Distribución de llegadas desconocida: {llegadas}")
+        if rafagas not in DISTRIBUCIONES_CPU:
+            raise ValueError(f"Distribución de CPU desconocida: {rafagas}")
+        if tasa_llegada <= 0:
+            raise ValueError("La tasa de llegada debe ser mayor que 0.")
+        if tamano_rafaga < 1:
+            raise ValueError("El tamaño medio de ráfaga debe ser al menos 1.")
+        if min(media_cpu, minimo_pareto, media_corta, media_larga, alfa_pareto) <= 0:
+            raise ValueError("Los parámetros de la distribución de CPU deben ser positivos.")
+        if not 0 <= prob_larga <= 1:
+            raise ValueError("La probabilidad de ráfaga larga debe estar entre 0 y 1.")
+        if cpu_maximo is not None and cpu_maximo < 1:
+            raise ValueError("El tiempo de CPU máximo debe ser un entero positivo.")
+
+        self.total = total
+        self.llegadas = llegadas
+        self.rafagas = rafagas
+        self.semilla = semilla
+        self.tasa_llegada = tasa_llegada
+        self.tamano_rafaga = tamano_rafaga
+        self.media_cpu = media_cpu
+        self.minimo_pareto = minimo_pareto
+        self.alfa_pareto = alfa_pareto
+        self.media_corta = media_corta
+        self.media_larga = media_larga
+        self.prob_larga = prob_larga
+        self.cpu_maximo = cpu_maximo
+        self.niveles_prioridad = niveles_prioridad
+
+    def __len__(self):
+        return self.total
+
+    def bloques(self, tamano: int = _BLOQUE_INTERNO) -> Iterator[ProcesoBatch]:
+        """Genera la carga como lotes columnares de hasta ``tamano`` procesos"""
+        if tamano <= 0:
+            raise ValueError("El tamaño de bloque debe ser un entero positivo.")
+        # Partes de bloques internos que todavía no completan un lote; solo se
+        # concatenan cuando un lote cruza el borde entre bloques internos
+        pendiente = []
+        disponibles = 0
+        for columnas in self._columnas():
+            cantidad = len(columnas[0])
+            desplazamiento = 0
+            if pendiente:
+                desplazamiento = min(tamano - disponibles, cantidad)
+                pendiente.append(tuple(columna[:desplazamiento] for columna in columnas))
+                disponibles += desplazamiento
+                if disponibles < tamano:
+                    continue
+                yield self._lote(*(np.concatenate(partes) for partes in zip(*pendiente)))
+                pendiente = []
+                disponibles = 0
+            while cantidad - desplazamiento >= tamano:
+                fin = desplazamiento + tamano
+                yield self._lote(*(columna[desplazamiento:fin] for columna in columnas))
+                desplazamiento = fin
+            if desplazamiento < cantidad:
+                pendiente.append(tuple(columna[desplazamiento:] for columna in columnas))
+                disponibles = cantidad - desplazamiento
+        if disponibles:
+            yield self._lote(*(np.concatenate(partes) for partes in zip(*pendiente)))
+
+    def procesos(self) -> Iterator[Proceso]:
+        """Genera objetos Proceso de uno en uno sin materializar la carga completa"""
+        for pid, llegada, cpu, prioridad in self._filas():
+            yield Proceso(f"P{pid}", cpu, llegada, None, prioridad, pid=pid)
+
+    def __iter__(self) -> Iterator[Proceso]:
+        return self.procesos()
+
+    def lote(self) -> ProcesoBatch:
+        """Materializa toda la carga en un único lote"""
+        partes = list(self._columnas())
+        if not partes:
+            return ProcesoBatch([], [])
+        return self._lote(*(np.concatenate(columna) for columna in zip(*partes)))
+
+    def _filas(self):
+        for pid, llegada, cpu, prioridad in self._columnas():
+            yield from zip(pid.tolist(), llegada.tolist(), cpu.tolist(), prioridad.tolist())
+
+    def _columnas(self):
+        """Bloques internos de tamaño fijo: (pid, llegada, cpu, prioridad)"""
+        semillas = np.random.SeedSequence(self.semilla).spawn(3)
+        rng_llegada, rng_cpu, rng_prioridad = (np.random.default_rng(s) for s in semillas)
+
+        reloj = 0.0
+        restantes_rafaga = 0
+        generados = 0
+        while generados < self.total:
+            cantidad = min(_BLOQUE_INTERNO, self.total - generados)
+            if self.llegadas == "poisson":
+                instantes = reloj + np.cumsum(rng_llegada.exponential(1 / self.tasa_llegada, cantidad))
+                reloj = float(instantes[-1])
+            else:
+                instantes, reloj, restantes_rafaga = self._llegadas_rafagas(
+                    rng_llegada, cantidad, reloj, restantes_rafaga)
+
+            pid = np.arange(generados + 1, generados + cantidad + 1, dtype=np.int64)
+            prioridad = (rng_prioridad.integers(0, self.niveles_prioridad, cantidad)
+                         if self.niveles_prioridad > 0 else np.zeros(cantidad, dtype=np.int64))
+            yield (pid, np.floor(instantes).astype(np.int64), self._rafagas_cpu(rng_cpu, cantidad),
+                   prioridad.astype(np.int64))
+            generados += cantidad
+
+    def _llegadas_rafagas(self, rng, cantidad: int, reloj: float, restantes: int):
+        """Llegadas agrupadas; ``restantes`` arrastra la ráfaga abierta entre bloques"""
+        instantes = np.empty(cantidad, dtype=np.float64)
+        posicion = min(restantes, cantidad)
+        instantes[:posicion] = reloj
+        restantes -= posicion
+        separacion_media = self.tamano_rafaga / self.tasa_llegada
+        while posicion < cantidad:
+            # Se sortean ráfagas de a varias a la vez para no iterar proceso por proceso
+            lote_rafagas = max(int((cantidad - posicion) / self.tamano_rafaga) + 1, 16)
+            inicios = reloj + np.cumsum(rng.exponential(separacion_media, lote_rafagas))
+            tamanos = rng.geometric(1 / self.tamano_rafaga, lote_rafagas)
+            acumulado = np.cumsum(tamanos)
+            ultima = int(np.searchsorted(acumulado, cantidad - posicion))
+            if ultima >= lote_rafagas:
+                repetidos = np.repeat(inicios, tamanos)
+                instantes[posicion:posicion + len(repetidos)] = repetidos
+                posicion += len(repetidos)
+                reloj = float(inicios[-1])
+                continue
+            usados = tamanos[:ultima + 1].copy()
+            sobrante = int(acumulado[ultima]) - (cantidad - posicion)
+            usados[-1] -= sobrante
+            instantes[posicion:] = np.repeat(inicios[:ultima + 1], usados)
+            posicion = cantidad
+            reloj = float(inicios[ultima])
+            restantes = sobrante
+        return instantes, reloj, restantes
+
+    def _rafagas_cpu(self, rng, cantidad: int) -> np.ndarray:
+        if self.rafagas == "exponencial":
+            valores = rng.exponential(self.media_cpu, cantidad)
+        elif self.rafagas == "pareto":
+            valores = self.minimo_pareto * (1 + rng.pareto(self.alfa_pareto, cantidad))
+        else:
+            largas = rng.random(cantidad) < self.prob_larga
+            valores = np.where(largas, rng.exponential(self.media_larga, cantidad),
+                               rng.exponential(self.media_corta, cantidad))
+        cpu = np.maximum(np.ceil(valores), 1)
+        if self.cpu_maximo is not None:
+            cpu = np.minimum(cpu, self.cpu_maximo)
+        return cpu.astype(np.int64)
+
+    @staticmethod
+    def _lote(pid, llegada, cpu, prioridad) -> ProcesoBatch:
+        return ProcesoBatch(llegada, cpu, pid=pid, prioridad=prioridad)
+
+
+def generar_lote(semilla: int, total: int, **opciones) -> ProcesoBatch:
+    """Atajo serializable ``semilla -> lote`` para usar con ``functools.partial``
+    (por ejemplo como generador de ``ejecutar_montecarlo``)"""
+    return GeneradorCargas(total, semilla=semilla, **opciones).lote()
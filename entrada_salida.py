@@ -0,0 +1,101 @@
+import heapq
+from collections import deque
+from typing import Dict, List, Optional
+
+from procesos import Proceso
+
+
+class DispositivosES:
+    """Dispositivos de E/S con cola FIFO propia y un heap de temporizadores.
+
+    Cada dispositivo atiende una solicitud a la vez; las demás esperan en su
+    cola. El heap guarda ``(instante_fin, orden, dispositivo)`` de las
+    solicitudes en servicio, de modo que el motor solo necesita consultar
+    ``proximo_fin()`` para saber cuándo vuelve a estar listo algún proceso.
+    """
+
+    def __init__(self):
+        self._colas: Dict[int, deque] = {}
+        self._en_servicio: Dict[int, Proceso] = {}
+        self._temporizadores = []
+        self._orden = 0
+        self.tiempo_ocupado: Dict[int, int] = {}
+
+    def __len__(self):
+        """Procesos bloqueados (en servicio o esperando un dispositivo)"""
+        return len(self._en_servicio) + sum(len(cola) for cola in self._colas.values())
+
+    def bloquear(self, proceso: Proceso, instante: int, duracion: int, dispositivo: int = 0):
+        """Encola una solicitud de E/S; si el dispositivo está libre empieza de inmediato"""
+        proceso.inicio_bloqueo = instante
+        if dispositivo in self._en_servicio:
+            self._colas.setdefault(dispositivo, deque()).append((proceso, duracion))
+        else:
+            self._iniciar(dispositivo, proceso, instante, duracion)
+
+    def proximo_fin(self) -> Optional[int]:
+        return self._temporizadores[0][0] if self._temporizadores else None
+
+    def completar_hasta(self, instante: int) -> List[Proceso]:
+        """Termina las solicitudes con fin <= ``instante`` y devuelve los procesos desbloqueados en orden"""
+        liberados = []
+        while self._temporizadores and self._temporizadores[0][0] <= instante:
+            fin, _, dispositivo = heapq.heappop(self._temporizadores)
+            proceso = self._en_servicio.pop(dispositivo)
+            proceso.tiempo_bloqueado += fin - proceso.inicio_bloqueo
+            liberados.append(proceso)
+
+            cola = self._colas.get(dispositivo)
+            if cola:
+                siguiente, duracion = cola.popleft()
+                self._iniciar(dispositivo, siguiente, fin, duracion)
+        return liberados
+
+    def _iniciar(self, dispositivo: int, proceso: Proceso, instante: int, duracion: int):
+        self._en_servicio[dispositivo] = proceso
+        self.tiempo_ocupado[dispositivo] = self.tiempo_ocupado.get(dispositivo, 0) + duracion
+        heapq.heappush(self._temporizadores, (instante + duracion, self._orden, dispositivo))
+        self._orden += 1
+
+
+def preparar_rafagas(procesos: List[Proceso]) -> bool:
+    """Reinicia el estado de ráfagas de cada proceso; devuelve True si alguno hace E/S"""
+    hay_es = False
+    for p in procesos:
+        p.indice_rafaga = 0
+        p.tiempo_bloqueado = 0
+        if p.rafagas:
+            p.tiempo_restante = p.rafagas[0]
+            hay_es = True
+        else:
+            p.tiempo_restante = p.tiempo_cpu
+        p.ejecutado = False
+    return hay_es
+
+
+def siguiente_rafaga(proceso: Proceso, dispositivos: DispositivosES, instante: int) -> bool:
+    """Tras agotar una ráfaga de CPU, bloquea el proceso en su siguiente E/S.
+
+    Devuelve False si era la última ráfaga de CPU (el proceso terminó).
+    """
+    rafagas = proceso.rafagas
+    indice = proceso.indice_rafaga
+    if not rafagas or indice + 1 >= len(rafagas):
+        return False
+    dispositivo = proceso.dispositivos[indice // 2] if proceso.dispositivos else 0
+    proceso.indice_rafaga = indice + 2
+    proceso.tiempo_restante = rafagas[indice + 2]
+    dispositivos.bloquear(proceso, instante, rafagas[indice + 1], dispositivo)
+    return True
+
+
+def metricas_es(procesos: List[Proceso], dispositivos: DispositivosES, tiempo_total: int) -> Dict:
+    """Métricas de E/S: tiempo bloqueado promedio y uso medio de los dispositivos"""
+    if not dispositivos.tiempo_ocupado:
+        return {}
+    ocupado = sum(dispositivos.tiempo_ocupado.values())
+    capacidad = tiempo_total * len(dispositivos.tiempo_ocupado)
+    return {
+        'tiempo_bloqueado_promedio': sum(p.tiempo_bloqueado for p in procesos) / len(procesos),
+        'uso_es': ocupado / capacidad if capacidad > 0 else 0,
+    }
@@ -0,0 +1,102 @@
+from typing import Any, Dict, Hashable, List, Tuple
+
+
+class HeapIndexado:
+    """Min-heap binario indexado por identificador.
+
+    Además de insertar y extraer el mínimo, permite consultar, actualizar
+    (decrease-key / increase-key) y eliminar un elemento por su identificador
+    en O(log n), manteniendo un índice identificador -> posición.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[Any, Hashable]] = []
+        self._posicion: Dict[Hashable, int] = {}
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, identificador):
+        return identificador in self._posicion
+
+    def insertar(self, identificador: Hashable, clave):
+        """Agrega un elemento nuevo con la clave indicada"""
+        if identificador in self._posicion:
+            raise ValueError(f"El elemento {identificador} ya está en el heap")
+        self._heap.append((clave, identificador))
+        self._posicion[identificador] = len(self._heap) - 1
+        self._subir(len(self._heap) - 1)
+
+    def tope(self) -> Hashable:
+        """Devuelve el identificador con menor clave sin extraerlo"""
+        if not self._heap:
+            raise IndexError("tope de un heap vacío")
+        return self._heap[0][1]
+
+    def clave(self, identificador: Hashable):
+        """Devuelve la clave actual de un elemento"""
+        return self._heap[self._posicion[identificador]][0]
+
+    def extraer(self) -> Tuple[Hashable, Any]:
+        """Extrae el elemento de menor clave y devuelve (identificador, clave)"""
+        if not self._heap:
+            raise IndexError("extraer de un heap vacío")
+        clave, identificador = self._heap[0]
+        self._quitar(0)
+        return identificador, clave
+
+    def eliminar(self, identificador: Hashable):
+        """Elimina un elemento arbitrario por su identificador"""
+        self._quitar(self._posicion[identificador])
+
+    def actualizar(self, identificador: Hashable, clave):
+        """Cambia la clave de un elemento (decrease-key o increase-key)"""
+        indice = self._posicion[identificador]
+        anterior = self._heap[indice][0]
+        self._heap[indice] = (clave, identificador)
+        if clave < anterior:
+            self._subir(indice)
+        else:
+            self._bajar(indice)
+
+    def _quitar(self, indice: int):
+        del self._posicion[self._heap[indice][1]]
+        ultimo = self._heap.pop()
+        if indice < len(self._heap):
+            self._heap[indice] = ultimo
+            self._posicion[ultimo[1]] = indice
+            self._subir(indice)
+            self._bajar(self._posicion[ultimo[1]])
+
+    def _subir(self, indice: int):
+        heap = self._heap
+        posicion = self._posicion
+        elemento = heap[indice]
+        while indice > 0:
+            padre = (indice - 1) >> 1
+            if not elemento[0] < heap[padre][0]:
+                break
+            heap[indice] = heap[padre]
+            posicion[heap[indice][1]] = indice
+            indice = padre
+        heap[indice] = elemento
+        posicion[elemento[1]] = indice
+
+    def _bajar(self, indice: int):
+        heap = self._heap
+        posicion = self._posicion
+        total = len(heap)
+        elemento = heap[indice]
+        while True:
+            hijo = 2 * indice + 1
+            if hijo >= total:
+                break
+            if hijo + 1 < total and heap[hijo + 1][0] < heap[hijo][0]:
+                hijo += 1
+            if not heap[hijo][0] < elemento[0]:
+                break
+            heap[indice] = heap[hijo]
+            posicion[heap[indice][1]] = indice
+            indice = hijo
+        heap[indice] = elemento
+        posicion[elemento[1]] = indice
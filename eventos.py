@@ -0,0 +1,139 @@
+from array import array
+from enum import IntEnum
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+
+class TipoEvento(IntEnum):
+    """Tipos de evento que producen los algoritmos de planificación.
+
+    El motor propio de cada algoritmo y el motor general de multicpu.py
+    producen la misma secuencia: cada llegada se anuncia en su instante
+    (aunque la CPU esté ocupada) y cada hueco ocioso con CPU_OCIOSA.
+    """
+    LLEGADA = 0        # dato: tiempo de CPU del proceso
+    DESPACHO = 1       # dato: tiempo restante al tomar la CPU
+    DESALOJO = 2       # dato: tiempo restante al volver a la cola
+    FINALIZACION = 3   # dato: tiempo de espera total
+    CPU_OCIOSA = 4     # dato: instante hasta el que la CPU queda ociosa
+    BLOQUEO = 5        # dato: duración de la ráfaga de E/S
+    DESBLOQUEO = 6     # dato: duración de la siguiente ráfaga de CPU
+
+
+_PLANTILLAS = {
+    TipoEvento.LLEGADA: "{nombre} llega al sistema (CPU: {dato})",
+    TipoEvento.DESPACHO: "{algoritmo} ejecuta {nombre} (Restante: {dato})",
+    TipoEvento.DESALOJO: "{nombre} vuelve a cola ({dato} restante)",
+    TipoEvento.FINALIZACION: "✅ Finaliza {nombre} | Espera: {dato}",
+    TipoEvento.CPU_OCIOSA: "CPU idle hasta T{dato}",
+    TipoEvento.BLOQUEO: "{nombre} se bloquea por E/S ({dato}u)",
+    TipoEvento.DESBLOQUEO: "{nombre} termina su E/S y vuelve a cola (CPU: {dato})",
+}
+
+
+# Miembros de TipoEvento indexados por su valor (más rápido que llamar a TipoEvento(valor))
+_TIPOS = tuple(TipoEvento)
+
+
+class Evento:
+    """Registro compacto de un evento: tipo, instante, PID y un dato entero.
+
+    El texto descriptivo no se guarda; se genera bajo demanda con ``texto()``
+    para que el formateo no ocurra en el bucle de simulación.
+    """
+
+    __slots__ = ("tipo", "tiempo", "pid", "dato")
+
+    def __init__(self, tipo: TipoEvento, tiempo: int, pid: int = 0, dato: int = 0):
+        self.tipo = tipo
+        self.tiempo = tiempo
+        self.pid = pid
+        self.dato = dato
+
+    def texto(self, nombres: Optional[Dict[int, str]] = None, algoritmo: str = "CPU") -> str:
+        """Genera el mensaje legible; ``nombres`` traduce PID a nombre de proceso"""
+        nombre = nombres.get(self.pid, f"P{self.pid}") if nombres else f"P{self.pid}"
+        return _PLANTILLAS[self.tipo].format(nombre=nombre, dato=self.dato, algoritmo=algoritmo)
+
+    def __repr__(self):
+        return (f"Evento({TipoEvento(self.tipo).name}, tiempo={self.tiempo}, "
+                f"pid={self.pid}, dato={self.dato})")
+
+
+class RegistroEventos:
+    """Bitácora de eventos respaldada por arreglos tipados del módulo array.
+
+    Cada evento ocupa 25 bytes (un byte de tipo y tres enteros de 64 bits)
+    frente a los cientos de bytes de un diccionario con un texto ya formateado.
+    """
+
+    __slots__ = ("_tipos", "_tiempos", "_pids", "_datos")
+
+    def __init__(self):
+        self._tipos = array("b")
+        self._tiempos = array("q")
+        self._pids = array("q")
+        self._datos = array("q")
+
+    @classmethod
+    def desde_arrays(cls, tipos, tiempos, pids, datos) -> "RegistroEventos":
+        """Construye la bitácora a partir de columnas (en el orden dado)"""
+        registro = cls()
+        registro._tipos.frombytes(np.asarray(tipos, dtype=np.int8).tobytes())
+        registro._tiempos.frombytes(np.asarray(tiempos, dtype=np.int64).tobytes())
+        registro._pids.frombytes(np.asarray(pids, dtype=np.int64).tobytes())
+        registro._datos.frombytes(np.asarray(datos, dtype=np.int64).tobytes())
+        return registro
+
+    def columnas(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Vistas NumPy (sin copia) de las columnas tipo, tiempo, pid y dato"""
+        return (np.frombuffer(self._tipos, dtype=np.int8),
+                np.frombuffer(self._tiempos, dtype=np.int64),
+                np.frombuffer(self._pids, dtype=np.int64),
+                np.frombuffer(self._datos, dtype=np.int64))
+
+    def agregar(self, tipo: TipoEvento, tiempo: int, pid: int = 0, dato: int = 0):
+        self._tipos.append(tipo)
+        self._tiempos.append(tiempo)
+        self._pids.append(pid)
+        self._datos.append(dato)
+
+    def agregar_evento(self, evento: Evento):
+        self.agregar(evento.tipo, evento.tiempo, evento.pid, evento.dato)
+
+    def __len__(self):
+        return len(self._tipos)
+
+    def copia(self) -> "RegistroEventos":
+        return RegistroEventos.desde_arrays(*self.columnas())
+
+    def truncar(self, cantidad: int):
+        """Descarta los eventos a partir de la posición ``cantidad``"""
+        for columna in (self._tipos, self._tiempos, self._pids, self._datos):
+            del columna[cantidad:]
+
+    def __getitem__(self, indice: int) -> Evento:
+        return Evento(_TIPOS[self._tipos[indice]], self._tiempos[indice],
+                      self._pids[indice], self._datos[indice])
+
+    def __iter__(self) -> Iterator[Evento]:
+        return self.iterar()
+
+    def iterar(self, cantidad: Optional[int] = None) -> Iterator[Evento]:
+        """Recorre los eventos en orden; con ``cantidad``, solo los primeros ``cantidad``"""
+        columnas = (self._tipos, self._tiempos, self._pids, self._datos)
+        if cantidad is not None:
+            columnas = tuple(columna[:cantidad] for columna in columnas)
+        for tipo, tiempo, pid, dato in zip(*columnas):
+            yield Evento(_TIPOS[tipo], tiempo, pid, dato)
+
+    def textos(self, nombres: Optional[Dict[int, str]] = None, algoritmo: str = "CPU") -> Iterator[str]:
+        """Genera las líneas de texto de la bitácora, formateadas bajo demanda"""
+        for evento in self:
+            yield f"T{evento.tiempo:3d}: {evento.texto(nombres, algoritmo)}"
+
+    def memoria_bytes(self) -> int:
+        """Bytes ocupados por los datos de la bitácora"""
+        return sum(columna.itemsize * len(columna)
+                   for columna in (self._tipos, self._tiempos, self._pids, self._datos))
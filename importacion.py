@@ -0,0 +1,337 @@
+"""Importación por flujo de cargas de trabajo desde trazas CSV o JSONL.
+
+Las trazas se leen línea a línea (opcionalmente a través de ``mmap``) y se
+entregan como objetos Proceso o como lotes columnares de tamaño acotado, de
+modo que importar millones de filas solo requiere memoria extra para un
+bloque. Cada fila se valida con las reglas de ``crear_proceso``; las filas
+inválidas se informan y se descartan sin interrumpir la importación::
+
+    importador = ImportadorCargas("traza.csv", columnas={"cpu": "runtime"})
+    for lote in importador.bloques(100_000):
+        ...
+    print(importador.filas_invalidas, importador.errores[:10])
+"""
+import csv
+import io
+import json
+import mmap
+import os
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from lotes import ProcesoBatch
+from procesos import Proceso, validar_proceso
+
+FORMATOS = ("csv", "jsonl", "json")
+_EXTENSIONES = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".json": "json"}
+
+# Encabezados por omisión: los de la tabla de procesos de la interfaz
+COLUMNAS = {
+    "nombre": "Nombre",
+    "cpu": "CPU",
+    "llegada": "Llegada",
+    "quantum": "Quantum",
+    "prioridad": "Prioridad",
+    "rafagas": "Rafagas",
+    "dispositivos": "Dispositivos",
+}
+_OBLIGATORIAS = ("cpu", "llegada")
+
+_BLOQUE = 1 << 16
+# Bytes del archivo mapeado que se decodifican de una vez
+_VENTANA_MMAP = 1 << 20
+# Se guarda a lo sumo este prefijo del texto de cada fila inválida
+_MAX_CONTENIDO = 200
+
+
+class FilaInvalida:
+    """Fila descartada: número de línea del archivo, motivo y texto original (recortado).
+
+    En un JSON con una lista de procesos, ``linea`` es la posición del elemento.
+    """
+
+    __slots__ = ("linea", "error", "contenido")
+
+    def __init__(self, linea: int, error: str, contenido: str = ""):
+        self.linea = linea
+        self.error = error
+        self.contenido = contenido[:_MAX_CONTENIDO]
+
+    def __str__(self):
+        return f"Línea {self.linea}: {self.error}"
+
+    def __repr__(self):
+        return f"FilaInvalida(linea={self.linea}, error={self.error!r})"
+
+
+class ImportadorCargas:
+    """Lector por flujo de una traza de procesos.
+
+    Formatos (por omisión, según la extensión; CSV si no se reconoce):
+      - ``csv``: con encabezado; las listas de ráfagas y dispositivos van
+        separadas por ``separador_listas``.
+      - ``jsonl``: un objeto JSON por línea.
+      - ``json``: una lista de objetos. Se carga completa, así que no es
+        apta para trazas grandes.
+
+    ``columnas`` renombra los encabezados (o claves) de ``COLUMNAS``, p. ej.
+    ``{"cpu": "runtime", "llegada": "submit"}``; la comparación no distingue
+    mayúsculas. ``CPU`` y ``Llegada`` son obligatorias; sin columna de
+    nombre los procesos se llaman ``P<pid>``.
+
+    Las filas inválidas se cuentan en ``filas_invalidas``, se pasan a
+    ``al_error`` si se indica y las primeras ``max_errores`` quedan en
+    ``errores``; con ``estricto`` la primera lanza ValueError. Los
+    contadores se reinician en cada recorrido del archivo.
+    """
+
+    def __init__(self, ruta: str, formato: Optional[str] = None, columnas: Optional[Dict[str, str]] = None,
+                 usar_mmap: bool = False, codificacion: str = "utf-8-sig", separador_listas: str = ";",
+                 max_errores: int = 1000, al_error: Optional[Callable[[FilaInvalida], None]] = None,
+                 estricto: bool = False):
+        if formato is None:
+            formato = _EXTENSIONES.get(os.path.splitext(ruta)[1].lower(), "csv")
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato de carga desconocido: {formato}")
+        desconocidas = set(columnas or ()) - set(COLUMNAS)
+        if desconocidas:
+            raise ValueError(f"Columnas desconocidas: {', '.join(sorted(desconocidas))}")
+        if max_errores < 0:
+            raise ValueError("La cantidad máxima de errores guardados no puede ser negativa.")
+
+        self.ruta = ruta
+        self.formato = formato
+        self.columnas = {**COLUMNAS, **(columnas or {})}
+        self.usar_mmap = usar_mmap
+        self.codificacion = codificacion
+        self.separador_listas = separador_listas
+        self.max_errores = max_errores
+        self.al_error = al_error
+        self.estricto = estricto
+        self._reiniciar_contadores()
+
+    def _reiniciar_contadores(self):
+        self.filas_leidas = 0
+        self.filas_validas = 0
+        self.filas_invalidas = 0
+        self.errores: List[FilaInvalida] = []
+
+    def procesos(self) -> Iterator[Proceso]:
+        """Genera objetos Proceso de uno en uno, con PID del contador global"""
+        for nombre, cpu, llegada, quantum, prioridad, rafagas, dispositivos in self._registros():
+            proceso = Proceso(nombre, cpu, llegada, quantum, prioridad,
+                              rafagas=rafagas, dispositivos=dispositivos)
+            if nombre is None:
+                proceso.nombre = f"P{proceso.pid}"
+            yield proceso
+
+    def __iter__(self) -> Iterator[Proceso]:
+        return self.procesos()
+
+    def bloques(self, tamano: int = _BLOQUE, pid_inicial: int = 1) -> Iterator[ProcesoBatch]:
+        """Genera la carga como lotes columnares de hasta ``tamano`` procesos.
+
+        Los PID son consecutivos desde ``pid_inicial`` entre un bloque y el
+        siguiente, en el orden del archivo.
+        """
+        if tamano <= 0:
+            raise ValueError("El tamaño de bloque debe ser un entero positivo.")
+        pid = pid_inicial
+        bloque = _Bloque()
+        for registro in self._registros():
+            bloque.agregar(*registro)
+            if len(bloque.cpu) == tamano:
+                yield bloque.lote(pid)
+                pid += tamano
+                bloque = _Bloque()
+        if bloque.cpu:
+            yield bloque.lote(pid)
+
+    def lote(self, pid_inicial: int = 1) -> ProcesoBatch:
+        """Materializa toda la carga válida en un único lote"""
+        partes = list(self.bloques(pid_inicial=pid_inicial))
+        if not partes:
+            return ProcesoBatch([], [])
+        unir = lambda columna: np.concatenate([getattr(parte, columna) for parte in partes])
+        listas = {}
+        for atributo in ("rafagas", "dispositivos"):
+            if all(getattr(parte, atributo) is None for parte in partes):
+                listas[atributo] = None
+            else:
+                listas[atributo] = [valor for parte in partes
+                                    for valor in (getattr(parte, atributo) or [None] * len(parte))]
+        listas["nombres"] = (None if all(parte.nombres is None for parte in partes)
+                             else [parte.nombre(i) for parte in partes for i in range(len(parte))])
+        return ProcesoBatch(unir("llegada"), unir("cpu"), pid=unir("pid"), quantum=unir("quantum"),
+                            prioridad=unir("prioridad"), **listas)
+
+    def _registros(self):
+        """Filas válidas como (nombre, cpu, llegada, quantum, prioridad, rafagas, dispositivos)"""
+        self._reiniciar_contadores()
+        filas = {"csv": self._filas_csv, "jsonl": self._filas_jsonl, "json": self._filas_json}[self.formato]
+        entero, lista = _entero, self._lista
+        for linea, valores, contenido in filas():
+            self.filas_leidas += 1
+            try:
+                if isinstance(valores, str):
+                    raise ValueError(valores)
+                nombre, cpu, llegada, quantum, prioridad, rafagas, dispositivos = valores
+                if nombre is not None and not isinstance(nombre, str):
+                    nombre = str(nombre)
+                registro = (nombre, entero(cpu), entero(llegada), entero(quantum),
+                            entero(prioridad) or 0, lista(rafagas), lista(dispositivos))
+                validar_proceso("P" if nombre is None else nombre, *registro[1:])
+            except ValueError as e:
+                self._fila_invalida(linea, str(e), contenido)
+                continue
+            self.filas_validas += 1
+            yield registro
+
+    def _fila_invalida(self, linea: int, error: str, contenido):
+        if self.estricto:
+            raise ValueError(f"Línea {linea} de {self.ruta}: {error}") from None
+        self.filas_invalidas += 1
+        if self.al_error is None and len(self.errores) >= self.max_errores:
+            return
+        if not isinstance(contenido, str):
+            contenido = (",".join(contenido) if self.formato == "csv"
+                         else json.dumps(contenido, ensure_ascii=False, default=str))
+        fila = FilaInvalida(linea, error, contenido)
+        if len(self.errores) < self.max_errores:
+            self.errores.append(fila)
+        if self.al_error is not None:
+            self.al_error(fila)
+
+    def _lineas(self):
+        """Líneas de texto del archivo, leídas con buffer o a través de ``mmap``"""
+        if not self.usar_mmap:
+            with open(self.ruta, encoding=self.codificacion, newline="") as archivo:
+                yield from archivo
+            return
+        with open(self.ruta, "rb") as archivo:
+            if os.fstat(archivo.fileno()).st_size == 0:
+                return
+            with mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                # Se decodifican ventanas que terminan en un salto de línea, no línea por línea
+                inicio, total = 0, len(mapa)
+                while inicio < total:
+                    fin = mapa.rfind(b"\n", inicio, inicio + _VENTANA_MMAP) + 1
+                    if fin == 0:
+                        fin = mapa.find(b"\n", inicio + _VENTANA_MMAP) + 1 or total
+                    yield from io.StringIO(mapa[inicio:fin].decode(self.codificacion), newline="")
+                    inicio = fin
+
+    def _filas_csv(self):
+        lector = csv.reader(self._lineas())
+        encabezado = next(lector, None)
+        if encabezado is None:
+            return
+        posiciones = {nombre.strip().lower(): i for i, nombre in enumerate(encabezado)}
+        indices = []
+        for campo, columna in self.columnas.items():
+            indice = posiciones.get(columna.strip().lower())
+            if indice is None and campo in _OBLIGATORIAS:
+                raise ValueError(f"Falta la columna '{columna}' en {self.ruta}")
+            indices.append(indice)
+        ancho = len(encabezado)
+        for fila in lector:
+            if not fila:
+                continue
+            if len(fila) != ancho:
+                yield lector.line_num, f"Se esperaban {ancho} columnas y la fila tiene {len(fila)}.", fila
+                continue
+            yield lector.line_num, [None if i is None else fila[i] for i in indices], fila
+
+    def _filas_jsonl(self):
+        for linea, texto in enumerate(self._lineas(), 1):
+            texto = texto.strip()
+            if not texto:
+                continue
+            try:
+                objeto = json.loads(texto)
+            except ValueError as e:
+                yield linea, f"JSON inválido: {e}", texto
+                continue
+            yield linea, self._valores_objeto(objeto), texto
+
+    def _filas_json(self):
+        with open(self.ruta, encoding=self.codificacion) as archivo:
+            objetos = json.load(archivo)
+        if not isinstance(objetos, list):
+            raise ValueError("El JSON de la carga debe ser una lista de procesos.")
+        for posicion, objeto in enumerate(objetos, 1):
+            yield posicion, self._valores_objeto(objeto), objeto
+
+    def _valores_objeto(self, objeto):
+        """Valores de los campos de un objeto JSON, o el mensaje de error si no sirve"""
+        if not isinstance(objeto, dict):
+            return "Cada proceso debe ser un objeto JSON."
+        claves = {str(clave).strip().lower(): valor for clave, valor in objeto.items()}
+        valores = []
+        for campo, columna in self.columnas.items():
+            clave = columna.strip().lower()
+            if clave not in claves and campo in _OBLIGATORIAS:
+                return f"Falta el campo '{columna}'."
+            valores.append(claves.get(clave))
+        return valores
+
+    def _lista(self, valor) -> Optional[List[int]]:
+        if valor is None or valor == "" or valor == []:
+            return None
+        if isinstance(valor, str):
+            return [_entero(parte) for parte in valor.split(self.separador_listas)]
+        if not isinstance(valor, list):
+            raise ValueError(f"Se esperaba una lista y se recibió {valor!r}.")
+        for elemento in valor:
+            if isinstance(elemento, bool):
+                raise ValueError(f"Se esperaba un entero y se recibió {elemento!r}.")
+        return valor
+
+
+class _Bloque:
+    """Columnas de un bloque en construcción"""
+
+    __slots__ = ("nombres", "cpu", "llegada", "quantum", "prioridad", "rafagas", "dispositivos")
+
+    def __init__(self):
+        self.nombres, self.cpu, self.llegada = [], [], []
+        self.quantum, self.prioridad = [], []
+        self.rafagas, self.dispositivos = [], []
+
+    def agregar(self, nombre, cpu, llegada, quantum, prioridad, rafagas, dispositivos):
+        self.nombres.append(nombre)
+        self.cpu.append(cpu)
+        self.llegada.append(llegada)
+        self.quantum.append(quantum or 0)
+        self.prioridad.append(prioridad)
+        self.rafagas.append(rafagas)
+        self.dispositivos.append(dispositivos)
+
+    def lote(self, pid_inicial: int) -> ProcesoBatch:
+        total = len(self.cpu)
+        con_es = any(self.rafagas)
+        nombres = None
+        if any(nombre is not None for nombre in self.nombres):
+            nombres = [f"P{pid_inicial + i}" if nombre is None else nombre
+                       for i, nombre in enumerate(self.nombres)]
+        return ProcesoBatch(
+            self.llegada, self.cpu, pid=np.arange(pid_inicial, pid_inicial + total, dtype=np.int64),
+            quantum=self.quantum, prioridad=self.prioridad, nombres=nombres,
+            rafagas=self.rafagas if con_es else None,
+            dispositivos=self.dispositivos if con_es else None,
+        )
+
+
+def _entero(valor) -> Optional[int]:
+    if valor is None or valor == "":
+        return None
+    if isinstance(valor, str):
+        try:
+            return int(valor)
+        except ValueError:
+            raise ValueError(f"Se esperaba un entero y se recibió {valor!r}.") from None
+    # bool es subclase de int: un true/false de JSON no es un entero
+    if isinstance(valor, bool):
+        raise ValueError(f"Se esperaba un entero y se recibió {valor!r}.")
+    return valor
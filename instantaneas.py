@@ -0,0 +1,286 @@
+import copy
+import pickle
+import zlib
+from collections import defaultdict, deque
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from algoritmos import AlgoritmoPlanificacion
+from entrada_salida import preparar_rafagas
+from eventos import Evento, RegistroEventos
+from procesos import Proceso
+
+# Cabecera de los archivos de instantánea (incluye la versión del formato)
+_CABECERA = b"SIMINST1"
+
+
+class SimulacionReanudable:
+    """Simulación que puede avanzarse por ventanas de tiempo, guardarse y retomarse.
+
+    Guarda el algoritmo (parámetros y resultados parciales), los procesos
+    (tiempo restante, respuesta, espera, ráfaga actual) y el estado completo
+    del motor: reloj, colas de listos, CPUs ocupadas, dispositivos de E/S,
+    segmentos y contadores. ``bifurcar`` copia todo ese estado para
+    continuar dos variantes a partir de un mismo prefijo sin recalcularlo.
+    La copia comparte los procesos terminados (ya no cambian) y los que aún
+    no llegaron (se reconstruyen desde sus datos de entrada la primera vez
+    que la copia se usa), así que su costo es proporcional a los procesos
+    activos y no a toda la carga.
+
+    Los algoritmos de una CPU sin E/S corren aquí sobre el motor general,
+    que produce las mismas métricas y segmentos que su motor propio.
+    """
+
+    def __init__(self, algoritmo: AlgoritmoPlanificacion, procesos: List[Proceso]):
+        self.algoritmo = algoritmo
+        self.procesos = procesos
+        self.estado: Dict = {}
+        # True en una copia de ``bifurcar`` mientras comparta los procesos pendientes con el original
+        self._pendientes_compartidos = False
+
+    @property
+    def tiempo(self) -> int:
+        """Reloj del último punto de pausa"""
+        return self.estado.get('tiempo', 0)
+
+    @property
+    def terminada(self) -> bool:
+        return self.estado.get('terminado', False)
+
+    def avanzar(self, hasta: Optional[int] = None) -> Iterator[Evento]:
+        """Produce los eventos hasta pausar en el primer punto con reloj >= ``hasta`` (o hasta terminar)"""
+        self._independizar()
+        if self.terminada:
+            return iter(())
+        eventos = self.algoritmo.ejecutar_reanudable(self.procesos, self.estado, hasta)
+        if self.algoritmo.instrumentacion is not None:
+            eventos = self.algoritmo.instrumentacion.observar(eventos)
+        return eventos
+
+    def ejecutar(self, hasta: Optional[int] = None) -> RegistroEventos:
+        """Como ``avanzar`` pero acumulando los eventos en una bitácora"""
+        registro = RegistroEventos()
+        for evento in self.avanzar(hasta):
+            registro.agregar_evento(evento)
+        return registro
+
+    def reemplazar_procesos(self, procesos: List[Proceso]):
+        """Sustituye la tabla de procesos cuando solo cambian procesos que todavía no llegaron.
+
+        ``procesos`` debe contener los mismos objetos de ``self.procesos``
+        para los procesos que conserva; los objetos nuevos se agregan (deben
+        llegar después del reloj actual) y los ausentes se quitan (no pueden
+        haber llegado todavía). El orden de ``procesos`` desempata las
+        llegadas simultáneas igual que en una corrida desde t=0.
+        """
+        self._independizar()
+        if not self.estado:
+            self.procesos = list(procesos)
+            return
+        por_llegada = self.estado['procesos_por_llegada']
+        indice = self.estado['indice_proximo']
+        llegados = {id(p) for p in por_llegada[:indice]}
+        conocidos = {id(p) for p in self.procesos}
+        if not llegados <= {id(p) for p in procesos}:
+            raise ValueError("No se puede quitar un proceso que ya llegó al sistema.")
+        agregados = [p for p in procesos if id(p) not in conocidos]
+        if any(p.instante_llegada <= self.tiempo for p in agregados):
+            raise ValueError("Solo se pueden agregar procesos que lleguen después del instante actual.")
+
+        if preparar_rafagas(agregados):
+            self.estado['hay_es'] = True
+        posicion = {id(p): i for i, p in enumerate(procesos)}
+        pendientes = sorted((p for p in procesos if id(p) not in llegados),
+                            key=lambda p: (p.instante_llegada, posicion[id(p)]))
+        por_llegada[indice:] = pendientes
+        self.procesos = list(procesos)
+        if agregados:
+            self.estado['terminado'] = False
+
+    def bifurcar(self) -> "SimulacionReanudable":
+        """Copia independiente de la simulación en su punto actual"""
+        self._independizar()
+        por_llegada = self.estado.get('procesos_por_llegada', [])
+        indice = self.estado.get('indice_proximo', 0)
+        memo = {id(p): p for p in self.procesos}
+        for p in por_llegada[:indice]:
+            if p.tiempo_restante:
+                del memo[id(p)]
+        # Las tablas completas no se recorren con deepcopy: se rearman después con el mismo memo
+        memo[id(self.procesos)] = self.procesos
+        memo[id(por_llegada)] = por_llegada
+        copia = copy.deepcopy(self, memo)
+        copia.procesos = [memo[id(p)] for p in self.procesos]
+        if copia.estado:
+            copia.estado['procesos_por_llegada'] = [memo[id(p)] for p in por_llegada]
+        copia._pendientes_compartidos = True
+        return copia
+
+    def _independizar(self):
+        """Reemplaza los procesos pendientes compartidos por copias propias en su estado inicial"""
+        if not self._pendientes_compartidos:
+            return
+        self._pendientes_compartidos = False
+        if not self.estado:
+            self.procesos = [_clonar(p) for p in self.procesos]
+            return
+        por_llegada = self.estado['procesos_por_llegada']
+        indice = self.estado['indice_proximo']
+        copias = {id(p): _clonar(p) for p in por_llegada[indice:]}
+        preparar_rafagas(list(copias.values()))
+        por_llegada[indice:] = [copias[id(p)] for p in por_llegada[indice:]]
+        self.procesos = [copias.get(id(p), p) for p in self.procesos]
+
+    def a_bytes(self, nivel_compresion: int = 6) -> bytes:
+        self._independizar()
+        return _CABECERA + zlib.compress(pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL),
+                                         nivel_compresion)
+
+    @classmethod
+    def desde_bytes(cls, datos: bytes) -> "SimulacionReanudable":
+        if not datos.startswith(_CABECERA):
+            raise ValueError("El contenido no es una instantánea de simulación válida.")
+        simulacion = pickle.loads(zlib.decompress(datos[len(_CABECERA):]))
+        if not isinstance(simulacion, cls):
+            raise ValueError("El contenido no es una instantánea de simulación válida.")
+        return simulacion
+
+    def guardar(self, ruta: str, nivel_compresion: int = 6):
+        """Escribe la instantánea comprimida en ``ruta``"""
+        with open(ruta, "wb") as archivo:
+            archivo.write(self.a_bytes(nivel_compresion))
+
+    @classmethod
+    def cargar(cls, ruta: str) -> "SimulacionReanudable":
+        """Lee una instantánea escrita por ``guardar`` (usa pickle: solo abrir archivos propios)"""
+        with open(ruta, "rb") as archivo:
+            return cls.desde_bytes(archivo.read())
+
+
+class SimulacionIncremental:
+    """Re-simulación incremental de una tabla de procesos que cambia entre corridas.
+
+    Durante cada corrida guarda una instantánea del motor cada ``intervalo``
+    unidades de tiempo (por omisión, unas ``num_instantaneas`` repartidas en
+    la duración estimada), indexadas por instante, además del estado final.
+    En la corrida siguiente compara la tabla nueva con la de cada
+    instantánea fila por fila (nombre, CPU, llegada, quantum, prioridad y
+    ráfagas) y retoma desde la última instantánea anterior a la primera
+    llegada afectada por un proceso agregado o quitado; los eventos previos
+    se reutilizan de la corrida anterior. El resultado es idéntico al de
+    simular la tabla desde t=0.
+
+    Los procesos que no cambiaron se siguen representando con los objetos
+    de la corrida anterior (mismo PID): la tabla efectivamente simulada
+    queda en ``simulacion.procesos``.
+    """
+
+    def __init__(self, crear_algoritmo: Callable[[], AlgoritmoPlanificacion],
+                 intervalo: Optional[int] = None, num_instantaneas: int = 16):
+        if intervalo is not None and intervalo <= 0:
+            raise ValueError("El intervalo entre instantáneas debe ser un entero positivo.")
+        self.crear_algoritmo = crear_algoritmo
+        self.intervalo = intervalo
+        self.num_instantaneas = num_instantaneas
+        self.eventos = RegistroEventos()
+        self.simulacion: Optional[SimulacionReanudable] = None
+        # Instante desde el que se re-simuló en la última corrida (0 = desde el principio)
+        self.reanudada_desde = 0
+        # (instante, eventos producidos hasta ese instante, simulación pausada, firmas de su tabla)
+        self._instantaneas: List[Tuple[int, int, SimulacionReanudable, List[Tuple]]] = []
+
+    def ejecutar_iter(self, procesos: List[Proceso]) -> Iterator[Evento]:
+        """Prepara la corrida para ``procesos`` y devuelve sus eventos (reutilizados y nuevos).
+
+        La preparación ocurre al llamar, así que ``simulacion`` ya tiene la
+        tabla efectiva antes de consumir el primer evento.
+        """
+        firmas = [_firma(p) for p in procesos]
+        comparaciones = {}
+        elegida = None
+        for posicion in range(len(self._instantaneas) - 1, -1, -1):
+            instante, _, _, tabla = self._instantaneas[posicion]
+            if id(tabla) not in comparaciones:
+                comparaciones[id(tabla)] = _comparar_tablas(tabla, firmas)
+            if instante < comparaciones[id(tabla)][1]:
+                elegida = posicion
+                break
+
+        # Las instantáneas posteriores a la elegida quedan reemplazadas por las de esta corrida
+        if elegida is None:
+            self._instantaneas.clear()
+            prefijo = 0
+            self.reanudada_desde = 0
+            self.simulacion = SimulacionReanudable(self.crear_algoritmo(), list(procesos))
+        else:
+            del self._instantaneas[elegida + 1:]
+            self.reanudada_desde, prefijo, instantanea, tabla = self._instantaneas[elegida]
+            correspondencia = comparaciones[id(tabla)][0]
+            self.simulacion = instantanea.bifurcar()
+            self.simulacion._independizar()
+            anteriores = self.simulacion.procesos
+            self.simulacion.reemplazar_procesos([
+                anteriores[previo] if previo is not None else p
+                for p, previo in zip(procesos, correspondencia)])
+        self.eventos.truncar(prefijo)
+        return self._continuar(prefijo, firmas)
+
+    def _continuar(self, prefijo: int, firmas: List[Tuple]) -> Iterator[Evento]:
+        yield from self.eventos.iterar(prefijo)
+
+        simulacion = self.simulacion
+        intervalo = self.intervalo or self._intervalo_estimado(simulacion)
+        while not simulacion.terminada:
+            for evento in simulacion.avanzar((simulacion.tiempo // intervalo + 1) * intervalo):
+                self.eventos.agregar_evento(evento)
+                yield evento
+            # El estado final también sirve: permite agregar procesos que llegan después de todo
+            self._instantaneas.append((simulacion.tiempo, len(self.eventos),
+                                       simulacion if simulacion.terminada else simulacion.bifurcar(),
+                                       firmas))
+
+    def _intervalo_estimado(self, simulacion: SimulacionReanudable) -> int:
+        """Reparte las instantáneas en una cota de la duración: última llegada + CPU total por CPU"""
+        procesos = simulacion.procesos
+        if not procesos:
+            return 1
+        duracion = (max(p.instante_llegada for p in procesos) +
+                    sum(p.tiempo_cpu for p in procesos) // simulacion.algoritmo.num_cpus)
+        return max(1, duracion // self.num_instantaneas)
+
+
+def _firma(proceso: Proceso) -> Tuple:
+    """Datos de entrada que definen un proceso en la tabla (sin PID ni resultados)"""
+    return (proceso.nombre, proceso.tiempo_cpu, proceso.instante_llegada, proceso.quantum,
+            proceso.prioridad, tuple(proceso.rafagas or ()), tuple(proceso.dispositivos or ()))
+
+
+def _comparar_tablas(anterior: List[Tuple], nueva: List[Tuple]) -> Tuple[List[Optional[int]], float]:
+    """Empareja filas iguales y devuelve, para cada fila nueva, su índice en ``anterior``
+    (None si es nueva) y la primera llegada de una fila agregada o quitada"""
+    # Lo habitual es agregar o quitar pocas filas: el prefijo y el sufijo comunes se emparejan
+    # directamente y solo el tramo central se compara como multiconjunto
+    limite = min(len(anterior), len(nueva))
+    inicio = next((i for i, (a, b) in enumerate(zip(anterior, nueva)) if a != b), limite)
+    fin = next((i for i, (a, b) in enumerate(zip(reversed(anterior), reversed(nueva)))
+                if i >= limite - inicio or a != b), limite - inicio)
+    desplazamiento = len(anterior) - len(nueva)
+
+    indices = defaultdict(deque)
+    for indice in range(inicio, len(anterior) - fin):
+        indices[anterior[indice]].append(indice)
+    correspondencia = list(range(inicio))
+    correspondencia.extend(indices[firma].popleft() if indices[firma] else None
+                           for firma in nueva[inicio:len(nueva) - fin])
+    correspondencia.extend(range(len(nueva) - fin + desplazamiento, len(anterior)))
+
+    # La llegada es el tercer campo de la firma
+    cambios = [firma[2] for firma, previo in zip(nueva, correspondencia) if previo is None]
+    cambios.extend(anterior[indice][2] for restantes in indices.values() for indice in restantes)
+    return correspondencia, min(cambios, default=float('inf'))
+
+
+def _clonar(proceso: Proceso) -> Proceso:
+    """Proceso con los mismos datos de entrada y PID, sin resultados"""
+    return Proceso(proceso.nombre, proceso.tiempo_cpu, proceso.instante_llegada, proceso.quantum,
+                   proceso.prioridad, pid=proceso.pid, rafagas=proceso.rafagas,
+                   dispositivos=proceso.dispositivos)
@@ -0,0 +1,175 @@
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+
+from eventos import Evento, RegistroEventos, TipoEvento
+
+# Líneas del reporte de cProfile que se conservan
+_LINEAS_PERFIL = 25
+
+
+def contadores(por_tipo) -> Dict:
+    """Contadores del motor que se deducen de la cantidad de eventos de cada tipo"""
+    cantidad = lambda tipo: int(por_tipo[tipo])
+    return {
+        'eventos': int(sum(por_tipo)),
+        'despachos': cantidad(TipoEvento.DESPACHO),
+        'desalojos': cantidad(TipoEvento.DESALOJO),
+        'saltos_ociosos': cantidad(TipoEvento.CPU_OCIOSA),
+        'bloqueos': cantidad(TipoEvento.BLOQUEO),
+    }
+
+
+def contadores_registro(registro: RegistroEventos) -> Dict:
+    """Los mismos contadores de ``Instrumentacion`` calculados sobre una bitácora ya completa"""
+    tipos = registro.columnas()[0]
+    return contadores(np.bincount(tipos, minlength=len(TipoEvento)))
+
+
+class Instrumentacion:
+    """Contadores y temporizadores opcionales de los motores de planificación.
+
+    Se activa con ``AlgoritmoPlanificacion.instrumentar()``; desactivada, a
+    los motores les cuesta una comparación con None por operación de cola.
+    Los contadores de eventos se obtienen observando los eventos a medida
+    que el motor los produce (ver ``contadores``). Los motores miden por
+    dentro las operaciones de su cola de listos (``ingresos_cola``:
+    llegadas, desbloqueos y reingresos de desalojados;
+    ``extracciones_cola``: los procesos que salen de la cola, al ser
+    elegidos o al terminar) y el tiempo de dos fases, sin incluir el del
+    consumidor de los eventos: ``llegadas`` (ingreso de llegadas y
+    desbloqueos a la cola) y ``seleccion`` (desalojos y elección del
+    siguiente proceso). Los núcleos columnares de ``ejecutar_lote`` solo
+    informan sus operaciones de cola. En ``tiempos``, ``metricas`` es el
+    cálculo de las métricas finales, ``lote`` la duración de las corridas de
+    ``ejecutar_lote`` y ``total`` la de todas las corridas.
+
+    Con ``perfil`` o ``memoria`` la corrida completa se ejecuta bajo
+    cProfile o tracemalloc, con el costo que eso implica. Los valores se
+    acumulan entre corridas (o ventanas de una simulación reanudable) hasta
+    llamar a ``reiniciar``.
+    """
+
+    def __init__(self, perfil: bool = False, memoria: bool = False):
+        self.perfil = perfil
+        self.memoria = memoria
+        self.reiniciar()
+
+    def reiniciar(self):
+        self._por_tipo = [0] * len(TipoEvento)
+        self.ingresos_cola = 0
+        self.extracciones_cola = 0
+        self._tiempo_llegadas = 0.0
+        self._tiempo_seleccion = 0.0
+        self._tiempo_metricas = 0.0
+        self._tiempo_total = 0.0
+        self._tiempo_lote = 0.0
+        self._en_lote = False
+        self.corridas = 0
+        self.corridas_lote = 0
+        self.procesos_lote = 0
+        self.reporte_perfil: Optional[str] = None
+        self.memoria_pico_bytes: Optional[int] = None
+
+    def observar(self, eventos: Iterator[Evento]) -> Iterator[Evento]:
+        """Reproduce ``eventos`` contándolos; el tiempo del consumidor no entra en ``total``"""
+        por_tipo = self._por_tipo
+        reloj = time.perf_counter
+        consumidor = 0.0
+        inicio = reloj()
+        for evento in eventos:
+            por_tipo[evento.tipo] += 1
+            entregado = reloj()
+            yield evento
+            consumidor += reloj() - entregado
+        if not self._en_lote:
+            self._tiempo_total += reloj() - inicio - consumidor
+
+    def sumar_llegadas(self, ingresos: int, segundos: float):
+        """Llegadas y desbloqueos que el motor ingresó a la cola de listos y lo que tardó"""
+        self.ingresos_cola += ingresos
+        self._tiempo_llegadas += segundos
+
+    def sumar_seleccion(self, ingresos: int, extracciones: int, segundos: float):
+        """Reingresos de desalojados y procesos elegidos de la cola, y lo que tardó el motor"""
+        self.ingresos_cola += ingresos
+        self.extracciones_cola += extracciones
+        self._tiempo_seleccion += segundos
+
+    def sumar_cola(self, ingresos: int, extracciones: int):
+        """Operaciones de cola sin cronometrar (núcleos columnares, bajas fuera de la selección)"""
+        self.ingresos_cola += ingresos
+        self.extracciones_cola += extracciones
+
+    def medir_metricas(self, segundos: float):
+        self._tiempo_metricas += segundos
+
+    @contextmanager
+    def corrida(self):
+        """Ejecuta el bloque bajo cProfile y/o tracemalloc si se pidieron"""
+        self.corridas += 1
+        perfilador = cProfile.Profile() if self.perfil else None
+        iniciar_memoria = self.memoria and not tracemalloc.is_tracing()
+        if iniciar_memoria:
+            tracemalloc.start()
+        if perfilador is not None:
+            perfilador.enable()
+        try:
+            yield self
+        finally:
+            if perfilador is not None:
+                perfilador.disable()
+                salida = io.StringIO()
+                pstats.Stats(perfilador, stream=salida).sort_stats("cumulative").print_stats(_LINEAS_PERFIL)
+                self.reporte_perfil = salida.getvalue()
+            if self.memoria:
+                pico = tracemalloc.get_traced_memory()[1]
+                self.memoria_pico_bytes = max(pico, self.memoria_pico_bytes or 0)
+                if iniciar_memoria:
+                    tracemalloc.stop()
+
+    @contextmanager
+    def corrida_lote(self, procesos: int):
+        """Como ``corrida`` para ``ejecutar_lote``, cronometrando la corrida completa.
+
+        Si el algoritmo pasa por el motor de eventos, sus eventos se cuentan
+        igual que en ``ejecutar`` y su tiempo queda dentro de ``lote``.
+        """
+        self.corridas_lote += 1
+        self.procesos_lote += procesos
+        self._en_lote = True
+        inicio = time.perf_counter()
+        try:
+            with self.corrida():
+                yield self
+        finally:
+            segundos = time.perf_counter() - inicio
+            self._en_lote = False
+            self._tiempo_lote += segundos
+            self._tiempo_total += segundos
+
+    def resumen(self) -> Dict:
+        """Contadores, segundos medidos por fase y, si se pidieron, memoria pico y cProfile"""
+        resumen = contadores(self._por_tipo)
+        resumen['ingresos_cola'] = self.ingresos_cola
+        resumen['extracciones_cola'] = self.extracciones_cola
+        resumen['corridas_lote'] = self.corridas_lote
+        resumen['procesos_lote'] = self.procesos_lote
+        resumen['tiempos'] = {
+            'llegadas': self._tiempo_llegadas,
+            'seleccion': self._tiempo_seleccion,
+            'metricas': self._tiempo_metricas,
+            'lote': self._tiempo_lote,
+            'total': max(self._tiempo_total, self._tiempo_metricas),
+        }
+        if self.memoria:
+            resumen['memoria_pico_bytes'] = self.memoria_pico_bytes
+        if self.perfil:
+            resumen['perfil'] = self.reporte_perfil
+        return resumen
@@ -6,6 +6,8 @@ class InterfazSimulador(ttk.Frame):
     def __init__(self, parent, simulacion_callback):
         super().__init__(parent)
         self.simulacion_callback = simulacion_callback
+        # Recibe la ruta elegida y guarda la última simulación como traza binaria (None = no disponible)
+        self.exportar_traza_callback = None
 
   
         self.procesos = []
@@ -44,9 +46,13 @@ class InterfazSimulador(ttk.Frame):
         self.entry_quantum = ttk.Entry(frame_form, width=10)
         self.entry_quantum.grid(row=1, column=3, padx=5, pady=5)
 
-      
+        ttk.Label(frame_form, text="Prioridad:").grid(row=2, column=0, padx=5, pady=5, sticky="w")
+        self.entry_prioridad = ttk.Entry(frame_form, width=10)
+        self.entry_prioridad.grid(row=2, column=1, padx=5, pady=5)
+
+
         button_frame = ttk.Frame(frame_form)
-        button_frame.grid(row=2, column=0, columnspan=4, pady=10)
+        button_frame.grid(row=3, column=0, columnspan=4, pady=10)
         
         ttk.Button(button_frame, text="Agregar Proceso", command=self.agregar_proceso).pack(side="left", padx=5)
         ttk.Button(button_frame, text="Limpiar Campos", command=self.limpiar_campos).pack(side="left", padx=5)
@@ -60,10 +66,10 @@ class InterfazSimulador(ttk.Frame):
         table_container = ttk.Frame(frame_tabla)
         table_container.pack(fill="both", expand=True)
 
-        columnas = ("PID", "Nombre", "CPU", "Llegada", "Quantum")
+        columnas = ("PID", "Nombre", "CPU", "Llegada", "Quantum", "Prioridad")
         self.tabla = ttk.Treeview(table_container, columns=columnas, show="headings", height=10)
 
-        column_widths = {"PID": 60, "Nombre": 100, "CPU": 80, "Llegada": 100, "Quantum": 80}
+        column_widths = {"PID": 60, "Nombre": 100, "CPU": 80, "Llegada": 100, "Quantum": 80, "Prioridad": 80}
         for col in columnas:
             self.tabla.heading(col, text=col)
             self.tabla.column(col, width=column_widths[col], anchor="center")
@@ -84,7 +90,7 @@ class InterfazSimulador(ttk.Frame):
 
         ttk.Label(frame_algo, text="Algoritmo de Planificación:").pack(anchor="w", padx=5, pady=2)
         self.algoritmo = tk.StringVar(value="FCFS")
-        opciones = ["FCFS", "SJF", "SRTF", "Round Robin", "Prioridades"]
+        opciones = ["FCFS", "SJF", "SRTF", "Round Robin", "Prioridades", "MLFQ"]
         self.combo_algoritmo = ttk.Combobox(frame_algo, textvariable=self.algoritmo, values=opciones, state="readonly")
         self.combo_algoritmo.pack(fill="x", padx=5, pady=5)
 
@@ -111,6 +117,7 @@ class InterfazSimulador(ttk.Frame):
         
         ttk.Button(text_controls, text="Limpiar Resultados", command=self.limpiar_resultados).pack(side="left", padx=5)
         ttk.Button(text_controls, text="Exportar Resultados", command=self.exportar_resultados).pack(side="left", padx=5)
+        ttk.Button(text_controls, text="Exportar Traza", command=self.exportar_traza).pack(side="left", padx=5)
 
     def actualizar_estadisticas(self):
         """Actualiza las estadísticas de procesos"""
@@ -130,6 +137,8 @@ class InterfazSimulador(ttk.Frame):
             llegada = int(self.entry_llegada.get())
             quantum = self.entry_quantum.get()
             quantum = int(quantum) if quantum else 0
+            prioridad = self.entry_prioridad.get()
+            prioridad = int(prioridad) if prioridad else 0
 
             if tiempo <= 0:
                 messagebox.showerror("Error", "El tiempo de CPU debe ser mayor a 0.")
@@ -139,6 +148,10 @@ class InterfazSimulador(ttk.Frame):
                 messagebox.showerror("Error", "El instante de llegada no puede ser negativo.")
                 return
 
+            if prioridad < 0:
+                messagebox.showerror("Error", "La prioridad no puede ser negativa.")
+                return
+
             if not nombre:
                 messagebox.showerror("Error", "El nombre del proceso no puede estar vacío.")
                 return
@@ -148,7 +161,8 @@ class InterfazSimulador(ttk.Frame):
                 "Nombre": nombre,
                 "CPU": tiempo,
                 "Llegada": llegada,
-                "Quantum": quantum if quantum > 0 else None
+                "Quantum": quantum if quantum > 0 else None,
+                "Prioridad": prioridad
             }
 
             self.procesos.append(proceso)
@@ -157,7 +171,8 @@ class InterfazSimulador(ttk.Frame):
                 nombre, 
                 tiempo, 
                 llegada, 
-                quantum if quantum > 0 else "N/A"
+                quantum if quantum > 0 else "N/A",
+                prioridad
             ))
             self.pid_counter += 1
 
@@ -191,6 +206,7 @@ class InterfazSimulador(ttk.Frame):
         self.entry_tiempo.delete(0, tk.END)
         self.entry_llegada.delete(0, tk.END)
         self.entry_quantum.delete(0, tk.END)
+        self.entry_prioridad.delete(0, tk.END)
         self.entry_nombre.focus()
 
     def limpiar_resultados(self):
@@ -219,6 +235,25 @@ class InterfazSimulador(ttk.Frame):
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo exportar: {str(e)}")
 
+    def exportar_traza(self):
+        """Guarda la última simulación en una traza binaria (eventos, segmentos y procesos)"""
+        if self.exportar_traza_callback is None:
+            messagebox.showwarning("Advertencia", "La traza binaria no está disponible en este modo.")
+            return
+        try:
+            from tkinter import filedialog
+            archivo = filedialog.asksaveasfilename(
+                defaultextension=".trz",
+                filetypes=[("Trazas binarias", "*.trz"), ("Todos los archivos", "*.*")]
+            )
+            
+            if archivo:
+                self.exportar_traza_callback(archivo)
+                messagebox.showinfo("Éxito", f"Traza exportada a: {archivo}")
+                
+        except Exception as e:
+            messagebox.showerror("Error", f"No se pudo exportar la traza: {str(e)}")
+
     def iniciar_simulacion(self):
         if not self.procesos:
             messagebox.showwarning("Atención", "No hay procesos en la cola.")
@@ -0,0 +1,250 @@
+import heapq
+from bisect import bisect_right
+from collections import deque
+from typing import List, Optional
+
+import numpy as np
+
+from procesos import Proceso
+
+
+class ProcesoBatch:
+    """Carga de trabajo en formato columnar (struct-of-arrays).
+
+    Cada atributo de los procesos es una columna NumPy ``int64``, de modo que
+    un millón de procesos ocupa unas decenas de bytes por proceso en lugar de
+    un objeto ``Proceso`` con su propio ``__dict__``. Las columnas de
+    resultados (finalizacion, espera, respuesta) valen -1 mientras el proceso
+    no haya sido planificado. Un quantum 0 significa "sin quantum propio".
+    Las ráfagas de E/S, si las hay, viajan como listas por proceso en
+    ``rafagas`` y ``dispositivos`` (None = proceso solo de CPU).
+    """
+
+    __slots__ = ("pid", "llegada", "cpu", "quantum", "prioridad",
+                 "finalizacion", "espera", "respuesta", "nombres",
+                 "rafagas", "dispositivos")
+
+    def __init__(self, llegada, cpu, pid=None, quantum=None, prioridad=None,
+                 nombres: Optional[List[str]] = None, rafagas: Optional[List] = None,
+                 dispositivos: Optional[List] = None):
+        self.llegada = np.asarray(llegada, dtype=np.int64)
+        self.cpu = np.asarray(cpu, dtype=np.int64)
+        total = len(self.llegada)
+
+        self.pid = (np.arange(1, total + 1, dtype=np.int64) if pid is None
+                    else np.asarray(pid, dtype=np.int64))
+        self.quantum = (np.zeros(total, dtype=np.int64) if quantum is None
+                        else np.asarray(quantum, dtype=np.int64))
+        self.prioridad = (np.zeros(total, dtype=np.int64) if prioridad is None
+                          else np.asarray(prioridad, dtype=np.int64))
+        self.nombres = nombres
+        self.rafagas = rafagas
+        self.dispositivos = dispositivos
+
+        columnas = (self.cpu, self.pid, self.quantum, self.prioridad)
+        if any(len(columna) != total for columna in columnas):
+            raise ValueError("Todas las columnas del lote deben tener la misma longitud.")
+        if nombres is not None and len(nombres) != total:
+            raise ValueError("La lista de nombres debe tener una entrada por proceso.")
+        if any(lista is not None and len(lista) != total for lista in (rafagas, dispositivos)):
+            raise ValueError("Las listas de ráfagas y dispositivos deben tener una entrada por proceso.")
+        if total and self.cpu.min() <= 0:
+            raise ValueError("El tiempo de CPU debe ser un entero positivo.")
+        if total and self.llegada.min() < 0:
+            raise ValueError("El instante de llegada debe ser un entero mayor o igual a 0.")
+
+        self.reiniciar_resultados()
+
+    def __len__(self):
+        return len(self.llegada)
+
+    @classmethod
+    def desde_procesos(cls, procesos: List[Proceso]) -> "ProcesoBatch":
+        """Construye el lote a partir de una lista de objetos Proceso"""
+        total = len(procesos)
+        con_es = any(p.rafagas for p in procesos)
+        return cls(
+            llegada=np.fromiter((p.instante_llegada for p in procesos), dtype=np.int64, count=total),
+            cpu=np.fromiter((p.tiempo_cpu for p in procesos), dtype=np.int64, count=total),
+            pid=np.fromiter((p.pid for p in procesos), dtype=np.int64, count=total),
+            quantum=np.fromiter((p.quantum or 0 for p in procesos), dtype=np.int64, count=total),
+            prioridad=np.fromiter((p.prioridad for p in procesos), dtype=np.int64, count=total),
+            nombres=[p.nombre for p in procesos],
+            rafagas=[p.rafagas for p in procesos] if con_es else None,
+            dispositivos=[p.dispositivos for p in procesos] if con_es else None,
+        )
+
+    def nombre(self, indice: int) -> str:
+        if self.nombres is not None:
+            return self.nombres[indice]
+        return f"P{self.pid[indice]}"
+
+    def a_procesos(self) -> List[Proceso]:
+        """Convierte el lote en objetos Proceso conservando PID y resultados"""
+        procesos = []
+        for i in range(len(self)):
+            quantum = int(self.quantum[i])
+            proceso = Proceso(self.nombre(i), int(self.cpu[i]), int(self.llegada[i]),
+                              quantum if quantum > 0 else None, int(self.prioridad[i]),
+                              pid=int(self.pid[i]),
+                              rafagas=self.rafagas[i] if self.rafagas else None,
+                              dispositivos=self.dispositivos[i] if self.dispositivos else None)
+            if self.finalizacion[i] >= 0:
+                proceso.tiempo_finalizacion = int(self.finalizacion[i])
+                proceso.tiempo_espera = int(self.espera[i])
+                proceso.tiempo_respuesta = int(self.respuesta[i])
+                proceso.tiempo_restante = 0
+                proceso.ejecutado = True
+            procesos.append(proceso)
+        return procesos
+
+    def cargar_resultados(self, procesos: List[Proceso]):
+        """Copia a las columnas los resultados de procesos en el mismo orden que el lote"""
+        for i, proceso in enumerate(procesos):
+            if proceso.tiempo_finalizacion is not None:
+                self.finalizacion[i] = proceso.tiempo_finalizacion
+                self.espera[i] = proceso.tiempo_espera
+                self.respuesta[i] = proceso.tiempo_respuesta
+
+    def reiniciar_resultados(self):
+        total = len(self)
+        self.finalizacion = np.full(total, -1, dtype=np.int64)
+        self.espera = np.full(total, -1, dtype=np.int64)
+        self.respuesta = np.full(total, -1, dtype=np.int64)
+
+    def tiene_es(self) -> bool:
+        """True si algún proceso del lote alterna ráfagas de CPU y E/S"""
+        return self.rafagas is not None and any(self.rafagas)
+
+    def orden_llegada(self) -> np.ndarray:
+        """Permutación estable que ordena el lote por instante de llegada"""
+        return np.argsort(self.llegada, kind="stable")
+
+
+def fcfs_vectorizado(lote: ProcesoBatch) -> int:
+    """Planifica FCFS sobre las columnas del lote sin bucles en Python.
+
+    Con S la suma acumulada de ráfagas en orden de llegada, la finalización
+    es ``f_i = S_i + max_{j<=i}(a_j - S_{j-1})``, es decir, una suma
+    acumulada combinada con ``np.maximum.accumulate`` de las llegadas.
+    Devuelve el instante en que termina el último proceso.
+    """
+    if len(lote) == 0:
+        return 0
+    orden = lote.orden_llegada()
+    llegada = lote.llegada[orden]
+    cpu = lote.cpu[orden]
+    acumulado = np.cumsum(cpu)
+    finalizacion = acumulado + np.maximum.accumulate(llegada - (acumulado - cpu))
+
+    lote.finalizacion[orden] = finalizacion
+    lote.espera[orden] = finalizacion - cpu - llegada
+    lote.respuesta[orden] = lote.espera[orden]
+    return int(finalizacion[-1])
+
+
+def ejecutar_no_apropiativo(lote: ProcesoBatch, orden_preferencia: np.ndarray,
+                             instrumentacion=None) -> int:
+    """Planificador no apropiativo genérico que escribe directo en las columnas.
+
+    ``orden_preferencia`` es la permutación de los procesos de más a menos
+    preferido (p. ej. por ráfaga en SJF); el heap de listos guarda solo el
+    rango entero de cada proceso. Con ``instrumentacion`` informa sus
+    operaciones sobre el heap. Devuelve el instante final.
+    """
+    total = len(lote)
+    if total == 0:
+        return 0
+    rango = np.empty(total, dtype=np.int64)
+    rango[orden_preferencia] = np.arange(total, dtype=np.int64)
+
+    orden = lote.orden_llegada()
+    llegadas = lote.llegada[orden].tolist()
+    rangos_por_llegada = rango[orden].tolist()
+    por_rango = orden_preferencia.tolist()
+    cpu = lote.cpu.tolist()
+    inicio = [0] * total
+
+    tiempo = 0
+    indice_proximo = 0
+    listos = []
+    for _ in range(total):
+        if not listos and llegadas[indice_proximo] > tiempo:
+            tiempo = llegadas[indice_proximo]
+        while indice_proximo < total and llegadas[indice_proximo] <= tiempo:
+            heapq.heappush(listos, rangos_por_llegada[indice_proximo])
+            indice_proximo += 1
+        k = por_rango[heapq.heappop(listos)]
+        inicio[k] = tiempo
+        tiempo += cpu[k]
+    if instrumentacion is not None:
+        # Sin apropiación cada proceso entra al heap y sale de él exactamente una vez
+        instrumentacion.sumar_cola(total, total)
+
+    inicio = np.array(inicio, dtype=np.int64)
+    lote.finalizacion[:] = inicio + lote.cpu
+    lote.espera[:] = inicio - lote.llegada
+    lote.respuesta[:] = lote.espera
+    return tiempo
+
+
+def round_robin_columnas(llegadas: List[int], cpu: List[int], quantums: List[int],
+                         quantum_defecto: int, pids: Optional[List[int]] = None,
+                         segmentos=None, instrumentacion=None):
+    """Núcleo de Round Robin sin eventos sobre columnas ya ordenadas por llegada.
+
+    ``quantums`` trae el quantum propio de cada proceso (0 = usar
+    ``quantum_defecto``). Cada porción avanza el reloj en un solo paso y las
+    llegadas dentro de la porción se ubican con búsqueda binaria. Si se pasa
+    un ``RegistroSegmentos`` (junto con ``pids``) se registran los intervalos
+    de ejecución y con ``instrumentacion`` se informan las operaciones de la
+    cola. Devuelve ``(primer_despacho, finalizacion, tiempo_final)`` con las
+    dos listas en el mismo orden de entrada.
+    """
+    total = len(llegadas)
+    restante = list(cpu)
+    primer_despacho = [-1] * total
+    finalizacion = [0] * total
+    cola = deque()
+    tiempo = 0
+    indice_proximo = 0
+    completados = 0
+
+    while completados < total:
+        if not cola:
+            if llegadas[indice_proximo] > tiempo:
+                tiempo = llegadas[indice_proximo]
+            limite = bisect_right(llegadas, tiempo, indice_proximo)
+            cola.extend(range(indice_proximo, limite))
+            indice_proximo = limite
+
+        k = cola.popleft()
+        if primer_despacho[k] < 0:
+            primer_despacho[k] = tiempo
+        porcion = quantums[k] or quantum_defecto
+        pendiente = restante[k]
+        if pendiente < porcion:
+            porcion = pendiente
+        if segmentos is not None:
+            segmentos.agregar(pids[k], tiempo, tiempo + porcion)
+        tiempo += porcion
+        pendiente -= porcion
+
+        if indice_proximo < total and llegadas[indice_proximo] <= tiempo:
+            limite = bisect_right(llegadas, tiempo, indice_proximo)
+            cola.extend(range(indice_proximo, limite))
+            indice_proximo = limite
+
+        if pendiente:
+            restante[k] = pendiente
+            cola.append(k)
+        else:
+            finalizacion[k] = tiempo
+            completados += 1
+
+    if instrumentacion is not None:
+        # Cada proceso entra a la cola al llegar y al agotar cada porción salvo la última, y
+        # sale en cada despacho: ambas cuentas son las porciones, que no hace falta contar en el bucle
+        despachos = sum(max(1, -(-c // (q or quantum_defecto))) for c, q in zip(cpu, quantums))
+        instrumentacion.sumar_cola(despachos, despachos)
+    return primer_despacho, finalizacion, tiempo
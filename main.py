@@ -2,9 +2,18 @@ from interfaz import InterfazSimulador
 from historial import HistorialUI
 from procesos import Proceso
 from algoritmos import FabricaAlgoritmos
+from instantaneas import SimulacionIncremental
+from cache_resultados import CacheResultados
+from eventos import TipoEvento
+from instrumentacion import contadores_registro
+from lotes import ProcesoBatch
+from trazas import guardar_traza, metadatos_carga
 import tkinter as tk
 from tkinter import ttk, messagebox
-from threading import Thread
+from threading import Lock, Thread
+
+# Segmentos del diagrama de Gantt que se muestran en el panel de resultados
+MAX_SEGMENTOS_GANTT = 200
 
 class SimuladorAvanzado:
     """Clase principal que integra todos los componentes"""
@@ -13,6 +22,13 @@ class SimuladorAvanzado:
         self.root = root
         self.historial_ui = None
         self.interfaz = None
+        # Re-simulación incremental por algoritmo: reutiliza instantáneas de la corrida anterior
+        self.incrementales = {}
+        self.bloqueo_simulacion = Lock()
+        # Resultados ya calculados por (algoritmo, tabla de procesos)
+        self.cache_resultados = CacheResultados()
+        # Resultados de la última simulación, para exportarlos como traza binaria
+        self.ultima_corrida = None
         self.configurar_ventana()
         self.crear_componentes()
     
@@ -37,6 +53,7 @@ class SimuladorAvanzado:
        
         callback = self.crear_callback_simulacion()
         self.interfaz = InterfazSimulador(left_frame, callback)
+        self.interfaz.exportar_traza_callback = self.exportar_traza
         self.interfaz.pack(fill="both", expand=True)
         
       
@@ -69,10 +86,10 @@ class SimuladorAvanzado:
                         p_dict["Nombre"],
                         p_dict["CPU"],
                         p_dict["Llegada"],
-                        p_dict["Quantum"]
+                        p_dict["Quantum"],
+                        p_dict.get("Prioridad", 0)
                     )
                     procesos_objetos.append(proceso)
-                    text_widget.insert(tk.END, f"   ✅ {proceso.nombre} (PID: {proceso.pid})\n")
                 
                
                 if self.historial_ui:
@@ -80,17 +97,84 @@ class SimuladorAvanzado:
                 
                
                 fabrica = FabricaAlgoritmos()
-                algoritmo_obj = fabrica.crear_algoritmo(algoritmo)
-                
-                text_widget.insert(tk.END, f"\n🎯 INICIANDO {algoritmo}...\n")
-                text_widget.insert(tk.END, "─" * 50 + "\n")
                 
-             
-                eventos = algoritmo_obj.ejecutar(procesos_objetos)
+                with self.bloqueo_simulacion:
+                    guardado = self.cache_resultados.obtener(
+                        algoritmo, {}, self.cache_resultados.carga(ProcesoBatch.desde_procesos(procesos_objetos)))
+                    if guardado is not None:
+                        # Misma tabla y algoritmo que una corrida anterior: se muestra el resultado guardado.
+                        # Finalización y espera salen de los eventos y la respuesta, como en los motores,
+                        # del primer segmento ejecutado de cada proceso
+                        eventos = guardado['eventos']
+                        por_pid = {p.pid: p for p in procesos_objetos}
+                        for evento in eventos:
+                            if evento.tipo == TipoEvento.FINALIZACION:
+                                por_pid[evento.pid].tiempo_finalizacion = evento.tiempo
+                                por_pid[evento.pid].tiempo_espera = evento.dato
+                        pids, inicios, _ = guardado['segmentos'].columnas()
+                        for pid, inicio in zip(pids.tolist(), inicios.tolist()):
+                            proceso = por_pid[pid]
+                            respuesta = inicio - proceso.instante_llegada
+                            if proceso.tiempo_respuesta is None or respuesta < proceso.tiempo_respuesta:
+                                proceso.tiempo_respuesta = respuesta
+                    else:
+                        incremental = self.incrementales.get(algoritmo)
+                        if incremental is None:
+                            incremental = SimulacionIncremental(lambda: fabrica.crear_algoritmo(algoritmo).instrumentar())
+                            self.incrementales[algoritmo] = incremental
+                        
+                        # Los procesos sin cambios conservan el objeto (y el PID) de la corrida anterior
+                        eventos = incremental.ejecutar_iter(procesos_objetos)
+                        procesos_objetos = incremental.simulacion.procesos
+                    for proceso in procesos_objetos:
+                        text_widget.insert(tk.END, f"   ✅ {proceso.nombre} (PID: {proceso.pid})\n")
+                    
+                    text_widget.insert(tk.END, f"\n🎯 INICIANDO {algoritmo}...\n")
+                    if guardado is not None:
+                        text_widget.insert(tk.END, "♻ Resultado tomado de la caché de simulaciones\n")
+                    elif incremental.reanudada_desde:
+                        text_widget.insert(tk.END, f"♻ Reanudando desde T{incremental.reanudada_desde} "
+                                                   f"(eventos previos de la corrida anterior)\n")
+                    text_widget.insert(tk.END, "─" * 50 + "\n")
+                    
+                 
+                    # Los eventos se muestran a medida que el algoritmo los produce;
+                    # el texto se genera aquí, no dentro del algoritmo
+                    nombres = {p.pid: p.nombre for p in procesos_objetos}
+                    for evento in eventos:
+                        text_widget.insert(tk.END, f"T{evento.tiempo:3d}: {evento.texto(nombres, algoritmo)}\n")
+                    
+                    lote = ProcesoBatch.desde_procesos(procesos_objetos)
+                    lote.cargar_resultados(procesos_objetos)
+                    if guardado is not None:
+                        registro = guardado['eventos']
+                        segmentos = guardado['segmentos']
+                        metricas = guardado['metricas']
+                        tiempo_total = guardado.get('tiempo_total', 0)
+                        instrumentacion = None
+                    else:
+                        algoritmo_obj = incremental.simulacion.algoritmo
+                        registro = incremental.eventos.copia()
+                        segmentos = algoritmo_obj.segmentos
+                        metricas = algoritmo_obj.metricas
+                        tiempo_total = algoritmo_obj.tiempo_actual
+                        instrumentacion = algoritmo_obj.instrumentacion.resumen()
+                        self.cache_resultados.guardar(
+                            algoritmo, {}, self.cache_resultados.carga(lote),
+                            {'metricas': metricas, 'eventos': registro, 'segmentos': segmentos,
+                             'metricas_por_cpu': algoritmo_obj.metricas_por_cpu,
+                             'tiempo_total': tiempo_total})
+                    contadores = contadores_registro(registro)
+                    self.ultima_corrida = {'algoritmo': algoritmo, 'eventos': registro, 'segmentos': segmentos,
+                                           'metricas': metricas, 'tiempo_total': tiempo_total, 'lote': lote}
                 
-            
-                for evento in eventos:
-                    text_widget.insert(tk.END, f"T{evento['tiempo']:3d}: {evento['evento']}\n")
+                text_widget.insert(tk.END, f"\n⏱ DIAGRAMA DE GANTT ({len(segmentos)} segmentos):\n")
+                text_widget.insert(tk.END, "─" * 40 + "\n")
+                for i, linea in enumerate(segmentos.lineas_gantt(nombres)):
+                    if i == MAX_SEGMENTOS_GANTT:
+                        text_widget.insert(tk.END, f"   ... {len(segmentos) - i} segmentos más\n")
+                        break
+                    text_widget.insert(tk.END, f"   {linea}\n")
                 
           
                 if self.historial_ui:
@@ -107,13 +191,33 @@ class SimuladorAvanzado:
                 text_widget.insert(tk.END, "\n📊 MÉTRICAS FINALES:\n")
                 text_widget.insert(tk.END, "─" * 40 + "\n")
                 
-                metricas = algoritmo_obj.metricas
                 if metricas:
                     text_widget.insert(tk.END, f"• Throughput: {metricas.get('throughput', 0)} procesos\n")
                     text_widget.insert(tk.END, f"• Tiempo de retorno promedio: {metricas.get('tiempo_retorno_promedio', 0):.2f}u\n")
                     text_widget.insert(tk.END, f"• Tiempo de espera promedio: {metricas.get('tiempo_espera_promedio', 0):.2f}u\n")
                     text_widget.insert(tk.END, f"• Tiempo de respuesta promedio: {metricas.get('tiempo_respuesta_promedio', 0):.2f}u\n")
                     text_widget.insert(tk.END, f"• Uso de CPU: {metricas.get('uso_cpu', 0)*100:.1f}%\n")
+                    text_widget.insert(tk.END, f"• CPU ocupada/ociosa: {metricas.get('tiempo_ocupado', 0)}u / {metricas.get('tiempo_ocioso', 0)}u\n")
+                    text_widget.insert(tk.END, f"• Espera p50/p95/p99: {metricas.get('tiempo_espera_p50', 0):.1f} / "
+                                               f"{metricas.get('tiempo_espera_p95', 0):.1f} / {metricas.get('tiempo_espera_p99', 0):.1f}u\n")
+                    text_widget.insert(tk.END, f"• Slowdown promedio/máx: {metricas.get('slowdown_promedio', 0):.2f} / {metricas.get('slowdown_max', 0):.2f}\n")
+                    text_widget.insert(tk.END, f"• Índice de equidad de Jain: {metricas.get('indice_jain', 0):.3f}\n")
+                    
+                    text_widget.insert(tk.END, "\n🔬 INSTRUMENTACIÓN DEL MOTOR:\n")
+                    text_widget.insert(tk.END, "─" * 40 + "\n")
+                    text_widget.insert(tk.END, f"• Eventos: {contadores['eventos']} | Despachos: {contadores['despachos']} | "
+                                               f"Desalojos: {contadores['desalojos']}\n")
+                    text_widget.insert(tk.END, f"• Saltos de CPU ociosa: {contadores['saltos_ociosos']}\n")
+                    if instrumentacion is not None:
+                        # Si la corrida se reanudó de una instantánea, incluye lo medido en el prefijo original
+                        tiempos = instrumentacion['tiempos']
+                        text_widget.insert(tk.END, f"• Operaciones de cola (ingresos/extracciones): "
+                                                   f"{instrumentacion['ingresos_cola']} / "
+                                                   f"{instrumentacion['extracciones_cola']}\n")
+                        text_widget.insert(tk.END, f"• Tiempo total / métricas (ms): {tiempos['total'] * 1000:.1f} / "
+                                                   f"{tiempos['metricas'] * 1000:.1f}\n")
+                        text_widget.insert(tk.END, f"• Tiempo por fase (ms): llegadas {tiempos['llegadas'] * 1000:.1f} | "
+                                                   f"selección {tiempos['seleccion'] * 1000:.1f}\n")
                 else:
                     text_widget.insert(tk.END, "No se pudieron calcular las métricas\n")
                 
@@ -131,6 +235,16 @@ class SimuladorAvanzado:
         thread.daemon = True
         thread.start()
     
+    def exportar_traza(self, ruta):
+        """Escribe la última simulación en una traza binaria (ver trazas.py)"""
+        corrida = self.ultima_corrida
+        if corrida is None:
+            raise ValueError("Todavía no se ejecutó ninguna simulación.")
+        metadatos = {'algoritmo': corrida['algoritmo'], 'metricas': corrida['metricas'],
+                     'tiempo_total': corrida['tiempo_total']}
+        metadatos.update(metadatos_carga(corrida['lote']))
+        guardar_traza(ruta, corrida['eventos'], corrida['segmentos'], metadatos, corrida['lote'])
+    
     def crear_barra_estado(self):
         status_bar = ttk.Label(self.root, 
                               text="✅ Simulador avanzado listo - Módulo de algoritmos integrado", 
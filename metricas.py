@@ -0,0 +1,105 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+# Métricas por proceso sobre las que se calculan las estadísticas extendidas
+_SERIES = ("tiempo_retorno", "tiempo_espera", "tiempo_respuesta", "slowdown")
+_PERCENTILES = (50, 95, 99)
+
+
+def calcular_metricas_columnas(llegada, cpu, finalizacion, espera, respuesta,
+                               tiempo_total: int,
+                               inicio_intervalos: Optional[np.ndarray] = None,
+                               fin_intervalos: Optional[np.ndarray] = None,
+                               num_cpus: int = 1) -> Dict:
+    """Calcula las métricas de una simulación a partir de columnas NumPy.
+
+    Las columnas describen un proceso por posición; los procesos con
+    ``finalizacion < 0`` se consideran no terminados y se excluyen. Además de
+    los promedios históricos devuelve, para retorno, espera, respuesta y
+    slowdown (retorno / ráfaga), los percentiles 50/95/99, el máximo y la
+    desviación estándar, junto con el índice de equidad de Jain sobre el
+    slowdown.
+
+    El uso de CPU es tiempo ocupado / tiempo total. El tiempo ocupado sale de
+    los intervalos de ejecución registrados (``inicio_intervalos``,
+    ``fin_intervalos``) cuando se proporcionan; si no, de la suma de ráfagas
+    de los procesos terminados. Con ``num_cpus`` > 1 la capacidad es
+    ``num_cpus * tiempo_total`` y el uso de CPU es el promedio entre núcleos.
+    """
+    finalizacion = np.asarray(finalizacion, dtype=np.int64)
+    if len(finalizacion) == 0:
+        return {}
+
+    terminados = finalizacion >= 0
+    completados = int(np.count_nonzero(terminados))
+
+    if inicio_intervalos is not None and fin_intervalos is not None:
+        tiempo_ocupado = int(np.sum(np.asarray(fin_intervalos, dtype=np.int64)
+                                    - np.asarray(inicio_intervalos, dtype=np.int64)))
+    else:
+        tiempo_ocupado = int(np.asarray(cpu, dtype=np.int64)[terminados].sum())
+    capacidad = tiempo_total * num_cpus
+    tiempo_ocioso = max(capacidad - tiempo_ocupado, 0)
+
+    metricas = {
+        'throughput': completados,
+        'procesos_por_unidad': completados / tiempo_total if tiempo_total > 0 else 0,
+        'tiempo_ocupado': tiempo_ocupado,
+        'tiempo_ocioso': tiempo_ocioso,
+        'uso_cpu': tiempo_ocupado / capacidad if capacidad > 0 else 0,
+    }
+
+    if completados == 0:
+        for serie in _SERIES:
+            metricas[f'{serie}_promedio'] = 0
+        metricas['indice_jain'] = 0
+        return metricas
+
+    llegada = np.asarray(llegada, dtype=np.int64)[terminados]
+    rafaga = np.asarray(cpu, dtype=np.int64)[terminados]
+    retorno = finalizacion[terminados] - llegada
+
+    # Una fila por serie para resolver todas las estadísticas con una sola llamada por función
+    datos = np.empty((len(_SERIES), completados), dtype=np.float64)
+    datos[0] = retorno
+    datos[1] = np.asarray(espera, dtype=np.int64)[terminados]
+    datos[2] = np.asarray(respuesta, dtype=np.int64)[terminados]
+    datos[3] = retorno / rafaga
+
+    promedios = datos.mean(axis=1)
+    percentiles = np.percentile(datos, _PERCENTILES, axis=1)
+    maximos = datos.max(axis=1)
+    desviaciones = datos.std(axis=1)
+
+    for fila, serie in enumerate(_SERIES):
+        metricas[f'{serie}_promedio'] = float(promedios[fila])
+        for columna, percentil in enumerate(_PERCENTILES):
+            metricas[f'{serie}_p{percentil}'] = float(percentiles[columna, fila])
+        metricas[f'{serie}_max'] = float(maximos[fila])
+        metricas[f'{serie}_desviacion'] = float(desviaciones[fila])
+
+    # Índice de Jain: (Σx)² / (n·Σx²), 1 = trato perfectamente equitativo
+    slowdown = datos[3]
+    suma_cuadrados = float(np.dot(slowdown, slowdown))
+    metricas['indice_jain'] = (float(slowdown.sum()) ** 2 / (completados * suma_cuadrados)
+                               if suma_cuadrados > 0 else 1.0)
+    return metricas
+
+
+def metricas_cambio_contexto(metricas: Dict, cambios: int, tiempo_cambio: int,
+                             tiempo_total: int, num_cpus: int = 1) -> Dict:
+    """Métricas del costo de cambio de contexto para agregar a ``metricas``.
+
+    El tiempo de cambio ocupa la CPU sin avanzar a ningún proceso: no cuenta
+    como tiempo ocupado y se descuenta del tiempo ocioso, de modo que
+    ocupado + ocioso + cambio = capacidad. ``sobrecarga_cambio`` es la
+    fracción de la capacidad perdida en cambios.
+    """
+    capacidad = tiempo_total * num_cpus
+    return {
+        'cambios_contexto': cambios,
+        'tiempo_cambio_contexto': tiempo_cambio,
+        'sobrecarga_cambio': tiempo_cambio / capacidad if capacidad > 0 else 0,
+        'tiempo_ocioso': max(metricas.get('tiempo_ocioso', 0) - tiempo_cambio, 0),
+    }
@@ -0,0 +1,180 @@
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from algoritmos import FabricaAlgoritmos, _etiqueta_configuracion
+from lotes import ProcesoBatch
+from procesos import Proceso
+
+# Generador de cargas: recibe la semilla de la réplica y devuelve la carga a planificar.
+# Para usarlo con el pool debe poder serializarse (función definida a nivel de módulo).
+GeneradorCarga = Callable[[int], Union[List[Proceso], ProcesoBatch]]
+
+# Cuantiles t de Student (dos colas, 95 %) por grados de libertad; desde 30 se usa la normal
+_T_95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+         2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+         2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045)
+_Z_95 = 1.960
+
+
+class EstadisticaIncremental:
+    """Media y varianza acumuladas con el algoritmo de Welford (una pasada, estable)"""
+
+    __slots__ = ("n", "media", "_m2")
+
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self._m2 = 0.0
+
+    def agregar(self, valor: float):
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self._m2 += delta * (valor - self.media)
+
+    @property
+    def varianza(self) -> float:
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    def semiancho_95(self) -> float:
+        """Semiancho del intervalo de confianza del 95 % para la media"""
+        if self.n < 2:
+            return math.inf
+        cuantil = _T_95[self.n - 2] if self.n - 2 < len(_T_95) else _Z_95
+        return cuantil * math.sqrt(self.varianza / self.n)
+
+    def intervalo_95(self) -> Tuple[float, float]:
+        semiancho = self.semiancho_95()
+        return self.media - semiancho, self.media + semiancho
+
+
+def semillas_replicas(semilla: int, replicas: int) -> List[int]:
+    """Semillas independientes por réplica derivadas de una semilla maestra"""
+    return [int(hijo.generate_state(1)[0]) for hijo in np.random.SeedSequence(semilla).spawn(replicas)]
+
+
+def _ejecutar_replica(generador: GeneradorCarga, semilla: int,
+                      configuraciones: List[Tuple[str, Dict]]) -> Dict[str, Dict]:
+    """Genera la carga de una réplica y devuelve las métricas de cada configuración"""
+    carga = generador(semilla)
+    lote = carga if isinstance(carga, ProcesoBatch) else ProcesoBatch.desde_procesos(carga)
+    metricas = {}
+    for nombre, parametros in configuraciones:
+        algoritmo = FabricaAlgoritmos.crear_algoritmo(nombre, **parametros)
+        lote.reiniciar_resultados()
+        algoritmo.ejecutar_lote(lote)
+        metricas[_etiqueta_configuracion(nombre, parametros)] = algoritmo.metricas
+    return metricas
+
+
+def ejecutar_montecarlo(generador: GeneradorCarga, replicas: int,
+                        configuraciones: Optional[List[Tuple[str, Dict]]] = None,
+                        semilla: int = 0, precision: Optional[float] = None,
+                        metrica: str = 'tiempo_espera_promedio', min_replicas: int = 5,
+                        paralelo: bool = True,
+                        max_trabajadores: Optional[int] = None) -> Iterator[Dict]:
+    """Ejecuta hasta ``replicas`` réplicas independientes y entrega sus resultados a medida que terminan.
+
+    Cada réplica usa su propia semilla (derivada de ``semilla``), genera una
+    carga con ``generador`` y ejecuta sobre ella todas las ``configuraciones``
+    (por omisión, todos los algoritmos de la fábrica). Por cada réplica se
+    produce un diccionario con su índice, su semilla, las métricas por
+    configuración y el ``resumen`` acumulado: media e intervalo de confianza
+    del 95 % de cada métrica numérica.
+
+    Con ``precision`` (p. ej. 0.05 = ±5 %) la corrida se detiene en cuanto,
+    tras al menos ``min_replicas`` réplicas, el semiancho del intervalo de
+    ``metrica`` es menor que ``precision`` veces su media para todas las
+    configuraciones; las réplicas pendientes se cancelan. Los resultados se
+    entregan en orden de réplica, de modo que la corrida (y el punto de
+    parada) no depende de cuál trabajador termine primero.
+    """
+    if replicas <= 0:
+        raise ValueError("El número de réplicas debe ser un entero positivo.")
+    if configuraciones is None:
+        configuraciones = [(nombre, {}) for nombre in FabricaAlgoritmos.obtener_algoritmos_disponibles()]
+
+    semillas = semillas_replicas(semilla, replicas)
+    estadisticas: Dict[str, Dict[str, EstadisticaIncremental]] = {}
+
+    def registrar(indice: int, metricas: Dict[str, Dict]) -> Tuple[Dict, bool]:
+        for etiqueta, valores in metricas.items():
+            acumuladas = estadisticas.setdefault(etiqueta, {})
+            for clave, valor in valores.items():
+                acumuladas.setdefault(clave, EstadisticaIncremental()).agregar(float(valor))
+        resultado = {
+            'replica': indice,
+            'semilla': semillas[indice],
+            'metricas': metricas,
+            'resumen': {etiqueta: {clave: {'media': est.media, 'ic95': est.intervalo_95()}
+                                   for clave, est in acumuladas.items()}
+                        for etiqueta, acumuladas in estadisticas.items()},
+        }
+        return resultado, _precision_alcanzada(estadisticas, metrica, precision, min_replicas)
+
+    if paralelo and replicas > 1 and max_trabajadores != 1:
+        try:
+            with ProcessPoolExecutor(max_workers=max_trabajadores) as pool:
+                # Solo se mantiene una ventana de réplicas en vuelo para no gastar CPU tras la parada
+                ventana = 2 * (max_trabajadores or os.cpu_count() or 1)
+                pendientes = {}
+                terminados = {}
+                siguiente_envio = 0
+                siguiente_entrega = 0
+                while siguiente_entrega < replicas:
+                    while siguiente_envio < replicas and len(pendientes) < ventana:
+                        futuro = pool.submit(_ejecutar_replica, generador,
+                                             semillas[siguiente_envio], configuraciones)
+                        pendientes[futuro] = siguiente_envio
+                        siguiente_envio += 1
+                    listos, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+                    for futuro in listos:
+                        terminados[pendientes.pop(futuro)] = futuro.result()
+                    while siguiente_entrega in terminados:
+                        resultado, detener = registrar(siguiente_entrega,
+                                                       terminados.pop(siguiente_entrega))
+                        siguiente_entrega += 1
+                        yield resultado
+                        if detener:
+                            # Sin esperar a las réplicas en curso: el ``with`` ya no bloquea al salir
+                            pool.shutdown(wait=False, cancel_futures=True)
+                            return
+                return
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            if estadisticas:
+                raise
+
+    for indice in range(replicas):
+        resultado, detener = registrar(indice, _ejecutar_replica(generador, semillas[indice],
+                                                                 configuraciones))
+        yield resultado
+        if detener:
+            return
+
+
+def _precision_alcanzada(estadisticas: Dict[str, Dict[str, EstadisticaIncremental]],
+                         metrica: str, precision: Optional[float], min_replicas: int) -> bool:
+    if precision is None or not estadisticas:
+        return False
+    for acumuladas in estadisticas.values():
+        est = acumuladas.get(metrica)
+        if est is None or est.n < max(min_replicas, 2):
+            return False
+        if est.semiancho_95() > precision * abs(est.media):
+            return False
+    return True
+
+
+def resumen_montecarlo(generador: GeneradorCarga, replicas: int, **opciones) -> Dict:
+    """Consume ``ejecutar_montecarlo`` y devuelve el último resumen y las réplicas usadas"""
+    ultimo = None
+    for ultimo in ejecutar_montecarlo(generador, replicas, **opciones):
+        pass
+    if ultimo is None:
+        return {'replicas': 0, 'resumen': {}}
+    return {'replicas': ultimo['replica'] + 1, 'resumen': ultimo['resumen']}
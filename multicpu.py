@@ -0,0 +1,486 @@
+import heapq
+import math
+import time
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from entrada_salida import DispositivosES, metricas_es, preparar_rafagas, siguiente_rafaga
+from eventos import Evento, TipoEvento
+from metricas import metricas_cambio_contexto
+from procesos import Proceso
+from segmentos import RegistroSegmentos
+
+
+def ejecutar_multi_cpu(algoritmo, procesos: List[Proceso], estado: Optional[Dict] = None,
+                       hasta: Optional[int] = None) -> Iterator[Evento]:
+    """Motor por eventos discretos para ``algoritmo.num_cpus`` CPUs y procesos con E/S.
+
+    El reloj salta al mínimo entre la siguiente llegada, el tope de un heap
+    con el instante en que cada CPU ocupada queda libre (fin de ráfaga o de
+    quantum) y el próximo fin de E/S; las entradas invalidadas por un
+    desalojo se descartan de forma perezosa mediante un número de versión
+    por CPU.
+
+    Un proceso con ``rafagas`` pasa de listo a ejecución y, al agotar cada
+    ráfaga de CPU salvo la última, a bloqueado en la cola de su dispositivo
+    (``DispositivosES``); al terminar la E/S vuelve a la cola de listos.
+
+    La política la define el algoritmo con sus ganchos ``_clave_multi``
+    (orden en la cola de listos; a igual clave gana el que llegó antes),
+    ``_porcion_multi`` (quantum),
+    ``_es_apropiativo`` y ``_clave_en_ejecucion`` (comparación para
+    desalojar). Si la comparación cambia con el reloj (envejecimiento),
+    ``_instante_desalojo`` da el instante en que el mejor listo superará al
+    proceso en ejecución y el motor agenda ahí una nueva evaluación. Una
+    política con estado propio lo reinicia en ``_reiniciar_multi``, recibe
+    lo ejecutado en cada tramo con ``_consumo_multi`` y el agotamiento de
+    la porción con ``_porcion_agotada_multi``, y puede tener un
+    evento periódico (``_proximo_evento_multi``/``_evento_multi``, el boost
+    de MLFQ): mientras haya CPUs ocupadas el motor despierta en ese
+    instante, corta los tramos en curso, aplica el evento, reordena las
+    colas con las claves nuevas y reprograma el fin de cada CPU ocupada.
+
+    Con ``colas_por_cpu=False`` hay una cola global y una llegada puede
+    desalojar al peor proceso en ejecución de cualquier CPU;
+    con ``colas_por_cpu=True`` cada CPU tiene su cola, las llegadas van a la
+    CPU menos cargada, los desalojados vuelven a la cola de su CPU y una CPU
+    que se queda sin trabajo roba el mejor proceso de la cola más larga.
+
+    Con ``costo_cambio``/``costo_migracion`` del algoritmo, cada despacho de
+    un proceso distinto al último que ejecutó la CPU la ocupa primero
+    ``costo_cambio`` unidades (más ``costo_migracion`` si el proceso viene de
+    otra CPU) sin avanzar al proceso; el cambio no se interrumpe y al
+    terminar se vuelve a evaluar el desalojo. El evento de despacho queda en
+    el instante de la decisión y el segmento de ejecución empieza al
+    terminar el cambio; el tiempo de respuesta se mide hasta el inicio del
+    primer segmento no vacío, porque un proceso puede ser desalojado justo
+    al terminar su cambio sin haber ejecutado. Si la comparación con los
+    listos cambia con el reloj (``_instante_desalojo``, p. ej. por
+    envejecimiento), el proceso ejecuta al menos una unidad antes de ser
+    desalojado: si no, los listos que envejecen durante cada cambio podrían
+    superarse unos a otros al terminarlo sin que ninguno avance.
+
+    Todo el estado del motor vive en el diccionario ``estado`` (vacío = desde
+    t=0). Con ``hasta`` la ejecución se pausa en el primer punto entre
+    iteraciones con reloj >= ``hasta``, dejando en ``estado`` lo necesario
+    para retomarla llamando de nuevo con el mismo diccionario; al terminar
+    marca ``estado['terminado']``.
+
+    Al terminar deja en el algoritmo ``tiempo_actual``, ``segmentos``
+    (combinados), ``segmentos_por_cpu``, ``metricas`` y ``metricas_por_cpu``.
+    """
+    num_cpus = algoritmo.num_cpus
+    por_cpu = algoritmo.colas_por_cpu
+    apropiativo = algoritmo._es_apropiativo()
+    clave_listo = algoritmo._clave_multi
+    porcion_de = algoritmo._porcion_multi
+    clave_en_ejecucion = algoritmo._clave_en_ejecucion
+    instante_desalojo = algoritmo._instante_desalojo
+    consumir = algoritmo._consumo_multi
+    porcion_agotada = algoritmo._porcion_agotada_multi
+    con_eventos = algoritmo._proximo_evento_multi() is not None
+
+    if estado is None:
+        estado = {}
+    if not estado:
+        estado.update(
+            hay_es=preparar_rafagas(procesos),
+            dispositivos=DispositivosES(),
+            procesos_por_llegada=sorted(procesos, key=lambda x: x.instante_llegada),
+            indice_proximo=0, completados=0, tiempo=0, pendientes=0, secuencia=0,
+            # Colas de listos: entradas (clave, orden de llegada, proceso); la clave de las
+            # políticas FIFO es el número de ingreso a la cola
+            colas=[[] for _ in range(num_cpus if por_cpu else 1)],
+            carga=[0] * num_cpus,  # en cola + en ejecución, solo para colas por CPU
+            ejecutando=[None] * num_cpus,
+            inicio=[0] * num_cpus,
+            version=[0] * num_cpus,
+            libres=list(range(num_cpus)),
+            proximos_fines=[],   # (instante en que la CPU queda libre, cpu, versión)
+            en_ejecucion=[],     # (-clave de ejecución referida a t=0, cpu, versión), cola global apropiativa
+            segmentos=[RegistroSegmentos() for _ in range(num_cpus)],
+            despachos=[0] * num_cpus,
+            finalizados=[0] * num_cpus,
+            migraciones=[0] * num_cpus,
+            despacho_en=[0] * num_cpus,   # instante de la decisión; inicio = fin del cambio de contexto
+            ultimo_pid=[None] * num_cpus,  # último proceso cargado en cada CPU
+            cambios=[0] * num_cpus,
+            tiempo_cambio=[0] * num_cpus,
+            fines_cambio=[],               # (fin del cambio de contexto, cpu), solo con apropiación
+            revisiones=[],                 # (instante de reevaluar el desalojo, cpu), por envejecimiento
+            ultima_cpu={},
+            orden_llegada={},
+            terminado=False,
+        )
+        estado['en_cola'] = [0] * len(estado['colas'])
+        algoritmo._reiniciar_multi()
+
+    # Los contenedores se modifican en el lugar; los escalares se devuelven a ``estado`` al pausar
+    hay_es = estado['hay_es']
+    dispositivos = estado['dispositivos']
+    procesos_por_llegada = estado['procesos_por_llegada']
+    total = len(procesos_por_llegada)
+    indice_proximo = estado['indice_proximo']
+    completados = estado['completados']
+    tiempo = estado['tiempo']
+
+    colas = estado['colas']
+    cola_de = list(range(num_cpus)) if por_cpu else [0] * num_cpus
+    en_cola = estado['en_cola']
+    pendientes = estado['pendientes']
+    carga = estado['carga']
+    secuencia = estado['secuencia']
+
+    ejecutando = estado['ejecutando']
+    inicio = estado['inicio']
+    version = estado['version']
+    libres = estado['libres']
+    proximos_fines = estado['proximos_fines']
+    en_ejecucion = estado['en_ejecucion']
+
+    segmentos = estado['segmentos']
+    despachos = estado['despachos']
+    finalizados = estado['finalizados']
+    migraciones = estado['migraciones']
+    despacho_en = estado['despacho_en']
+    ultimo_pid = estado['ultimo_pid']
+    cambios = estado['cambios']
+    tiempo_cambio = estado['tiempo_cambio']
+    fines_cambio = estado['fines_cambio']
+    revisiones = estado['revisiones']
+    costo_cambio = algoritmo.costo_cambio
+    costo_migracion = algoritmo.costo_migracion
+    ultima_cpu = estado['ultima_cpu']
+    orden_llegada = estado['orden_llegada']
+    inst = algoritmo.instrumentacion
+
+    def encolar(p: Proceso, cola: int):
+        nonlocal secuencia, pendientes
+        heapq.heappush(colas[cola], (clave_listo(p, tiempo, secuencia), orden_llegada[p.pid], p))
+        secuencia += 1
+        en_cola[cola] += 1
+        pendientes += 1
+        if por_cpu:
+            carga[cola] += 1
+
+    def despachar(cpu: int, p: Proceso) -> Evento:
+        ejecutando[cpu] = p
+        despacho_en[cpu] = tiempo
+        costo = 0
+        if p.ejecutado and ultima_cpu[p.pid] != cpu:
+            migraciones[cpu] += 1
+            costo = costo_migracion
+        if ultimo_pid[cpu] != p.pid:
+            cambios[cpu] += 1
+            costo += costo_cambio
+        ultimo_pid[cpu] = p.pid
+        if costo:
+            tiempo_cambio[cpu] += costo
+            if apropiativo:
+                heapq.heappush(fines_cambio, (tiempo + costo, cpu))
+        inicio[cpu] = tiempo + costo
+        if not p.ejecutado:
+            # La respuesta se fija en el primer tramo no vacío (ver ``liberar``): al
+            # terminar el cambio de contexto el proceso todavía puede ser desalojado
+            p.tiempo_respuesta = None
+            p.ejecutado = True
+        ultima_cpu[p.pid] = cpu
+        despachos[cpu] += 1
+        programar_fin(cpu)
+        return Evento(TipoEvento.DESPACHO, tiempo, p.pid, p.tiempo_restante)
+
+    def programar_fin(cpu: int):
+        """Agenda el fin de ráfaga o de porción del proceso que ocupa la CPU desde ``inicio``"""
+        p = ejecutando[cpu]
+        duracion = p.tiempo_restante
+        porcion = porcion_de(p)
+        if porcion is not None and porcion < duracion:
+            duracion = porcion
+        heapq.heappush(proximos_fines, (inicio[cpu] + duracion, cpu, version[cpu]))
+        if apropiativo and not por_cpu:
+            heapq.heappush(en_ejecucion, (-clave_en_ejecucion(p, inicio[cpu], 0), cpu, version[cpu]))
+
+    def llenar_libres(tocadas: set) -> Iterator[Evento]:
+        """Despacha en cada CPU libre de su propia cola o, si está vacía, de la cola más larga"""
+        nonlocal pendientes
+        while libres and pendientes:
+            if inst is not None:
+                marca = time.perf_counter()
+            cpu = heapq.heappop(libres)
+            cola = cola_de[cpu]
+            if not en_cola[cola]:
+                cola = en_cola.index(max(en_cola))
+            p = heapq.heappop(colas[cola])[2]
+            en_cola[cola] -= 1
+            pendientes -= 1
+            if por_cpu:
+                carga[cola] -= 1
+                carga[cpu] += 1
+                tocadas.update((cpu, cola))
+            evento = despachar(cpu, p)
+            if inst is not None:
+                inst.sumar_seleccion(0, 1, time.perf_counter() - marca)
+            yield evento
+
+    def intocable(cpu: int, cabeza) -> bool:
+        """Recién despachado en este instante, todavía en su cambio de contexto o, si la
+        comparación con la ``cabeza`` de la cola cambia con el reloj, sin haber ejecutado"""
+        if despacho_en[cpu] == tiempo or inicio[cpu] > tiempo:
+            return True
+        return (inicio[cpu] == tiempo
+                and instante_desalojo(cabeza, ejecutando[cpu], inicio[cpu], tiempo) is not None)
+
+    def programar_revision(cpu: int, clave):
+        """Agenda el instante en que un listo con ``clave`` pasará a desalojar a la CPU"""
+        instante = instante_desalojo(clave, ejecutando[cpu], inicio[cpu], tiempo)
+        if instante is not None:
+            heapq.heappush(revisiones, (max(instante, tiempo + 1, inicio[cpu] + 1), cpu))
+
+    def cortar(cpu: int) -> Proceso:
+        """Cierra el tramo en curso de la CPU sin liberarla y devuelve el proceso que la ocupa"""
+        p = ejecutando[cpu]
+        segmentos[cpu].agregar(p.pid, inicio[cpu], tiempo)
+        if p.tiempo_respuesta is None and tiempo > inicio[cpu]:
+            p.tiempo_respuesta = inicio[cpu] - p.instante_llegada
+        p.tiempo_restante -= tiempo - inicio[cpu]
+        consumir(p, tiempo - inicio[cpu])
+        return p
+
+    def liberar(cpu: int) -> Proceso:
+        """Cierra el tramo en curso de la CPU y devuelve el proceso que la ocupaba"""
+        p = cortar(cpu)
+        ejecutando[cpu] = None
+        version[cpu] += 1
+        if por_cpu:
+            carga[cpu] -= 1
+        return p
+
+    while completados < total:
+
+        if hasta is not None and tiempo >= hasta:
+            estado.update(tiempo=tiempo, indice_proximo=indice_proximo, completados=completados,
+                          pendientes=pendientes, secuencia=secuencia)
+            algoritmo.tiempo_actual = tiempo
+            return
+
+        # Descartar finales invalidados por desalojos
+        while proximos_fines and proximos_fines[0][2] != version[proximos_fines[0][1]]:
+            heapq.heappop(proximos_fines)
+
+        proximo = proximos_fines[0][0] if proximos_fines else math.inf
+        if indice_proximo < total:
+            proximo = min(proximo, procesos_por_llegada[indice_proximo].instante_llegada)
+        if hay_es:
+            fin_es = dispositivos.proximo_fin()
+            if fin_es is not None:
+                proximo = min(proximo, fin_es)
+        if fines_cambio:
+            proximo = min(proximo, fines_cambio[0][0])
+        if revisiones:
+            proximo = min(proximo, revisiones[0][0])
+        if con_eventos and proximos_fines:
+            proximo = min(proximo, algoritmo._proximo_evento_multi())
+        if not proximos_fines and not pendientes and proximo > tiempo:
+            yield Evento(TipoEvento.CPU_OCIOSA, tiempo, 0, proximo)
+        tiempo = proximo
+
+        # Las CPUs que terminan su cambio de contexto ya pueden ser desalojadas
+        tocadas = set()
+        while fines_cambio and fines_cambio[0][0] <= tiempo:
+            tocadas.add(heapq.heappop(fines_cambio)[1])
+        while revisiones and revisiones[0][0] <= tiempo:
+            tocadas.add(heapq.heappop(revisiones)[1])
+
+        # Fin de ráfaga o de quantum en las CPUs que se liberan ahora
+        reencolar = []
+        vacios = []
+        while proximos_fines and proximos_fines[0][0] <= tiempo:
+            _, cpu, v = heapq.heappop(proximos_fines)
+            if v != version[cpu]:
+                continue
+            # Tramo vacío: la porción se agotó antes de ejecutar; como en el motor de una CPU,
+            # vence después de las llegadas, los desalojos y el evento periódico del instante
+            if inicio[cpu] == tiempo:
+                vacios.append((cpu, v))
+                continue
+            p = liberar(cpu)
+            heapq.heappush(libres, cpu)
+            if p.tiempo_restante == 0:
+                if hay_es and siguiente_rafaga(p, dispositivos, tiempo):
+                    yield Evento(TipoEvento.BLOQUEO, tiempo, p.pid, p.rafagas[p.indice_rafaga - 1])
+                    continue
+                p.tiempo_finalizacion = tiempo
+                p.tiempo_espera = tiempo - p.instante_llegada - p.tiempo_cpu - p.tiempo_bloqueado
+                completados += 1
+                finalizados[cpu] += 1
+                # Solo se guarda estado de los procesos vivos (instantáneas más chicas)
+                del ultima_cpu[p.pid], orden_llegada[p.pid]
+                yield Evento(TipoEvento.FINALIZACION, tiempo, p.pid, p.tiempo_espera)
+            else:
+                porcion_agotada(p)
+                yield Evento(TipoEvento.DESALOJO, tiempo, p.pid, p.tiempo_restante)
+                reencolar.append((p, cpu))
+
+        # Evento periódico de la política; si las CPUs estaban ociosas se aplica al despertar
+        if con_eventos and algoritmo._proximo_evento_multi() <= tiempo:
+            ocupadas = [cpu for cpu in range(num_cpus) if ejecutando[cpu] is not None]
+            for cpu in ocupadas:
+                if inicio[cpu] < tiempo:
+                    cortar(cpu)
+                    inicio[cpu] = tiempo
+            algoritmo._evento_multi(tiempo)
+            # Las colas ya ordenadas se vuelven a numerar en su orden actual con las claves nuevas
+            for cola in colas:
+                entradas = sorted(cola, key=lambda entrada: entrada[:2])
+                cola[:] = [(clave_listo(p, tiempo, secuencia + i), orden, p)
+                           for i, (_, orden, p) in enumerate(entradas)]
+                secuencia += len(entradas)
+            for cpu in ocupadas:
+                version[cpu] += 1
+                programar_fin(cpu)
+
+        # Llegadas hasta el instante actual; como en una sola CPU entran antes que los desalojados
+        while (indice_proximo < total and
+               procesos_por_llegada[indice_proximo].instante_llegada <= tiempo):
+            p = procesos_por_llegada[indice_proximo]
+            if inst is not None:
+                marca = time.perf_counter()
+            orden_llegada[p.pid] = indice_proximo
+            cola = carga.index(min(carga)) if por_cpu else 0
+            encolar(p, cola)
+            tocadas.add(cola)
+            if inst is not None:
+                inst.sumar_llegadas(1, time.perf_counter() - marca)
+            yield Evento(TipoEvento.LLEGADA, tiempo, p.pid, p.tiempo_cpu)
+            indice_proximo += 1
+
+        # Fin de E/S: el proceso vuelve a la cola de la última CPU que lo ejecutó
+        if hay_es:
+            for p in dispositivos.completar_hasta(tiempo):
+                if inst is not None:
+                    marca = time.perf_counter()
+                cola = cola_de[ultima_cpu[p.pid]]
+                encolar(p, cola)
+                tocadas.add(cola)
+                if inst is not None:
+                    inst.sumar_llegadas(1, time.perf_counter() - marca)
+                yield Evento(TipoEvento.DESBLOQUEO, tiempo, p.pid, p.tiempo_restante)
+
+        if reencolar:
+            if inst is not None:
+                marca = time.perf_counter()
+            for p, cpu in reencolar:
+                encolar(p, cola_de[cpu])
+            if inst is not None:
+                inst.sumar_seleccion(len(reencolar), 0, time.perf_counter() - marca)
+
+        if libres and pendientes:
+            yield from llenar_libres(tocadas)
+
+        # Desalojos: un listo estrictamente mejor reemplaza a un proceso en ejecución
+        if apropiativo and por_cpu:
+            for cpu in tocadas:
+                if ejecutando[cpu] is None or not colas[cpu]:
+                    continue
+                if (not intocable(cpu, colas[cpu][0][0])
+                        and colas[cpu][0][0] < clave_en_ejecucion(ejecutando[cpu], inicio[cpu], tiempo)):
+                    p = liberar(cpu)
+                    yield Evento(TipoEvento.DESALOJO, tiempo, p.pid, p.tiempo_restante)
+                    if inst is not None:
+                        marca = time.perf_counter()
+                    encolar(p, cpu)
+                    siguiente = heapq.heappop(colas[cpu])[2]
+                    en_cola[cpu] -= 1
+                    pendientes -= 1
+                    evento = despachar(cpu, siguiente)
+                    if inst is not None:
+                        inst.sumar_seleccion(1, 1, time.perf_counter() - marca)
+                    yield evento
+                if colas[cpu]:
+                    programar_revision(cpu, colas[cpu][0][0])
+        elif apropiativo:
+            cola = colas[0]
+            recien_despachados = []
+            while cola and en_ejecucion:
+                _, cpu, v = en_ejecucion[0]
+                if v != version[cpu]:
+                    heapq.heappop(en_ejecucion)
+                    continue
+                # Un proceso recién despachado no se desaloja en el mismo instante ni durante su cambio
+                # (con envejecimiento, tampoco antes de ejecutar una unidad)
+                if intocable(cpu, cola[0][0]):
+                    recien_despachados.append(heapq.heappop(en_ejecucion))
+                    continue
+                if not cola[0][0] < clave_en_ejecucion(ejecutando[cpu], inicio[cpu], tiempo):
+                    break
+                heapq.heappop(en_ejecucion)
+                p = liberar(cpu)
+                yield Evento(TipoEvento.DESALOJO, tiempo, p.pid, p.tiempo_restante)
+                if inst is not None:
+                    marca = time.perf_counter()
+                encolar(p, 0)
+                siguiente = heapq.heappop(cola)[2]
+                en_cola[0] -= 1
+                pendientes -= 1
+                evento = despachar(cpu, siguiente)
+                if inst is not None:
+                    inst.sumar_seleccion(1, 1, time.perf_counter() - marca)
+                yield evento
+            # El peor proceso en ejecución que se puede desalojar es el primero en ser superado
+            if cola:
+                for _, cpu, _ in recien_despachados + en_ejecucion[:1]:
+                    programar_revision(cpu, cola[0][0])
+            for entrada in recien_despachados:
+                heapq.heappush(en_ejecucion, entrada)
+
+        # Tramos vacíos que siguen en su CPU: vence la porción y la CPU vuelve a llenarse
+        for cpu, v in vacios:
+            if v != version[cpu]:
+                continue
+            p = liberar(cpu)
+            heapq.heappush(libres, cpu)
+            porcion_agotada(p)
+            yield Evento(TipoEvento.DESALOJO, tiempo, p.pid, p.tiempo_restante)
+            if inst is not None:
+                marca = time.perf_counter()
+            encolar(p, cola_de[cpu])
+            if inst is not None:
+                inst.sumar_seleccion(1, 0, time.perf_counter() - marca)
+        if vacios:
+            yield from llenar_libres(tocadas)
+
+    estado.update(tiempo=tiempo, indice_proximo=indice_proximo, completados=completados,
+                  pendientes=pendientes, secuencia=secuencia, terminado=True)
+    algoritmo.tiempo_actual = tiempo
+    algoritmo.segmentos_por_cpu = segmentos
+    algoritmo.segmentos = _combinar_segmentos(segmentos)
+    algoritmo.metricas = algoritmo.calcular_metricas(procesos)
+    if algoritmo.metricas:
+        algoritmo.metricas['migraciones'] = sum(migraciones)
+        algoritmo.metricas.update(metricas_es(procesos, dispositivos, tiempo))
+        if algoritmo._con_costo_cambio():
+            algoritmo.metricas.update(metricas_cambio_contexto(
+                algoritmo.metricas, sum(cambios), sum(tiempo_cambio), tiempo, num_cpus))
+    algoritmo.metricas_por_cpu = [
+        {
+            'cpu': cpu,
+            'tiempo_ocupado': segmentos[cpu].tiempo_ocupado(),
+            'uso_cpu': segmentos[cpu].tiempo_ocupado() / tiempo if tiempo > 0 else 0,
+            'despachos': despachos[cpu],
+            'finalizados': finalizados[cpu],
+            'migraciones': migraciones[cpu],
+            'cambios_contexto': cambios[cpu],
+            'tiempo_cambio_contexto': tiempo_cambio[cpu],
+        }
+        for cpu in range(num_cpus)
+    ]
+
+
+def _combinar_segmentos(segmentos: List[RegistroSegmentos]) -> RegistroSegmentos:
+    """Une los registros de cada CPU en uno solo ordenado por instante de inicio"""
+    columnas = [registro.columnas() for registro in segmentos if len(registro)]
+    if not columnas:
+        return RegistroSegmentos()
+    pids, inicios, fines = (np.concatenate(partes) for partes in zip(*columnas))
+    return RegistroSegmentos.desde_arrays(pids, inicios, fines)
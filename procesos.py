@@ -2,29 +2,48 @@
 class Proceso:
     _ultimo_pid = 0 
 
-    def __init__(self, nombre, tiempo_cpu, instante_llegada, quantum=None):
+    def __init__(self, nombre, tiempo_cpu, instante_llegada, quantum=None, prioridad=0, pid=None,
+                 rafagas=None, dispositivos=None):
    
-        Proceso._ultimo_pid += 1
-        self.pid = Proceso._ultimo_pid
+        # Un PID explícito (copias de un proceso existente) no consume el contador global
+        if pid is None:
+            Proceso._ultimo_pid += 1
+            pid = Proceso._ultimo_pid
+        self.pid = pid
         
 
         self.nombre = nombre
         self.tiempo_cpu = tiempo_cpu
         self.instante_llegada = instante_llegada
         self.quantum = quantum
+        self.prioridad = prioridad
+        # Ráfagas alternadas [CPU, E/S, CPU, ..., CPU] y dispositivo de cada E/S (None = solo CPU)
+        self.rafagas = list(rafagas) if rafagas else None
+        self.dispositivos = list(dispositivos) if dispositivos else None
 
         self.tiempo_restante = tiempo_cpu
         self.tiempo_finalizacion = None
         self.tiempo_espera = 0
         self.tiempo_respuesta = None
         self.ejecutado = False
+        self.indice_rafaga = 0
+        self.tiempo_bloqueado = 0
+        self.inicio_bloqueo = 0
 
     def __repr__(self):
             return (f"Proceso(pid={self.pid}, nombre='{self.nombre}', "
             f"tiempo_cpu={self.tiempo_cpu}, llegada={self.instante_llegada}, "
-            f"quantum={self.quantum})")
+            f"quantum={self.quantum}, prioridad={self.prioridad})")
 
-def crear_proceso(nombre, tiempo_cpu, instante_llegada, quantum=None):
+def crear_proceso(nombre, tiempo_cpu, instante_llegada, quantum=None, prioridad=0,
+                  rafagas=None, dispositivos=None):
+    validar_proceso(nombre, tiempo_cpu, instante_llegada, quantum, prioridad, rafagas, dispositivos)
+    return Proceso(nombre, tiempo_cpu, instante_llegada, quantum, prioridad,
+                   rafagas=rafagas, dispositivos=dispositivos)
+
+def validar_proceso(nombre, tiempo_cpu, instante_llegada, quantum=None, prioridad=0,
+                    rafagas=None, dispositivos=None):
+    """Reglas de ``crear_proceso``; lanza ValueError sin crear el proceso"""
     if not nombre or not isinstance(nombre, str):
         raise ValueError("El nombre del proceso no puede estar vacío.")
     if not isinstance(tiempo_cpu, int) or tiempo_cpu <= 0:
@@ -33,5 +52,17 @@ def crear_proceso(nombre, tiempo_cpu, instante_llegada, quantum=None):
         raise ValueError("El instante de llegada debe ser un entero mayor o igual a 0.")
     if quantum is not None and (not isinstance(quantum, int) or quantum <= 0):
         raise ValueError("El quantum debe ser un entero positivo (si aplica).")
-    
-    return Proceso(nombre, tiempo_cpu, instante_llegada, quantum)
+    if not isinstance(prioridad, int) or prioridad < 0:
+        raise ValueError("La prioridad debe ser un entero mayor o igual a 0.")
+    if rafagas is not None:
+        if (not rafagas or len(rafagas) % 2 == 0
+                or any(not isinstance(r, int) or r <= 0 for r in rafagas)):
+            raise ValueError("Las ráfagas deben ser enteros positivos que alternen CPU y E/S, "
+                             "empezando y terminando en CPU.")
+        if sum(rafagas[::2]) != tiempo_cpu:
+            raise ValueError("El tiempo de CPU debe ser la suma de las ráfagas de CPU.")
+    if dispositivos is not None:
+        if rafagas is None or len(dispositivos) != len(rafagas) // 2:
+            raise ValueError("Debe indicarse un dispositivo por cada ráfaga de E/S.")
+        if any(not isinstance(d, int) or d < 0 for d in dispositivos):
+            raise ValueError("Los dispositivos deben ser enteros mayores o iguales a 0.")
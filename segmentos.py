@@ -0,0 +1,73 @@
+from array import array
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+
+class RegistroSegmentos:
+    """Registro de intervalos de ejecución (diagrama de Gantt) codificado por tramos.
+
+    Cada segmento ``(pid, inicio, fin)`` indica que el proceso ocupó la CPU
+    en ``[inicio, fin)``. Si el proceso que se agrega es el mismo que cerró
+    el último segmento y no hay hueco entre ambos, el segmento se extiende
+    en lugar de crear uno nuevo, así que el número de registros es el número
+    de cambios de contexto y no el número de unidades de tiempo simuladas.
+    """
+
+    __slots__ = ("_pids", "_inicios", "_fines")
+
+    def __init__(self):
+        self._pids = array("q")
+        self._inicios = array("q")
+        self._fines = array("q")
+
+    @classmethod
+    def desde_arrays(cls, pids, inicios, fines) -> "RegistroSegmentos":
+        """Construye el registro a partir de columnas, ordenando por instante de inicio"""
+        inicios = np.asarray(inicios, dtype=np.int64)
+        orden = np.argsort(inicios, kind="stable")
+        registro = cls()
+        registro._pids.frombytes(np.asarray(pids, dtype=np.int64)[orden].tobytes())
+        registro._inicios.frombytes(inicios[orden].tobytes())
+        registro._fines.frombytes(np.asarray(fines, dtype=np.int64)[orden].tobytes())
+        return registro
+
+    def agregar(self, pid: int, inicio: int, fin: int):
+        """Registra que ``pid`` ejecutó en ``[inicio, fin)``; ignora intervalos vacíos"""
+        if fin <= inicio:
+            return
+        if self._pids and self._pids[-1] == pid and self._fines[-1] == inicio:
+            self._fines[-1] = fin
+            return
+        self._pids.append(pid)
+        self._inicios.append(inicio)
+        self._fines.append(fin)
+
+    def __len__(self):
+        return len(self._pids)
+
+    def __getitem__(self, indice: int) -> Tuple[int, int, int]:
+        return self._pids[indice], self._inicios[indice], self._fines[indice]
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int]]:
+        return zip(self._pids, self._inicios, self._fines)
+
+    def columnas(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vistas NumPy (sin copia) de las columnas pid, inicio y fin"""
+        return (np.frombuffer(self._pids, dtype=np.int64),
+                np.frombuffer(self._inicios, dtype=np.int64),
+                np.frombuffer(self._fines, dtype=np.int64))
+
+    def tiempo_ocupado(self) -> int:
+        _, inicios, fines = self.columnas()
+        return int((fines - inicios).sum())
+
+    def lineas_gantt(self, nombres: Optional[Dict[int, str]] = None) -> Iterator[str]:
+        """Genera una línea de texto por segmento para mostrar o exportar"""
+        for pid, inicio, fin in self:
+            nombre = nombres.get(pid, f"P{pid}") if nombres else f"P{pid}"
+            yield f"[{inicio:>5} - {fin:>5}) {nombre} ({fin - inicio}u)"
+
+    def memoria_bytes(self) -> int:
+        return sum(columna.itemsize * len(columna)
+                   for columna in (self._pids, self._inicios, self._fines))
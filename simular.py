@@ -0,0 +1,275 @@
+"""Ejecución por línea de comandos, sin interfaz gráfica.
+
+Ejemplos::
+
+    python -m simular carga.csv --algoritmo SRTF
+    python -m simular carga.json --comparar --formato csv --salida metricas.csv
+    python -m simular carga.csv --algoritmo "Round Robin" --quantum 3 --modo traza
+    python -m simular --generar 100000 --semilla 7 --comparar --cpus 4
+    python -m simular traza.jsonl --algoritmo SRTF --traza-binaria corrida.trz --comprimir
+
+La carga es un CSV con encabezado, un JSONL (un objeto por línea) o un JSON
+con una lista de objetos, con las mismas columnas que la tabla de la
+interfaz: Nombre, CPU, Llegada y, opcionales, Quantum, Prioridad, Rafagas y
+Dispositivos (en CSV, las listas van separadas por ``;``). Solo usa los
+módulos del motor: nunca importa Tkinter.
+"""
+import argparse
+import csv
+import json
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from algoritmos import (FabricaAlgoritmos, _ejecutar_configuracion_lote, _ejecutar_en_pool,
+                        _etiqueta_configuracion, analizar_comparativo)
+from cache_resultados import CacheResultados
+from eventos import TipoEvento
+from importacion import ImportadorCargas
+from lotes import ProcesoBatch
+from procesos import Proceso
+
+# Opciones de la línea de comandos que acepta cada algoritmo (además de las de CPU)
+_PARAMETROS_POR_ALGORITMO = {
+    "Round Robin": ("quantum",),
+    "Prioridades": ("apropiativo", "envejecimiento"),
+    "MLFQ": ("niveles", "quantums", "periodo_boost"),
+}
+_PARAMETROS_CPU = ("num_cpus", "colas_por_cpu")
+_PARAMETROS_COMUNES = ("costo_cambio", "costo_migracion")
+
+
+def cargar_procesos(ruta: str, omitir_invalidas: bool = False) -> List[Proceso]:
+    """Lee una carga CSV, JSONL o JSON y valida cada fila con las reglas de ``crear_proceso``.
+
+    Una fila inválida lanza ValueError; con ``omitir_invalidas`` se descarta
+    y se informa en la salida de errores.
+    """
+    importador = ImportadorCargas(ruta, estricto=not omitir_invalidas,
+                                  al_error=lambda fila: print(f"aviso: {fila}", file=sys.stderr))
+    procesos = list(importador.procesos())
+    if importador.filas_invalidas:
+        print(f"aviso: se omitieron {importador.filas_invalidas} de {importador.filas_leidas} "
+              f"filas de {ruta}", file=sys.stderr)
+    return procesos
+
+
+def construir_configuraciones(algoritmos: List[str], opciones: Dict) -> List[Tuple[str, Dict]]:
+    """Pares (algoritmo, parámetros) con solo las opciones que aplican a cada algoritmo"""
+    configuraciones = []
+    for nombre in algoritmos:
+        if nombre not in FabricaAlgoritmos.obtener_algoritmos_disponibles():
+            raise ValueError(f"Algoritmo '{nombre}' no soportado")
+        aplicables = _PARAMETROS_POR_ALGORITMO.get(nombre, ()) + _PARAMETROS_CPU + _PARAMETROS_COMUNES
+        configuraciones.append((nombre, {clave: opciones[clave] for clave in aplicables
+                                         if opciones.get(clave) is not None}))
+    return configuraciones
+
+
+def ejecutar(procesos: List[Proceso], configuraciones: List[Tuple[str, Dict]], traza: bool = False,
+             paralelo: bool = False, cache: Optional[CacheResultados] = None,
+             instrumentar: bool = False) -> Dict[str, Dict]:
+    """Ejecuta cada configuración y devuelve sus resultados en un formato serializable.
+
+    Sin ``traza`` (y sin caché ni instrumentación) se usa el camino columnar
+    ``ejecutar_lote``, que no genera eventos; con ``traza`` se incluyen
+    eventos y segmentos y con ``instrumentar``, los contadores del motor. En
+    ambos caminos ``paralelo`` reparte las configuraciones en un pool de
+    procesos.
+    """
+    nombres = {p.pid: p.nombre for p in procesos}
+    if not traza and cache is None and not instrumentar:
+        lote = ProcesoBatch.desde_procesos(procesos)
+        calculados = None
+        if paralelo and len(configuraciones) > 1:
+            calculados = _ejecutar_en_pool(_ejecutar_configuracion_lote,
+                                           [(nombre, parametros) for nombre, parametros in configuraciones],
+                                           lote)
+        if calculados is None:
+            calculados = [_ejecutar_configuracion_lote(nombre, parametros, lote)
+                          for nombre, parametros in configuraciones]
+        return {_etiqueta_configuracion(nombre, parametros): resultado
+                for (nombre, parametros), resultado in zip(configuraciones, calculados)}
+
+    resultados = {}
+    for etiqueta, resultado in analizar_comparativo(procesos, paralelo=paralelo,
+                                                    configuraciones=configuraciones,
+                                                    cache=cache, instrumentar=instrumentar).items():
+        if 'error' in resultado:
+            raise ValueError(f"{etiqueta}: {resultado['error']}")
+        salida = {
+            'metricas': resultado['metricas'],
+            'metricas_por_cpu': resultado.get('metricas_por_cpu', []),
+            'tiempo_total': resultado.get('tiempo_total', 0),
+        }
+        if instrumentar:
+            salida['instrumentacion'] = resultado['instrumentacion']
+        if traza:
+            salida['eventos'] = [
+                {'tiempo': e.tiempo, 'evento': TipoEvento(e.tipo).name, 'pid': e.pid,
+                 'proceso': nombres.get(e.pid, ""), 'dato': e.dato}
+                for e in resultado['eventos']]
+            salida['segmentos'] = [
+                {'pid': pid, 'proceso': nombres.get(pid, ""), 'inicio': inicio, 'fin': fin}
+                for pid, inicio, fin in resultado['segmentos']]
+        resultados[etiqueta] = salida
+    return resultados
+
+
+def ejecutar_traza_binaria(procesos: List[Proceso], configuracion: Tuple[str, Dict], ruta: str,
+                           comprimir: bool = False, instrumentar: bool = False) -> Dict[str, Dict]:
+    """Ejecuta una configuración escribiendo su traza binaria (``trazas.py``) a medida que avanza.
+
+    Devuelve las métricas en el mismo formato que ``ejecutar`` sin traza.
+    """
+    nombre, parametros = configuracion
+    algoritmo = FabricaAlgoritmos.crear_algoritmo(nombre, **parametros)
+    if instrumentar:
+        algoritmo.instrumentar()
+    algoritmo.ejecutar_traza(procesos, ruta, comprimir, {'parametros': parametros})
+    resultado = {
+        'metricas': algoritmo.metricas,
+        'metricas_por_cpu': algoritmo.metricas_por_cpu,
+        'tiempo_total': algoritmo.tiempo_actual,
+    }
+    if instrumentar:
+        resultado['instrumentacion'] = algoritmo.instrumentacion.resumen()
+    return {_etiqueta_configuracion(nombre, parametros): resultado}
+
+
+def escribir_json(resultados: Dict[str, Dict], salida):
+    json.dump({'configuraciones': resultados}, salida, ensure_ascii=False, indent=2, default=_a_json)
+    salida.write("\n")
+
+
+def escribir_csv(resultados: Dict[str, Dict], salida, traza: bool = False):
+    """Una fila de métricas por configuración o, con ``traza``, una fila por evento"""
+    escritor = csv.writer(salida, lineterminator="\n")
+    if traza:
+        escritor.writerow(["configuracion", "tiempo", "evento", "pid", "proceso", "dato"])
+        for etiqueta, resultado in resultados.items():
+            for evento in resultado['eventos']:
+                escritor.writerow([etiqueta, evento['tiempo'], evento['evento'], evento['pid'],
+                                   evento['proceso'], evento['dato']])
+        return
+
+    columnas = sorted({clave for resultado in resultados.values() for clave in resultado['metricas']})
+    instrumentadas = sorted({clave for resultado in resultados.values()
+                             for clave in _instrumentacion_plana(resultado)})
+    escritor.writerow(["configuracion", "tiempo_total"] + columnas + instrumentadas)
+    for etiqueta, resultado in resultados.items():
+        plana = _instrumentacion_plana(resultado)
+        escritor.writerow([etiqueta, resultado['tiempo_total']] +
+                          [_a_json(resultado['metricas'].get(clave, "")) for clave in columnas] +
+                          [plana.get(clave, "") for clave in instrumentadas])
+
+
+def _instrumentacion_plana(resultado: Dict) -> Dict:
+    """Contadores y segundos como columnas ``instrumentacion_*`` y ``segundos_*``"""
+    instrumentacion = resultado.get('instrumentacion')
+    if not instrumentacion:
+        return {}
+    plana = {f"instrumentacion_{clave}": valor for clave, valor in instrumentacion.items()
+             if clave != 'tiempos'}
+    plana.update({f"segundos_{clave}": segundos for clave, segundos in instrumentacion['tiempos'].items()})
+    return plana
+
+
+def _a_json(valor):
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, np.ndarray):
+        return valor.tolist()
+    return valor
+
+
+def _crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m simular",
+        description="Simulador de planificación de procesos sin interfaz gráfica.")
+    parser.add_argument("carga", nargs="?", help="Archivo de carga (.csv, .jsonl o .json)")
+    parser.add_argument("--omitir-invalidas", action="store_true",
+                        help="Descartar las filas inválidas de la carga (informándolas) en lugar de fallar")
+    parser.add_argument("--generar", type=int, metavar="N",
+                        help="Usar una carga sintética de N procesos en lugar de un archivo")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla de la carga sintética")
+
+    seleccion = parser.add_mutually_exclusive_group()
+    seleccion.add_argument("--algoritmo", action="append", metavar="NOMBRE",
+                           help="Algoritmo a ejecutar (puede repetirse); por omisión FCFS")
+    seleccion.add_argument("--comparar", action="store_true",
+                           help="Ejecutar todos los algoritmos disponibles")
+
+    parser.add_argument("--quantum", type=int, help="Quantum de Round Robin")
+    parser.add_argument("--no-apropiativo", dest="apropiativo", action="store_false", default=None,
+                        help="Prioridades no apropiativo")
+    parser.add_argument("--envejecimiento", type=float, help="Envejecimiento de Prioridades")
+    parser.add_argument("--niveles", type=int, help="Niveles de MLFQ")
+    parser.add_argument("--quantums", type=int, nargs="+", help="Quantum por nivel de MLFQ")
+    parser.add_argument("--periodo-boost", type=int, help="Periodo de boost de MLFQ")
+    parser.add_argument("--cpus", dest="num_cpus", type=int, help="Número de CPUs")
+    parser.add_argument("--colas-por-cpu", action="store_true", default=None,
+                        help="Una cola de listos por CPU en lugar de una global")
+    parser.add_argument("--costo-cambio", type=int, help="Costo de cada cambio de contexto")
+    parser.add_argument("--costo-migracion", type=int,
+                        help="Costo adicional al despachar un proceso en otra CPU")
+
+    parser.add_argument("--modo", choices=("metricas", "traza"), default="metricas",
+                        help="Solo métricas o traza completa (eventos y segmentos)")
+    parser.add_argument("--formato", choices=("json", "csv"), default="json")
+    parser.add_argument("--salida", help="Archivo de salida (por omisión, la salida estándar)")
+    parser.add_argument("--paralelo", action="store_true",
+                        help="Ejecutar las configuraciones en un pool de procesos")
+    parser.add_argument("--cache", metavar="DIRECTORIO",
+                        help="Directorio de la caché de resultados en disco")
+    parser.add_argument("--instrumentar", action="store_true",
+                        help="Incluir contadores del motor y tiempos medidos (total, métricas y por fase)")
+    parser.add_argument("--traza-binaria", metavar="ARCHIVO",
+                        help="Escribir eventos, segmentos y procesos en una traza binaria (un solo algoritmo)")
+    parser.add_argument("--comprimir", action="store_true",
+                        help="Comprimir con zlib los bloques de la traza binaria")
+    return parser
+
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    parser = _crear_parser()
+    args = parser.parse_args(argumentos)
+    if (args.carga is None) == (args.generar is None):
+        parser.error("Indique un archivo de carga o --generar N (uno de los dos).")
+    if args.traza_binaria and (args.comparar or len(args.algoritmo or ()) > 1 or args.modo == "traza"):
+        parser.error("--traza-binaria requiere un solo algoritmo y no se combina con --modo traza.")
+
+    try:
+        if args.generar is not None:
+            from cargas import GeneradorCargas
+            procesos = list(GeneradorCargas(args.generar, semilla=args.semilla).procesos())
+        else:
+            procesos = cargar_procesos(args.carga, args.omitir_invalidas)
+        algoritmos = (FabricaAlgoritmos.obtener_algoritmos_disponibles() if args.comparar
+                      else args.algoritmo or ["FCFS"])
+        configuraciones = construir_configuraciones(algoritmos, vars(args))
+        cache = CacheResultados(directorio=args.cache) if args.cache else None
+        traza = args.modo == "traza"
+        if args.traza_binaria:
+            resultados = ejecutar_traza_binaria(procesos, configuraciones[0], args.traza_binaria,
+                                                args.comprimir, args.instrumentar)
+        else:
+            resultados = ejecutar(procesos, configuraciones, traza, args.paralelo, cache, args.instrumentar)
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"error: {e}\n")
+
+    salida = open(args.salida, "w", encoding="utf-8", newline="") if args.salida else sys.stdout
+    try:
+        if args.formato == "json":
+            escribir_json(resultados, salida)
+        else:
+            escribir_csv(resultados, salida, traza)
+    finally:
+        if args.salida:
+            salida.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
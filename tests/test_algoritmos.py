@@ -0,0 +1,142 @@
+import random
+
+import pytest
+
+from algoritmos import MLFQ, SJF, Prioridades, RoundRobin, analizar_comparativo
+from lotes import ProcesoBatch
+from multicpu import ejecutar_multi_cpu
+from procesos import Proceso
+
+
+def _tramos(algoritmo):
+    return list(zip(*(columna.tolist() for columna in algoritmo.segmentos.columnas())))
+
+
+@pytest.mark.parametrize("colas_por_cpu", [False, True])
+def test_envejecimiento_desaloja_entre_llegadas(colas_por_cpu):
+    # B llega en t=1 con mejor prioridad; A (clave 5 + 1) lo supera en t=7 sin que haya otra llegada
+    procesos = [Proceso("A", 100, 0, prioridad=5, pid=1), Proceso("B", 100, 1, prioridad=0, pid=2)]
+    algoritmo = Prioridades(True, 1, colas_por_cpu=colas_por_cpu)
+    algoritmo.ejecutar(procesos)
+    assert _tramos(algoritmo)[:3] == [(1, 0, 1), (2, 1, 7), (1, 7, 8)]
+
+
+def test_envejecimiento_desaloja_con_varias_cpus():
+    procesos = [Proceso("A", 100, 0, prioridad=5, pid=1), Proceso("B", 100, 1, prioridad=0, pid=2),
+                Proceso("C", 300, 0, prioridad=-9, pid=3)]
+    algoritmo = Prioridades(True, 1, num_cpus=2)
+    algoritmo.ejecutar(procesos)
+    tramos = [tramo for tramo in _tramos(algoritmo) if tramo[0] != 3]
+    assert tramos[:3] == [(1, 0, 1), (2, 1, 7), (1, 7, 8)]
+
+
+def test_envejecimiento_fraccionario():
+    # Con envejecimiento 0.5 la clave de A es 5.5 y B (prioridad 0) queda superado cuando 0.5 * t > 5.5
+    procesos = [Proceso("A", 100, 0, prioridad=5, pid=1), Proceso("B", 100, 1, prioridad=0, pid=2)]
+    algoritmo = Prioridades(True, 0.5)
+    algoritmo.ejecutar(procesos)
+    assert _tramos(algoritmo)[:2] == [(1, 0, 1), (2, 1, 12)]
+
+
+def test_sin_envejecimiento_no_hay_desalojo():
+    procesos = [Proceso("A", 100, 0, prioridad=5, pid=1), Proceso("B", 100, 1, prioridad=0, pid=2)]
+    algoritmo = Prioridades(True, 0)
+    algoritmo.ejecutar(procesos)
+    assert _tramos(algoritmo) == [(1, 0, 1), (2, 1, 101), (1, 101, 200)]
+
+
+@pytest.mark.parametrize("num_cpus", [1, 2])
+def test_envejecimiento_con_costo_de_cambio_avanza(num_cpus):
+    # Durante cada cambio de 2 unidades el que espera ya supera al que se carga; sin la unidad
+    # mínima de ejecución se desalojarían al terminar cada cambio sin avanzar nunca
+    procesos = [Proceso(f"P{pid}", 5, 0, prioridad=0, pid=pid) for pid in range(1, num_cpus + 2)]
+    algoritmo = Prioridades(True, 1, num_cpus=num_cpus, costo_cambio=2)
+    algoritmo.ejecutar(procesos)
+    assert all(p.tiempo_finalizacion is not None for p in procesos)
+    assert all(fin - inicio >= 1 for _, inicio, fin in _tramos(algoritmo))
+
+
+def _carga_con_es(semilla, cantidad=8):
+    azar = random.Random(semilla)
+    procesos = []
+    for i in range(azar.randint(1, cantidad)):
+        rafagas = [azar.randint(1, 8) for _ in range(2 * azar.randint(0, 2) + 1)]
+        procesos.append(Proceso(f"P{i}", sum(rafagas[::2]), azar.randint(0, 25), pid=i + 1,
+                                rafagas=rafagas if len(rafagas) > 1 else None))
+    return procesos
+
+
+def _parametros_mlfq(semilla):
+    azar = random.Random(semilla)
+    niveles = azar.randint(1, 3)
+    return {'niveles': niveles, 'quantums': [azar.randint(1, 5) for _ in range(niveles)],
+            'periodo_boost': azar.choice([None, azar.randint(3, 20)]), 'costo_cambio': azar.choice([0, 1, 2])}
+
+
+def _tramos_unidos(algoritmo):
+    """Tramos con los consecutivos del mismo proceso unidos"""
+    unidos = []
+    for pid, inicio, fin in _tramos(algoritmo):
+        if unidos and unidos[-1][0] == pid and unidos[-1][2] == inicio:
+            unidos[-1] = (pid, unidos[-1][1], fin)
+        else:
+            unidos.append((pid, inicio, fin))
+    return unidos
+
+
+def test_mlfq_motor_general_igual_al_propio_con_una_cpu():
+    # El motor propio registra algunas llegadas más tarde, así que se comparan resultados y tramos
+    for semilla in range(300):
+        parametros = _parametros_mlfq(semilla)
+        propio, general = _carga_con_es(semilla), _carga_con_es(semilla)
+        algoritmo = MLFQ(**parametros)
+        algoritmo.ejecutar(propio)
+        referencia = MLFQ(**parametros)
+        for _ in ejecutar_multi_cpu(referencia, general):
+            pass
+        assert ([(p.tiempo_finalizacion, p.tiempo_espera, p.tiempo_respuesta) for p in propio]
+                == [(p.tiempo_finalizacion, p.tiempo_espera, p.tiempo_respuesta) for p in general]), semilla
+        assert _tramos_unidos(algoritmo) == _tramos_unidos(referencia), semilla
+
+
+@pytest.mark.parametrize("colas_por_cpu", [False, True])
+def test_mlfq_varias_cpus(colas_por_cpu):
+    for semilla in range(100):
+        procesos = _carga_con_es(semilla, 12)
+        algoritmo = MLFQ(num_cpus=3, colas_por_cpu=colas_por_cpu, **_parametros_mlfq(semilla))
+        algoritmo.ejecutar(procesos)
+        ejecutado = {}
+        for cpu, registro in enumerate(algoritmo.segmentos_por_cpu):
+            pids, inicios, fines = (columna.tolist() for columna in registro.columnas())
+            assert all(fin <= inicio for fin, inicio in zip(fines, inicios[1:])), (semilla, cpu)
+            for pid, inicio, fin in zip(pids, inicios, fines):
+                ejecutado[pid] = ejecutado.get(pid, 0) + fin - inicio
+        assert all(ejecutado[p.pid] == p.tiempo_cpu for p in procesos), semilla
+        assert all(p.tiempo_finalizacion is not None for p in procesos), semilla
+
+
+def test_comparativo_multi_cpu_incluye_mlfq():
+    procesos = [Proceso("A", 6, 0, pid=1), Proceso("B", 3, 1, pid=2), Proceso("C", 9, 2, pid=3)]
+    resultados = analizar_comparativo(procesos, configuraciones=[("MLFQ", {'num_cpus': 2}),
+                                                                 ("MLFQ", {'num_cpus': 2, 'periodo_boost': 4})])
+    for resultado in resultados.values():
+        assert 'error' not in resultado
+        assert resultado['metricas']['throughput'] == 3
+
+
+@pytest.mark.parametrize("crear", [SJF, RoundRobin, lambda: RoundRobin(quantum=3),
+                                   lambda: Prioridades(apropiativo=False)])
+def test_nucleo_columnar_cuenta_las_mismas_operaciones_de_cola(crear):
+    rng = random.Random(5)
+    procesos = [Proceso(f"P{i}", rng.randint(1, 12), rng.randint(0, 40), prioridad=rng.randint(0, 3),
+                        quantum=rng.choice([None, 2]), pid=i + 1) for i in range(30)]
+    motor = crear().instrumentar()
+    motor.ejecutar([Proceso(p.nombre, p.tiempo_cpu, p.instante_llegada, p.quantum, p.prioridad, p.pid)
+                    for p in procesos])
+    columnar = crear().instrumentar()
+    columnar.ejecutar_lote(ProcesoBatch.desde_procesos(procesos))
+    esperado = motor.instrumentacion.resumen()
+    obtenido = columnar.instrumentacion.resumen()
+    assert esperado['ingresos_cola'] == esperado['extracciones_cola'] >= len(procesos)
+    assert (obtenido['ingresos_cola'], obtenido['extracciones_cola']) == (
+        esperado['ingresos_cola'], esperado['extracciones_cola'])
@@ -0,0 +1,25 @@
+import json
+
+import pytest
+
+from importacion import ImportadorCargas
+
+
+def _escribir_jsonl(ruta, filas):
+    ruta.write_text("".join(json.dumps(fila) + "\n" for fila in filas), encoding="utf-8")
+    return str(ruta)
+
+
+@pytest.mark.parametrize("fila", [
+    {"Nombre": "B", "CPU": True, "Llegada": 0},
+    {"Nombre": "B", "CPU": 3, "Llegada": False},
+    {"Nombre": "B", "CPU": 3, "Llegada": 0, "Prioridad": True},
+    {"Nombre": "B", "CPU": 3, "Llegada": 0, "Rafagas": [1, True, 2], "Dispositivos": [0]},
+])
+def test_booleano_no_es_un_entero(tmp_path, fila):
+    ruta = _escribir_jsonl(tmp_path / "carga.jsonl", [{"Nombre": "A", "CPU": 2, "Llegada": 0}, fila])
+    importador = ImportadorCargas(ruta)
+    procesos = list(importador.procesos())
+    assert [p.nombre for p in procesos] == ["A"]
+    assert importador.filas_invalidas == 1
+    assert "True" in importador.errores[0].error or "False" in importador.errores[0].error
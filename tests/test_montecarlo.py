@@ -0,0 +1,25 @@
+import functools
+import time
+
+from montecarlo import ejecutar_montecarlo, semillas_replicas
+from procesos import Proceso
+
+_ESPERA_LENTA = 2.0
+
+
+def _carga_fija(rapidas, semilla):
+    # Misma carga en todas las réplicas (varianza nula); las que no están en ``rapidas`` tardan
+    if semilla not in rapidas:
+        time.sleep(_ESPERA_LENTA)
+    return [Proceso("A", 4, 0, pid=1), Proceso("B", 3, 1, pid=2)]
+
+
+def test_parada_temprana_no_espera_replicas_en_curso():
+    rapidas = frozenset(semillas_replicas(0, 2))
+    generador = functools.partial(_carga_fija, rapidas)
+    inicio = time.perf_counter()
+    resultados = list(ejecutar_montecarlo(generador, 6, configuraciones=[("FCFS", {})],
+                                          precision=0.05, min_replicas=2, max_trabajadores=2))
+    transcurrido = time.perf_counter() - inicio
+    assert [r['replica'] for r in resultados] == [0, 1]
+    assert transcurrido < _ESPERA_LENTA / 2
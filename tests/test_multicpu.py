@@ -0,0 +1,195 @@
+import random
+
+import pytest
+
+from algoritmos import FabricaAlgoritmos, SRTF
+from multicpu import ejecutar_multi_cpu
+from procesos import Proceso
+
+# Configuraciones que comparan las pruebas diferenciales
+_CONFIGURACIONES = [
+    ("FCFS", {}),
+    ("SJF", {}),
+    ("SRTF", {}),
+    ("Round Robin", {'quantum': 2}),
+    ("Prioridades", {'apropiativo': False}),
+    ("Prioridades", {}),
+    ("Prioridades", {'apropiativo': False, 'envejecimiento': 1}),
+    ("Prioridades", {'envejecimiento': 1}),
+    ("Prioridades", {'envejecimiento': 0.5}),
+]
+
+
+def _primer_inicio(algoritmo):
+    """Inicio del primer segmento de cada proceso"""
+    primero = {}
+    for pid, inicio in zip(*(columna.tolist() for columna in algoritmo.segmentos.columnas()[:2])):
+        primero[pid] = min(primero.get(pid, inicio), inicio)
+    return primero
+
+
+def test_respuesta_con_desalojo_al_terminar_el_cambio():
+    # A termina su cambio en t=1 y la llegada de B lo desaloja sin que haya ejecutado
+    procesos = [Proceso("A", 10, 0, pid=1), Proceso("B", 2, 1, pid=2)]
+    SRTF(costo_cambio=1).ejecutar(procesos)
+    assert [p.tiempo_respuesta for p in procesos] == [5, 1]
+
+
+@pytest.mark.parametrize("nombre,parametros", [
+    ("SRTF", {}),
+    ("Prioridades", {}),
+    ("Round Robin", {'quantum': 2}),
+])
+@pytest.mark.parametrize("num_cpus", [1, 2, 3])
+@pytest.mark.parametrize("colas_por_cpu", [False, True])
+def test_respuesta_es_el_primer_segmento_con_costo_cambio(nombre, parametros, num_cpus, colas_por_cpu):
+    for semilla in range(60):
+        azar = random.Random(semilla)
+        procesos = [Proceso(f"P{i}", azar.randint(1, 9), azar.randint(0, 15),
+                            prioridad=azar.randint(0, 4), pid=i + 1)
+                    for i in range(azar.randint(1, 8))]
+        algoritmo = FabricaAlgoritmos.crear_algoritmo(
+            nombre, num_cpus=num_cpus, colas_por_cpu=colas_por_cpu,
+            costo_cambio=azar.randint(1, 3), costo_migracion=azar.randint(0, 2), **parametros)
+        algoritmo.ejecutar(procesos)
+        primero = _primer_inicio(algoritmo)
+        for p in procesos:
+            assert p.tiempo_respuesta == primero[p.pid] - p.instante_llegada, (semilla, p.pid)
+
+
+def _carga(semilla):
+    azar = random.Random(semilla)
+    return [(f"P{i}", azar.randint(1, 12), azar.randint(0, 20), azar.randint(0, 6))
+            for i in range(azar.randint(1, 9))]
+
+
+def _procesos(carga):
+    return [Proceso(nombre, cpu, llegada, prioridad=prioridad, pid=i + 1)
+            for i, (nombre, cpu, llegada, prioridad) in enumerate(carga)]
+
+
+def _resultados(procesos):
+    return [(p.tiempo_finalizacion, p.tiempo_espera, p.tiempo_respuesta) for p in procesos]
+
+
+def _eventos(eventos):
+    return [(evento.tipo, evento.tiempo, evento.pid, evento.dato) for evento in eventos]
+
+
+def _unidades(algoritmo):
+    """(instante, cpu, pid) de cada unidad ejecutada según los segmentos del motor"""
+    unidades = []
+    for cpu, segmentos in enumerate(algoritmo.segmentos_por_cpu or [algoritmo.segmentos]):
+        for pid, inicio, fin in zip(*(columna.tolist() for columna in segmentos.columnas())):
+            unidades.extend((instante, cpu, pid) for instante in range(inicio, fin))
+    return sorted(unidades)
+
+
+def _simular_por_unidades(algoritmo, procesos):
+    """Simulación de referencia unidad por unidad con cola global, sin E/S ni costo de cambio.
+
+    Usa los mismos ganchos de política que el motor general pero recorre
+    el reloj de a una unidad y reordena la cola completa en cada ingreso.
+    Devuelve las unidades ejecutadas como ``(instante, cpu, pid)``.
+    """
+    num_cpus = algoritmo.num_cpus
+    apropiativo = algoritmo._es_apropiativo()
+    por_llegada = sorted(procesos, key=lambda p: p.instante_llegada)
+    orden = {p.pid: i for i, p in enumerate(por_llegada)}
+    for p in procesos:
+        p.tiempo_restante = p.tiempo_cpu
+        p.tiempo_respuesta = None
+    cola = []
+    ingresos = 0
+    ejecutando = [None] * num_cpus   # [proceso, instante del despacho, unidades usadas]
+    unidades = []
+    indice = completados = tiempo = 0
+
+    def encolar(p):
+        nonlocal ingresos
+        cola.append((algoritmo._clave_multi(p, tiempo, ingresos), orden[p.pid], p))
+        ingresos += 1
+        cola.sort(key=lambda entrada: entrada[:2])
+
+    def despachar(cpu):
+        ejecutando[cpu] = [cola.pop(0)[2], tiempo, 0]
+
+    while completados < len(procesos):
+        reencolar = []
+        for cpu, actual in enumerate(ejecutando):
+            if actual is None:
+                continue
+            p, _, usadas = actual
+            porcion = algoritmo._porcion_multi(p)
+            if p.tiempo_restante == 0:
+                p.tiempo_finalizacion = tiempo
+                p.tiempo_espera = tiempo - p.instante_llegada - p.tiempo_cpu
+                completados += 1
+                ejecutando[cpu] = None
+            elif porcion is not None and usadas == porcion:
+                reencolar.append(p)
+                ejecutando[cpu] = None
+        # Como en el motor, las llegadas entran a la cola antes que los desalojados
+        while indice < len(por_llegada) and por_llegada[indice].instante_llegada <= tiempo:
+            encolar(por_llegada[indice])
+            indice += 1
+        for p in reencolar:
+            encolar(p)
+        for cpu in range(num_cpus):
+            if ejecutando[cpu] is None and cola:
+                despachar(cpu)
+        # Un listo estrictamente mejor desaloja al peor en ejecución que no se despachó ahora
+        while apropiativo and cola:
+            candidatos = [(-algoritmo._clave_en_ejecucion(actual[0], tiempo, tiempo), cpu)
+                          for cpu, actual in enumerate(ejecutando)
+                          if actual is not None and actual[1] != tiempo]
+            if not candidatos:
+                break
+            clave, cpu = min(candidatos)
+            if not cola[0][0] < -clave:
+                break
+            encolar(ejecutando[cpu][0])
+            despachar(cpu)
+        for cpu, actual in enumerate(ejecutando):
+            if actual is None:
+                continue
+            p = actual[0]
+            if p.tiempo_respuesta is None:
+                p.tiempo_respuesta = tiempo - p.instante_llegada
+            unidades.append((tiempo, cpu, p.pid))
+            p.tiempo_restante -= 1
+            actual[2] += 1
+        tiempo += 1
+    return unidades
+
+
+@pytest.mark.parametrize("nombre,parametros",
+                         _CONFIGURACIONES + [("MLFQ", {}), ("MLFQ", {'periodo_boost': 7})])
+def test_motor_general_igual_a_los_motores_de_una_cpu(nombre, parametros):
+    for semilla in range(40):
+        carga = _carga(semilla)
+        propio = FabricaAlgoritmos.crear_algoritmo(nombre, **parametros)
+        procesos = _procesos(carga)
+        eventos_propios = _eventos(propio.ejecutar_iter(procesos))
+        general = FabricaAlgoritmos.crear_algoritmo(nombre, **parametros)
+        copias = _procesos(carga)
+        eventos_generales = _eventos(ejecutar_multi_cpu(general, copias))
+        assert _resultados(copias) == _resultados(procesos), semilla
+        assert _unidades(general) == _unidades(propio), semilla
+        # Ambos motores anuncian las mismas llegadas y huecos ociosos, en el mismo orden
+        assert eventos_propios == eventos_generales, semilla
+
+
+@pytest.mark.parametrize("nombre,parametros", _CONFIGURACIONES)
+@pytest.mark.parametrize("num_cpus", [1, 2, 3])
+def test_motor_general_igual_a_la_simulacion_por_unidades(nombre, parametros, num_cpus):
+    for semilla in range(40):
+        carga = _carga(semilla)
+        algoritmo = FabricaAlgoritmos.crear_algoritmo(nombre, num_cpus=num_cpus, **parametros)
+        procesos = _procesos(carga)
+        algoritmo.ejecutar(procesos)
+        referencia = FabricaAlgoritmos.crear_algoritmo(nombre, num_cpus=num_cpus, **parametros)
+        copias = _procesos(carga)
+        unidades = _simular_por_unidades(referencia, copias)
+        assert _resultados(procesos) == _resultados(copias), semilla
+        assert _unidades(algoritmo) == sorted(unidades), semilla
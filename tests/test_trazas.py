@@ -0,0 +1,32 @@
+import pytest
+
+from eventos import TipoEvento
+from trazas import EscritorTraza, LectorTraza
+
+
+def _escribir(ruta, fallar):
+    with EscritorTraza(str(ruta), {"algoritmo": "FCFS"}, registros_por_bloque=4) as escritor:
+        for tiempo in range(10):
+            escritor.agregar(TipoEvento.LLEGADA, tiempo, tiempo + 1)
+        if fallar:
+            raise RuntimeError("corrida interrumpida")
+        escritor.cerrar({"metricas": {"throughput": 10}})
+
+
+def test_traza_cerrada_con_indice(tmp_path):
+    ruta = tmp_path / "corrida.trz"
+    _escribir(ruta, fallar=False)
+    with LectorTraza(str(ruta)) as lector:
+        assert lector.completa
+        assert len(lector) == 10
+        assert lector.metadatos["metricas"] == {"throughput": 10}
+
+
+def test_excepcion_deja_la_traza_incompleta(tmp_path):
+    ruta = tmp_path / "corrida.trz"
+    with pytest.raises(RuntimeError):
+        _escribir(ruta, fallar=True)
+    with LectorTraza(str(ruta)) as lector:
+        assert not lector.completa
+        assert len(lector) == 10
+        assert "metricas" not in lector.metadatos
@@ -0,0 +1,508 @@
+"""Formato binario de trazas de simulación.
+
+Un archivo de traza guarda los eventos, los segmentos de ejecución y la
+tabla de procesos de una corrida como registros de ancho fijo (little
+endian), agrupados en bloques que pueden comprimirse con zlib::
+
+    cabecera   b"SPTRAZA\\0" | versión u16 | reservado u16 | largo u32 | metadatos JSON
+    bloque     tipo u8 | compresión u8 | reservado u16 | registros u32 | bytes u32 |
+               tiempo mínimo i64 | tiempo máximo i64 | datos
+    índice     bloque de tipo INDICE con el desplazamiento (u64) de cada bloque
+    cola       desplazamiento del índice u64 | b"SPTRFIN\\0"
+
+Registros: evento ``<bqqq`` (tipo, tiempo, pid, dato; 25 bytes), segmento
+``<qqqi`` (pid, inicio, fin, cpu; 28 bytes) y proceso ``<8q`` (pid,
+llegada, cpu, quantum, prioridad, finalización, espera, respuesta). Un
+bloque METADATOS lleva en JSON lo que se conoce al terminar (métricas).
+
+``EscritorTraza`` recibe los eventos a medida que el motor los produce y
+vuelca un bloque cada ``registros_por_bloque`` registros, así que la
+corrida no acumula la bitácora en memoria. ``LectorTraza`` mapea el
+archivo con ``mmap`` y accede a cualquier rango de eventos leyendo (y
+descomprimiendo) solo los bloques involucrados. Si la escritura se
+interrumpió antes del índice, el lector recorre las cabeceras de bloque y
+descarta el último bloque incompleto.
+"""
+import json
+import mmap
+import struct
+import zlib
+from array import array
+from enum import IntEnum
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from eventos import Evento, RegistroEventos, TipoEvento
+from lotes import ProcesoBatch
+from segmentos import RegistroSegmentos
+
+_MAGIA = b"SPTRAZA\x00"
+_MAGIA_FIN = b"SPTRFIN\x00"
+_VERSION = 1
+
+_CABECERA = struct.Struct("<8sHHI")
+_BLOQUE = struct.Struct("<BBHIIqq")
+_COLA = struct.Struct("<Q8s")
+
+EVENTO = np.dtype([("tipo", "i1"), ("tiempo", "<i8"), ("pid", "<i8"), ("dato", "<i8")])
+SEGMENTO = np.dtype([("pid", "<i8"), ("inicio", "<i8"), ("fin", "<i8"), ("cpu", "<i4")])
+PROCESO = np.dtype([(campo, "<i8") for campo in ("pid", "llegada", "cpu", "quantum", "prioridad",
+                                                  "finalizacion", "espera", "respuesta")])
+
+_REGISTROS_POR_BLOQUE = 1 << 16
+
+# Tipos de evento indexados por valor, para reconstruir Evento sin llamar a TipoEvento(valor)
+_TIPOS = tuple(TipoEvento)
+
+
+class TipoBloque(IntEnum):
+    EVENTOS = 1
+    SEGMENTOS = 2
+    PROCESOS = 3
+    METADATOS = 4
+    INDICE = 5
+
+
+_DTYPES = {TipoBloque.EVENTOS: EVENTO, TipoBloque.SEGMENTOS: SEGMENTO, TipoBloque.PROCESOS: PROCESO}
+_TIPOS_BLOQUE = frozenset(TipoBloque)
+
+
+def _json_por_defecto(valor):
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, np.ndarray):
+        return valor.tolist()
+    raise TypeError(f"Valor no serializable en los metadatos de la traza: {type(valor).__name__}")
+
+
+def _a_json(metadatos: Dict) -> bytes:
+    return json.dumps(metadatos, ensure_ascii=False, default=_json_por_defecto).encode("utf-8")
+
+
+class EscritorTraza:
+    """Escritor por flujo de una traza binaria.
+
+    Los eventos y segmentos se acumulan en un búfer de ``registros_por_bloque``
+    registros y se escriben como un bloque al llenarse; con ``comprimir``
+    cada bloque se comprime con zlib (``nivel`` 1-9: el 1, por omisión, es
+    varias veces más rápido que el 6 y comprime casi lo mismo estos
+    registros). ``cerrar`` vuelca lo pendiente, agrega los ``metadatos``
+    finales y escribe el índice. Se usa como administrador de contexto; si
+    el bloque termina con una excepción, la traza se cierra con ``abortar``
+    y queda incompleta::
+
+        with EscritorTraza("corrida.trz", {"algoritmo": "SRTF"}) as escritor:
+            for evento in escritor.observar(algoritmo.ejecutar_iter(procesos)):
+                ...
+    """
+
+    def __init__(self, ruta: str, metadatos: Optional[Dict] = None, comprimir: bool = False,
+                 nivel: int = 1, registros_por_bloque: int = _REGISTROS_POR_BLOQUE):
+        if registros_por_bloque <= 0:
+            raise ValueError("La cantidad de registros por bloque debe ser un entero positivo.")
+        if comprimir and not 1 <= nivel <= 9:
+            raise ValueError("El nivel de compresión debe estar entre 1 y 9.")
+        self.ruta = ruta
+        self.comprimir = comprimir
+        self.nivel = nivel
+        self.registros_por_bloque = registros_por_bloque
+        self.eventos_escritos = 0
+        self.segmentos_escritos = 0
+        self._desplazamientos = array("Q")
+        self._eventos = RegistroEventos()
+        self._segmentos = (array("q"), array("q"), array("q"), array("i"))
+
+        cabecera = _a_json(metadatos or {})
+        self._archivo = open(ruta, "wb")
+        self._archivo.write(_CABECERA.pack(_MAGIA, _VERSION, 0, len(cabecera)))
+        self._archivo.write(cabecera)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, rastro):
+        if tipo is None:
+            self.cerrar()
+        else:
+            self.abortar()
+
+    @property
+    def cerrado(self) -> bool:
+        return self._archivo.closed
+
+    # Eventos
+
+    def agregar(self, tipo: TipoEvento, tiempo: int, pid: int = 0, dato: int = 0):
+        self._eventos.agregar(tipo, tiempo, pid, dato)
+        if len(self._eventos) >= self.registros_por_bloque:
+            self._volcar_eventos()
+
+    def agregar_evento(self, evento: Evento):
+        self.agregar(evento.tipo, evento.tiempo, evento.pid, evento.dato)
+
+    def agregar_eventos(self, eventos: Iterable[Evento]):
+        for evento in eventos:
+            self.agregar(evento.tipo, evento.tiempo, evento.pid, evento.dato)
+
+    def observar(self, eventos: Iterator[Evento]) -> Iterator[Evento]:
+        """Reproduce ``eventos`` escribiendo cada uno en la traza"""
+        for evento in eventos:
+            self.agregar(evento.tipo, evento.tiempo, evento.pid, evento.dato)
+            yield evento
+
+    def agregar_registro(self, registro: RegistroEventos):
+        """Escribe una bitácora completa por columnas, sin recorrerla evento a evento"""
+        self._volcar_eventos()
+        columnas = registro.columnas()
+        for inicio in range(0, len(registro), self.registros_por_bloque):
+            self._escribir_eventos(*(columna[inicio:inicio + self.registros_por_bloque]
+                                     for columna in columnas))
+
+    def _volcar_eventos(self):
+        if len(self._eventos):
+            self._escribir_eventos(*self._eventos.columnas())
+            self._eventos = RegistroEventos()
+
+    def _escribir_eventos(self, tipos, tiempos, pids, datos):
+        registros = np.empty(len(tipos), dtype=EVENTO)
+        registros["tipo"] = tipos
+        registros["tiempo"] = tiempos
+        registros["pid"] = pids
+        registros["dato"] = datos
+        self._escribir_bloque(TipoBloque.EVENTOS, registros, tiempos.min(), tiempos.max())
+        self.eventos_escritos += len(registros)
+
+    # Segmentos
+
+    def agregar_segmento(self, pid: int, inicio: int, fin: int, cpu: int = 0):
+        pids, inicios, fines, cpus = self._segmentos
+        pids.append(pid)
+        inicios.append(inicio)
+        fines.append(fin)
+        cpus.append(cpu)
+        if len(pids) >= self.registros_por_bloque:
+            self._volcar_segmentos()
+
+    def agregar_segmentos(self, segmentos: RegistroSegmentos, cpu: int = 0):
+        """Escribe los segmentos de un registro (de la CPU ``cpu``) por columnas"""
+        self._volcar_segmentos()
+        pids, inicios, fines = segmentos.columnas()
+        for inicio in range(0, len(segmentos), self.registros_por_bloque):
+            tramo = slice(inicio, inicio + self.registros_por_bloque)
+            self._escribir_segmentos(pids[tramo], inicios[tramo], fines[tramo], cpu)
+
+    def _volcar_segmentos(self):
+        if self._segmentos[0]:
+            pids, inicios, fines, cpus = self._segmentos
+            self._escribir_segmentos(np.frombuffer(pids, dtype=np.int64), np.frombuffer(inicios, dtype=np.int64),
+                                     np.frombuffer(fines, dtype=np.int64), np.frombuffer(cpus, dtype=np.int32))
+            self._segmentos = (array("q"), array("q"), array("q"), array("i"))
+
+    def _escribir_segmentos(self, pids, inicios, fines, cpu):
+        registros = np.empty(len(pids), dtype=SEGMENTO)
+        registros["pid"] = pids
+        registros["inicio"] = inicios
+        registros["fin"] = fines
+        registros["cpu"] = cpu
+        self._escribir_bloque(TipoBloque.SEGMENTOS, registros, inicios.min(), fines.max())
+        self.segmentos_escritos += len(registros)
+
+    # Procesos
+
+    def agregar_procesos(self, lote: ProcesoBatch):
+        """Escribe la tabla de procesos (carga y resultados) de un lote columnar"""
+        for inicio in range(0, len(lote), self.registros_por_bloque):
+            tramo = slice(inicio, inicio + self.registros_por_bloque)
+            registros = np.empty(len(lote.pid[tramo]), dtype=PROCESO)
+            for campo in PROCESO.names:
+                registros[campo] = getattr(lote, campo)[tramo]
+            self._escribir_bloque(TipoBloque.PROCESOS, registros, registros["llegada"].min(),
+                                  registros["finalizacion"].max())
+
+    def _escribir_bloque(self, tipo: TipoBloque, registros: np.ndarray, tiempo_min: int, tiempo_max: int):
+        datos = registros.tobytes()
+        compresion = 0
+        if self.comprimir:
+            datos = zlib.compress(datos, self.nivel)
+            compresion = 1
+        self._desplazamientos.append(self._archivo.tell())
+        self._archivo.write(_BLOQUE.pack(tipo, compresion, 0, len(registros), len(datos),
+                                         int(tiempo_min), int(tiempo_max)))
+        self._archivo.write(datos)
+
+    def cerrar(self, metadatos: Optional[Dict] = None):
+        """Vuelca los búferes, escribe los ``metadatos`` finales y el índice, y cierra el archivo"""
+        if self.cerrado:
+            return
+        try:
+            self._volcar_eventos()
+            self._volcar_segmentos()
+            if metadatos:
+                datos = _a_json(metadatos)
+                self._desplazamientos.append(self._archivo.tell())
+                self._archivo.write(_BLOQUE.pack(TipoBloque.METADATOS, 0, 0, 1, len(datos), 0, 0))
+                self._archivo.write(datos)
+            indice = self._archivo.tell()
+            datos = self._desplazamientos.tobytes()
+            self._archivo.write(_BLOQUE.pack(TipoBloque.INDICE, 0, 0, len(self._desplazamientos),
+                                             len(datos), 0, 0))
+            self._archivo.write(datos)
+            self._archivo.write(_COLA.pack(indice, _MAGIA_FIN))
+        finally:
+            self._archivo.close()
+
+    def abortar(self):
+        """Vuelca los búferes y cierra el archivo sin metadatos finales ni índice.
+
+        La traza queda incompleta: ``LectorTraza`` recupera los bloques
+        escritos recorriendo sus cabeceras y ``completa`` es False.
+        """
+        if self.cerrado:
+            return
+        try:
+            self._volcar_eventos()
+            self._volcar_segmentos()
+        finally:
+            self._archivo.close()
+
+
+class _Bloque:
+    __slots__ = ("tipo", "compresion", "registros", "desplazamiento", "bytes", "tiempo_min", "tiempo_max")
+
+    def __init__(self, tipo, compresion, registros, desplazamiento, bytes_, tiempo_min, tiempo_max):
+        self.tipo = tipo
+        self.compresion = compresion
+        self.registros = registros
+        self.desplazamiento = desplazamiento
+        self.bytes = bytes_
+        self.tiempo_min = tiempo_min
+        self.tiempo_max = tiempo_max
+
+
+class LectorTraza:
+    """Lectura con acceso aleatorio de una traza binaria mapeada en memoria.
+
+    ``metadatos`` reúne los de la cabecera y los finales. Los eventos se
+    acceden por posición (``evento(i)``, ``eventos(inicio, fin)``) o por
+    instante (``eventos_entre``) leyendo solo los bloques necesarios; los
+    arreglos devueltos son copias con los campos de ``EVENTO``, ``SEGMENTO``
+    o ``PROCESO``. ``completa`` es False si la traza no llegó a cerrarse.
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self._archivo = open(ruta, "rb")
+        try:
+            self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._archivo.close()
+            raise ValueError(f"{ruta} no es una traza binaria (archivo vacío)") from None
+        try:
+            self._abrir()
+        except Exception:
+            self.cerrar()
+            raise
+
+    def _abrir(self):
+        if len(self._mapa) < _CABECERA.size:
+            raise ValueError(f"{self.ruta} no es una traza binaria")
+        magia, version, _, largo = _CABECERA.unpack_from(self._mapa, 0)
+        if magia != _MAGIA:
+            raise ValueError(f"{self.ruta} no es una traza binaria")
+        if version > _VERSION:
+            raise ValueError(f"Versión de traza no soportada: {version}")
+        inicio_bloques = _CABECERA.size + largo
+        if inicio_bloques > len(self._mapa):
+            raise ValueError(f"{self.ruta}: la cabecera de la traza está incompleta")
+        self.metadatos = json.loads(self._mapa[_CABECERA.size:inicio_bloques].decode("utf-8"))
+
+        desplazamientos = self._leer_indice()
+        self.completa = desplazamientos is not None
+        self._bloques = {tipo: [] for tipo in _DTYPES}
+        for bloque in (self._bloques_indice(desplazamientos) if self.completa
+                       else self._recorrer_bloques(inicio_bloques)):
+            if bloque.tipo == TipoBloque.METADATOS:
+                self.metadatos.update(json.loads(self._datos(bloque).decode("utf-8")))
+            elif bloque.tipo in self._bloques:
+                self._bloques[bloque.tipo].append(bloque)
+        # Posición del primer registro de cada bloque, para ubicar un índice global
+        self._primeros = {tipo: np.cumsum([0] + [b.registros for b in bloques], dtype=np.int64)
+                          for tipo, bloques in self._bloques.items()}
+        self._cache = None
+
+    def _leer_indice(self) -> Optional[np.ndarray]:
+        tamano = len(self._mapa)
+        if tamano < _COLA.size:
+            return None
+        indice, magia = _COLA.unpack_from(self._mapa, tamano - _COLA.size)
+        if magia != _MAGIA_FIN:
+            return None
+        bloque = self._bloque_en(indice)
+        return np.frombuffer(self._datos(bloque), dtype="<u8")
+
+    def _bloque_en(self, desplazamiento: int) -> _Bloque:
+        tipo, compresion, _, registros, largo, tiempo_min, tiempo_max = _BLOQUE.unpack_from(
+            self._mapa, desplazamiento)
+        return _Bloque(tipo, compresion, registros, desplazamiento + _BLOQUE.size, largo,
+                       tiempo_min, tiempo_max)
+
+    def _bloques_indice(self, desplazamientos) -> Iterator[_Bloque]:
+        for desplazamiento in desplazamientos.tolist():
+            yield self._bloque_en(desplazamiento)
+
+    def _recorrer_bloques(self, desplazamiento: int) -> Iterator[_Bloque]:
+        """Recorre las cabeceras de bloque de una traza sin índice, hasta el primer bloque incompleto"""
+        tamano = len(self._mapa)
+        while desplazamiento + _BLOQUE.size <= tamano:
+            bloque = self._bloque_en(desplazamiento)
+            if bloque.tipo not in _TIPOS_BLOQUE or bloque.desplazamiento + bloque.bytes > tamano:
+                return
+            yield bloque
+            desplazamiento = bloque.desplazamiento + bloque.bytes
+
+    def _datos(self, bloque: _Bloque) -> bytes:
+        datos = self._mapa[bloque.desplazamiento:bloque.desplazamiento + bloque.bytes]
+        return zlib.decompress(datos) if bloque.compresion else datos
+
+    def _registros(self, tipo: TipoBloque, posicion: int) -> np.ndarray:
+        """Registros del bloque ``posicion`` de ``tipo``; se conserva el último bloque leído"""
+        if self._cache is not None and self._cache[0] == (tipo, posicion):
+            return self._cache[1]
+        registros = np.frombuffer(self._datos(self._bloques[tipo][posicion]), dtype=_DTYPES[tipo])
+        self._cache = ((tipo, posicion), registros)
+        return registros
+
+    def _rango(self, tipo: TipoBloque, inicio: int, fin: Optional[int]) -> np.ndarray:
+        primeros = self._primeros[tipo]
+        total = int(primeros[-1])
+        fin = total if fin is None else min(fin, total)
+        inicio = max(inicio, 0)
+        if inicio >= fin:
+            return np.empty(0, dtype=_DTYPES[tipo])
+        primero = int(np.searchsorted(primeros, inicio, side="right")) - 1
+        ultimo = int(np.searchsorted(primeros, fin, side="left")) - 1
+        partes = [self._registros(tipo, posicion) for posicion in range(primero, ultimo + 1)]
+        partes[-1] = partes[-1][:fin - int(primeros[ultimo])]
+        partes[0] = partes[0][inicio - int(primeros[primero]):]
+        return np.concatenate(partes)
+
+    # Eventos
+
+    @property
+    def cantidad_eventos(self) -> int:
+        return int(self._primeros[TipoBloque.EVENTOS][-1])
+
+    def __len__(self):
+        return self.cantidad_eventos
+
+    def eventos(self, inicio: int = 0, fin: Optional[int] = None) -> np.ndarray:
+        """Eventos en las posiciones ``[inicio, fin)``"""
+        return self._rango(TipoBloque.EVENTOS, inicio, fin)
+
+    def evento(self, indice: int) -> Evento:
+        if indice < 0:
+            indice += self.cantidad_eventos
+        if not 0 <= indice < self.cantidad_eventos:
+            raise IndexError("Índice de evento fuera de rango")
+        tipo, tiempo, pid, dato = self.eventos(indice, indice + 1)[0].tolist()
+        return Evento(_TIPOS[tipo], tiempo, pid, dato)
+
+    def __getitem__(self, indice: int) -> Evento:
+        return self.evento(indice)
+
+    def eventos_entre(self, desde: int, hasta: int) -> np.ndarray:
+        """Eventos con ``desde <= tiempo < hasta``; salta los bloques fuera del intervalo"""
+        partes = []
+        for posicion, bloque in enumerate(self._bloques[TipoBloque.EVENTOS]):
+            if bloque.tiempo_max < desde or bloque.tiempo_min >= hasta:
+                continue
+            registros = self._registros(TipoBloque.EVENTOS, posicion)
+            tiempos = registros["tiempo"]
+            partes.append(registros[(tiempos >= desde) & (tiempos < hasta)])
+        return np.concatenate(partes) if partes else np.empty(0, dtype=EVENTO)
+
+    def iterar_eventos(self) -> Iterator[Evento]:
+        """Recorre todos los eventos bloque a bloque, con memoria acotada a un bloque"""
+        for posicion in range(len(self._bloques[TipoBloque.EVENTOS])):
+            for tipo, tiempo, pid, dato in self._registros(TipoBloque.EVENTOS, posicion).tolist():
+                yield Evento(_TIPOS[tipo], tiempo, pid, dato)
+
+    def __iter__(self) -> Iterator[Evento]:
+        return self.iterar_eventos()
+
+    def registro_eventos(self, inicio: int = 0, fin: Optional[int] = None) -> RegistroEventos:
+        """Bitácora en memoria con los eventos ``[inicio, fin)``"""
+        eventos = self.eventos(inicio, fin)
+        return RegistroEventos.desde_arrays(eventos["tipo"], eventos["tiempo"], eventos["pid"], eventos["dato"])
+
+    # Segmentos y procesos
+
+    @property
+    def cantidad_segmentos(self) -> int:
+        return int(self._primeros[TipoBloque.SEGMENTOS][-1])
+
+    def segmentos(self, cpu: Optional[int] = None) -> np.ndarray:
+        """Segmentos de ejecución, de todas las CPUs o solo de ``cpu``"""
+        segmentos = self._rango(TipoBloque.SEGMENTOS, 0, None)
+        return segmentos if cpu is None else segmentos[segmentos["cpu"] == cpu]
+
+    def registro_segmentos(self, cpu: Optional[int] = None) -> RegistroSegmentos:
+        """Segmentos como ``RegistroSegmentos`` ordenados por inicio"""
+        segmentos = self.segmentos(cpu)
+        return RegistroSegmentos.desde_arrays(segmentos["pid"], segmentos["inicio"], segmentos["fin"])
+
+    def lote(self) -> ProcesoBatch:
+        """Tabla de procesos guardada, con sus resultados, como lote columnar"""
+        procesos = self._rango(TipoBloque.PROCESOS, 0, None)
+        lote = ProcesoBatch(procesos["llegada"], procesos["cpu"], pid=procesos["pid"],
+                            quantum=procesos["quantum"], prioridad=procesos["prioridad"])
+        lote.finalizacion = procesos["finalizacion"].copy()
+        lote.espera = procesos["espera"].copy()
+        lote.respuesta = procesos["respuesta"].copy()
+        return lote
+
+    def nombres(self) -> Dict[int, str]:
+        """Nombres de los procesos si se guardaron en los metadatos (``nombres``)"""
+        return {int(pid): nombre for pid, nombre in self.metadatos.get("nombres", {}).items()}
+
+    def cerrar(self):
+        self._cache = None
+        self._mapa.close()
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+def metadatos_carga(lote: ProcesoBatch) -> Dict:
+    """Resumen de la carga para la cabecera de una traza.
+
+    Solo se guardan los nombres que no son el ``P<pid>`` por omisión, para
+    que la cabecera no crezca con cargas sintéticas grandes.
+    """
+    nombres = {}
+    if lote.nombres is not None:
+        nombres = {pid: nombre for pid, nombre in zip(lote.pid.tolist(), lote.nombres)
+                   if nombre != f"P{pid}"}
+    return {
+        'procesos': len(lote),
+        'cpu_total': int(lote.cpu.sum()),
+        'ultima_llegada': int(lote.llegada.max()) if len(lote) else 0,
+        'nombres': nombres,
+    }
+
+
+def guardar_traza(ruta: str, eventos: RegistroEventos, segmentos: RegistroSegmentos,
+                  metadatos: Optional[Dict] = None, lote: Optional[ProcesoBatch] = None,
+                  comprimir: bool = False, segmentos_por_cpu: Optional[List[RegistroSegmentos]] = None):
+    """Escribe en una traza binaria los resultados de una corrida ya guardados en memoria"""
+    with EscritorTraza(ruta, metadatos, comprimir) as escritor:
+        escritor.agregar_registro(eventos)
+        for cpu, registro in enumerate(segmentos_por_cpu or [segmentos]):
+            escritor.agregar_segmentos(registro, cpu)
+        if lote is not None:
+            escritor.agregar_procesos(lote)